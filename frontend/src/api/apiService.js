@@ -39,9 +39,29 @@ const apiService = {
     }
   },
 
-  // Process Data
-  processData: async (projectId, options = {}) => {
-    return apiClient.post(`/data/process/${projectId}`, options);
+  // Process Data (submits a background job and waits until it finishes)
+  processData: async (projectId, options = {}, pollInterval = 2000) => {
+    const submitResponse = await apiClient.post(`/data/process/${projectId}`, options);
+    const jobId = submitResponse.data.job_id;
+
+    const finalStatuses = ['completed', 'failed', 'cancelled'];
+    while (true) {
+      await new Promise((resolve) => setTimeout(resolve, pollInterval));
+      const statusResponse = await apiService.getProcessJobStatus(jobId);
+      if (finalStatuses.includes(statusResponse.data.job.job_status)) {
+        return statusResponse;
+      }
+    }
+  },
+
+  // Process Job Status
+  getProcessJobStatus: async (jobId) => {
+    return apiClient.get(`/data/process/status/${jobId}`);
+  },
+
+  // Cancel Process Job
+  cancelProcessJob: async (jobId) => {
+    return apiClient.post(`/data/process/cancel/${jobId}`);
   },
 
   // Index Push
@@ -0,0 +1,77 @@
+"""
+Micro-benchmark: legacy `process_simpler_splitter` vs the streaming `iter_chunks`.
+
+Usage (from the `src` directory):
+    $ python -m benchmarks.chunker_benchmark --pages 1000 --chunk-size 1000 --overlap-size 200
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from controllers.ProcessController import ProcessController, Document
+
+def generate_pages(no_pages: int, lines_per_page: int = 45, seed: int = 7):
+    rnd = random.Random(seed)
+    words = ["retrieval", "augmented", "generation", "vector", "index", "chunk",
+             "embedding", "postgres", "query", "answer", "document", "page"]
+
+    for page_no in range(no_pages):
+        lines = [
+            " ".join(rnd.choice(words) for _ in range(rnd.randint(6, 14)))
+            for _ in range(lines_per_page)
+        ]
+        yield Document(page_content="\n".join(lines), metadata={"page": page_no})
+
+def measure(fn, repeat: int = 3):
+    durations = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        no_chunks = fn()
+        durations.append(time.perf_counter() - started_at)
+
+    # memory is traced in a separate run, tracemalloc slows down the timed ones
+    tracemalloc.start()
+    fn()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return no_chunks, min(durations), peak_memory
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--overlap-size", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # the splitters do not touch any project state, so skip the controller setup
+    process_controller = ProcessController.__new__(ProcessController)
+    pages = list(generate_pages(args.pages))
+
+    def run_legacy():
+        chunks = process_controller.process_simpler_splitter(
+            texts=[ page.page_content for page in pages ],
+            metadatas=[ page.metadata for page in pages ],
+            chunk_size=args.chunk_size,
+        )
+        return len(chunks)
+
+    def run_streaming():
+        no_chunks = 0
+        for _ in process_controller.iter_chunks(
+            records=iter(pages),
+            chunk_size=args.chunk_size,
+            overlap_size=args.overlap_size,
+        ):
+            no_chunks += 1
+        return no_chunks
+
+    print(f"pages={args.pages} chunk_size={args.chunk_size} overlap_size={args.overlap_size}")
+    for name, fn in [("legacy", run_legacy), ("streaming", run_streaming)]:
+        no_chunks, duration, peak_memory = measure(fn, repeat=args.repeat)
+        print(f"{name:>10}: {duration * 1000:8.1f} ms  chunks={no_chunks:6d}  "
+              f"peak_memory={peak_memory / 1024 / 1024:6.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Recall / latency of the vector db backends on a project's chunks, e.g. the embedded HNSW graph against PGVector.
+
+Every backend gets a temporary collection filled with the project's chunk vectors. After the
+index build, a fresh client is created to time the first search (the cold open of the collection),
+then the queries run. The ground truth is the exact top-k by cosine similarity, as in `quantization_eval`.
+
+Usage (from the `src` directory, with the `.env` of the deployment):
+    $ python -m benchmarks.hnsw_eval --project-id 1 --limit 10 --queries 200 --backends PGVECTOR HNSW
+"""
+import argparse
+import asyncio
+import random
+import time
+import numpy as np
+from helpers.config import get_settings
+from stores.llm.LLMProviderFactory import LLMProviderFactory
+from stores.llm.LLMEnums import DocumentTypeEnum
+from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+from stores.vectordb.VectorDBEnums import VectorDBEnums
+from benchmarks.quantization_eval import load_project_chunks, embed_all, exact_top_k
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+async def evaluate_backend(vectordb_factory, backend: str, collection_name: str, embedding_size: int,
+                           chunks, vectors, query_vectors, expected_ids, limit: int, search_params: dict):
+
+    vectordb_client = vectordb_factory.create(provider=backend)
+    await vectordb_client.connect()
+
+    _ = await vectordb_client.create_collection(collection_name=collection_name,
+                                                embedding_size=embedding_size, do_reset=True)
+    try:
+        started_at = time.perf_counter()
+        _ = await vectordb_client.insert_many(
+            collection_name=collection_name,
+            texts=[ chunk.chunk_text for chunk in chunks ],
+            vectors=vectors,
+            metadata=[ chunk.chunk_metadata for chunk in chunks ],
+            record_ids=[ chunk.chunk_id for chunk in chunks ],
+            defer_index=True,
+        )
+        _ = await vectordb_client.build_vector_index(collection_name=collection_name)
+        build_duration = time.perf_counter() - started_at
+
+        # a new client has to open the collection again, as a restarted worker would
+        await vectordb_client.disconnect()
+        vectordb_client = vectordb_factory.create(provider=backend)
+        await vectordb_client.connect()
+
+        started_at = time.perf_counter()
+        _ = await vectordb_client.search_by_vector(collection_name=collection_name, vector=query_vectors[0],
+                                                   limit=limit, search_params=search_params)
+        first_search_duration = time.perf_counter() - started_at
+
+        recalls, durations = [], []
+        for query_vector, expected in zip(query_vectors, expected_ids):
+            started_at = time.perf_counter()
+            results = await vectordb_client.search_by_vector(collection_name=collection_name, vector=query_vector,
+                                                            limit=limit, search_params=search_params)
+            durations.append(time.perf_counter() - started_at)
+
+            found = [ result.chunk_id for result in results or [] ]
+            recalls.append(sum(1 for chunk_id in expected if chunk_id in found) / len(expected))
+    finally:
+        _ = await vectordb_client.delete_collection(collection_name=collection_name)
+        await vectordb_client.disconnect()
+
+    durations_ms = np.array(durations) * 1000
+    return {
+        "recall": float(np.mean(recalls)),
+        "latency_mean_ms": float(durations_ms.mean()),
+        "latency_p95_ms": float(np.percentile(durations_ms, 95)),
+        "build_s": build_duration,
+        "first_search_ms": first_search_duration * 1000,
+    }
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--project-id", type=int, required=True)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--queries-file", type=str, default=None)
+    parser.add_argument("--backends", type=str, nargs="+",
+                        default=[ VectorDBEnums.PGVECTOR.value, VectorDBEnums.HNSW.value ])
+    parser.add_argument("--ef-search", type=int, default=None)
+    parser.add_argument("--embedding-batch-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
+    db_engine = create_async_engine(postgres_conn)
+    db_client = sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+    llm_provider_factory = LLMProviderFactory(settings)
+    embedding_client = llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
+    embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
+                                         embedding_size=settings.EMBEDDING_MODEL_SIZE)
+
+    vectordb_factory = VectorDBProviderFactory(config=settings, db_client=db_client)
+    search_params = { "ef_search": args.ef_search } if args.ef_search else None
+
+    try:
+        chunks = await load_project_chunks(db_client=db_client, project_id=args.project_id)
+        if not chunks:
+            print(f"project {args.project_id} has no chunks")
+            return
+
+        vectors = await embed_all(embedding_client, [ chunk.chunk_text for chunk in chunks ],
+                                  document_type=DocumentTypeEnum.DOCUMENT.value,
+                                  batch_size=args.embedding_batch_size)
+
+        if args.queries_file:
+            with open(args.queries_file, encoding="utf-8") as f:
+                queries = [ line.strip() for line in f if line.strip() ][:args.queries]
+            query_vectors = await embed_all(embedding_client, queries,
+                                            document_type=DocumentTypeEnum.QUERY.value,
+                                            batch_size=args.embedding_batch_size)
+        else:
+            rnd = random.Random(args.seed)
+            sample = rnd.sample(range(len(chunks)), min(args.queries, len(chunks)))
+            query_vectors = [ vectors[idx] for idx in sample ]
+
+        limit = min(args.limit, len(chunks))
+        top_k = exact_top_k(np.asarray(vectors, dtype=np.float32),
+                            np.asarray(query_vectors, dtype=np.float32), limit=limit)
+        expected_ids = [ [ chunks[idx].chunk_id for idx in row ] for row in top_k ]
+
+        print(f"storage={settings.VECTOR_DB_STORAGE} project={args.project_id} chunks={len(chunks)} "
+              f"queries={len(query_vectors)} limit={limit} ef_search={args.ef_search}")
+
+        baseline = None
+        for backend in args.backends:
+            collection_name = f"eval_{backend.lower()}_{settings.EMBEDDING_MODEL_SIZE}_{args.project_id}"
+            report = await evaluate_backend(vectordb_factory, backend=backend, collection_name=collection_name,
+                                            embedding_size=settings.EMBEDDING_MODEL_SIZE, chunks=chunks,
+                                            vectors=vectors, query_vectors=query_vectors,
+                                            expected_ids=expected_ids, limit=limit,
+                                            search_params=search_params)
+            baseline = baseline or report
+
+            print(f"{backend:>8}: recall@{limit}={report['recall']:.4f} "
+                  f"({report['recall'] - baseline['recall']:+.4f})  "
+                  f"mean={report['latency_mean_ms']:7.2f} ms  p95={report['latency_p95_ms']:7.2f} ms  "
+                  f"first={report['first_search_ms']:7.2f} ms  build={report['build_s']:6.1f} s")
+    finally:
+        await llm_provider_factory.close()
+        await db_engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
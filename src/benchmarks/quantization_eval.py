@@ -0,0 +1,160 @@
+"""
+Recall / latency of the quantized vector storages against full precision, on a project's chunks.
+
+Every storage gets a temporary collection filled with the project's chunk vectors.
+Queries are sampled chunk vectors, or embedded lines of --queries-file. The ground truth is
+the exact top-k by cosine similarity over the full precision vectors.
+
+Usage (from the `src` directory, with the `.env` of the deployment):
+    $ python -m benchmarks.quantization_eval --project-id 1 --limit 10 --queries 200
+"""
+import argparse
+import asyncio
+import random
+import time
+import numpy as np
+from helpers.config import get_settings
+from models.ChunkModel import ChunkModel
+from stores.llm.LLMProviderFactory import LLMProviderFactory
+from stores.llm.LLMEnums import DocumentTypeEnum
+from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+from stores.vectordb.VectorDBEnums import VectorStorageEnums
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+async def load_project_chunks(db_client, project_id: int):
+    chunk_model = await ChunkModel.create_instance(db_client=db_client)
+
+    chunks = []
+    async for page_chunks in chunk_model.iter_project_chunks(project_id=project_id):
+        chunks.extend(page_chunks)
+    return chunks
+
+async def embed_all(embedding_client, texts, document_type: str, batch_size: int):
+    vectors = []
+    for i in range(0, len(texts), batch_size):
+        batch_vectors = await embedding_client.aembed_text(text=texts[i:i+batch_size],
+                                                           document_type=document_type)
+        if not batch_vectors:
+            raise RuntimeError("Embedding client returned an empty response")
+        vectors.extend(batch_vectors)
+    return vectors
+
+def exact_top_k(corpus: np.ndarray, queries: np.ndarray, limit: int):
+    corpus = corpus / np.linalg.norm(corpus, axis=1, keepdims=True)
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    scores = queries @ corpus.T
+    return np.argsort(-scores, axis=1)[:, :limit]
+
+async def evaluate_storage(vectordb_client, storage: str, collection_name: str, embedding_size: int,
+                           chunks, vectors, query_vectors, expected_ids, limit: int):
+
+    _ = await vectordb_client.create_collection(collection_name=collection_name,
+                                                embedding_size=embedding_size,
+                                                do_reset=True, storage=storage)
+    try:
+        _ = await vectordb_client.insert_many(
+            collection_name=collection_name,
+            texts=[ chunk.chunk_text for chunk in chunks ],
+            vectors=vectors,
+            metadata=[ chunk.chunk_metadata for chunk in chunks ],
+            record_ids=[ chunk.chunk_id for chunk in chunks ],
+            defer_index=True,
+        )
+        _ = await vectordb_client.build_vector_index(collection_name=collection_name)
+
+        recalls, durations = [], []
+        for query_vector, expected in zip(query_vectors, expected_ids):
+            started_at = time.perf_counter()
+            results = await vectordb_client.search_by_vector(collection_name=collection_name,
+                                                            vector=query_vector, limit=limit)
+            durations.append(time.perf_counter() - started_at)
+
+            found = [ result.chunk_id for result in results or [] ]
+            recalls.append(sum(1 for chunk_id in expected if chunk_id in found) / len(expected))
+    finally:
+        _ = await vectordb_client.delete_collection(collection_name=collection_name)
+
+    durations_ms = np.array(durations) * 1000
+    return {
+        "recall": float(np.mean(recalls)),
+        "latency_mean_ms": float(durations_ms.mean()),
+        "latency_p95_ms": float(np.percentile(durations_ms, 95)),
+    }
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--project-id", type=int, required=True)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--queries-file", type=str, default=None)
+    parser.add_argument("--storages", type=str, nargs="+",
+                        default=[ storage.value for storage in VectorStorageEnums ])
+    parser.add_argument("--embedding-batch-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
+    db_engine = create_async_engine(postgres_conn)
+    db_client = sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+    llm_provider_factory = LLMProviderFactory(settings)
+    embedding_client = llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
+    embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
+                                         embedding_size=settings.EMBEDDING_MODEL_SIZE)
+
+    vectordb_client = VectorDBProviderFactory(config=settings, db_client=db_client).create(
+        provider=settings.VECTOR_DB_BACKEND
+    )
+    await vectordb_client.connect()
+
+    try:
+        chunks = await load_project_chunks(db_client=db_client, project_id=args.project_id)
+        if not chunks:
+            print(f"project {args.project_id} has no chunks")
+            return
+
+        vectors = await embed_all(embedding_client, [ chunk.chunk_text for chunk in chunks ],
+                                  document_type=DocumentTypeEnum.DOCUMENT.value,
+                                  batch_size=args.embedding_batch_size)
+
+        if args.queries_file:
+            with open(args.queries_file, encoding="utf-8") as f:
+                queries = [ line.strip() for line in f if line.strip() ][:args.queries]
+            query_vectors = await embed_all(embedding_client, queries,
+                                            document_type=DocumentTypeEnum.QUERY.value,
+                                            batch_size=args.embedding_batch_size)
+        else:
+            rnd = random.Random(args.seed)
+            sample = rnd.sample(range(len(chunks)), min(args.queries, len(chunks)))
+            query_vectors = [ vectors[idx] for idx in sample ]
+
+        limit = min(args.limit, len(chunks))
+        top_k = exact_top_k(np.asarray(vectors, dtype=np.float32),
+                            np.asarray(query_vectors, dtype=np.float32), limit=limit)
+        expected_ids = [ [ chunks[idx].chunk_id for idx in row ] for row in top_k ]
+
+        print(f"backend={settings.VECTOR_DB_BACKEND} project={args.project_id} chunks={len(chunks)} "
+              f"queries={len(query_vectors)} limit={limit}")
+
+        baseline = None
+        for storage in args.storages:
+            collection_name = f"eval_{storage}_{settings.EMBEDDING_MODEL_SIZE}_{args.project_id}"
+            report = await evaluate_storage(vectordb_client, storage=storage, collection_name=collection_name,
+                                            embedding_size=settings.EMBEDDING_MODEL_SIZE, chunks=chunks,
+                                            vectors=vectors, query_vectors=query_vectors,
+                                            expected_ids=expected_ids, limit=limit)
+            baseline = baseline or report
+
+            print(f"{storage:>8}: recall@{limit}={report['recall']:.4f} "
+                  f"({report['recall'] - baseline['recall']:+.4f})  "
+                  f"mean={report['latency_mean_ms']:7.2f} ms  p95={report['latency_p95_ms']:7.2f} ms "
+                  f"({report['latency_mean_ms'] - baseline['latency_mean_ms']:+.2f} ms)")
+    finally:
+        await vectordb_client.disconnect()
+        await llm_provider_factory.close()
+        await db_engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
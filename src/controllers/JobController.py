@@ -0,0 +1,405 @@
+from .BaseController import BaseController
+from .ProcessController import ProcessController
+from .NLPController import NLPController
+from .PipelineController import PipelineController, PipelineStats, PipelineCancelledError
+from models.JobModel import JobModel
+from models.ChunkModel import ChunkModel
+from models.ProjectModel import ProjectModel
+from models.AssetModel import AssetModel
+from models.db_schemes import Project, ProcessingJob
+from models.enums.JobEnums import JobStatusEnum
+from models.enums.AssetTypeEnum import AssetTypeEnum
+from helpers.extraction_pool import ExtractionPool, ExtractionTimeoutError
+from sqlalchemy import func
+import asyncio
+import logging
+
+logger = logging.getLogger('uvicorn.error')
+
+class JobController(BaseController):
+
+    def __init__(self, db_client: object, nlp_controller: NLPController = None,
+                       extraction_pool: ExtractionPool = None):
+        super().__init__()
+
+        self.db_client = db_client
+        self.nlp_controller = nlp_controller
+        self.extraction_pool = extraction_pool
+
+    async def bump_project_index_version(self, project: Project):
+        # cached search results and answers of the project become unreachable
+        try:
+            project_model = await ProjectModel.create_instance(db_client=self.db_client)
+            project.project_index_version = await project_model.bump_index_version(project_id=project.project_id)
+        except Exception as e:
+            logger.error(f"Error while bumping the index version of project {project.project_id}: {e}")
+
+    async def keep_job_alive(self, job_model: JobModel, job_id: int):
+        # a single page can take longer than the heartbeat window, so the
+        # heartbeat does not wait for the page checkpoints
+        interval = self.app_settings.INDEX_JOB_HEARTBEAT_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await job_model.touch_job(job_id=job_id)
+            except Exception as e:
+                logger.error(f"Error while refreshing the heartbeat of job {job_id}: {e}")
+
+    def get_job_details(self, job: ProcessingJob):
+        return {
+            "job_id": job.job_id,
+            "job_type": job.job_type,
+            "job_status": job.job_status,
+            "project_id": job.job_project_id,
+            "total_files": job.job_total_files,
+            "processed_files": job.job_processed_files,
+            "inserted_chunks": job.job_inserted_chunks,
+            "errors": job.job_errors or [],
+            "stats": job.job_stats or {},
+            "checkpoint": job.job_checkpoint or {},
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        }
+
+    async def run_process_job(self, job_id: int, project: Project, project_files_ids: dict,
+                              chunk_size: int, overlap_size: int, do_reset: int = 0):
+
+        job_model = await JobModel.create_instance(db_client=self.db_client)
+        chunk_model = await ChunkModel.create_instance(db_client=self.db_client)
+
+        if await job_model.get_job_status(job_id=job_id) == JobStatusEnum.CANCELLED.value:
+            return False
+
+        await job_model.update_job(
+            job_id=job_id,
+            job_status=JobStatusEnum.RUNNING.value,
+            started_at=func.now(),
+        )
+
+        process_controller = ProcessController(project_id=project.project_id)
+
+        no_records = 0
+        no_files = 0
+        errors = []
+
+        try:
+            if do_reset == 1:
+                # delete associated vectors collection
+                _ = await self.nlp_controller.reset_vector_db_collection(project=project)
+
+                # delete associated chunks
+                _ = await chunk_model.delete_chunks_by_project_id(
+                    project_id=project.project_id
+                )
+                await self.bump_project_index_version(project=project)
+
+            for asset_id, file_id in project_files_ids.items():
+
+                # the job may have been cancelled from another worker process
+                if await job_model.get_job_status(job_id=job_id) == JobStatusEnum.CANCELLED.value:
+                    logger.info(f"Job {job_id} was cancelled after {no_files} files")
+                    await job_model.update_job(job_id=job_id, finished_at=func.now())
+                    return False
+
+                file_chunks = None
+                try:
+                    file_content = await process_controller.aget_file_content(
+                        file_id=file_id,
+                        extraction_pool=self.extraction_pool,
+                    )
+                except ExtractionTimeoutError:
+                    errors.append({"file_id": file_id, "error": "extraction_timeout"})
+                    file_content = None
+                except Exception as e:
+                    logger.error(f"Error while extracting file {file_id}: {e}")
+                    errors.append({"file_id": file_id, "error": str(e)})
+                    file_content = None
+
+                if file_content is None:
+                    logger.error(f"Error while processing file: {file_id}")
+                    if not errors or errors[-1]["file_id"] != file_id:
+                        errors.append({"file_id": file_id, "error": "file_content_not_found"})
+                else:
+                    file_chunks = process_controller.process_file_content(
+                        file_content=file_content,
+                        file_id=file_id,
+                        chunk_size=chunk_size,
+                        overlap_size=overlap_size
+                    )
+
+                    if file_chunks is None or len(file_chunks) == 0:
+                        errors.append({"file_id": file_id, "error": "no_chunks_generated"})
+
+                if file_chunks:
+                    file_chunks_records = [
+                        {
+                            "chunk_text": chunk.page_content,
+                            "chunk_metadata": chunk.metadata,
+                            "chunk_order": i+1,
+                            "chunk_project_id": project.project_id,
+                            "chunk_asset_id": asset_id,
+                        }
+                        for i, chunk in enumerate(file_chunks)
+                    ]
+
+                    chunks_ids = await chunk_model.bulk_insert_chunks(chunks=file_chunks_records)
+                    no_records += len(chunks_ids)
+                    no_files += 1
+
+                await job_model.update_job(
+                    job_id=job_id,
+                    job_processed_files=no_files,
+                    job_inserted_chunks=no_records,
+                    job_errors=errors,
+                )
+
+        except asyncio.CancelledError:
+            await job_model.update_job(
+                job_id=job_id,
+                job_status=JobStatusEnum.CANCELLED.value,
+                finished_at=func.now(),
+            )
+            raise
+
+        except Exception as e:
+            logger.error(f"Error while running process job {job_id}: {e}")
+            errors.append({"file_id": None, "error": str(e)})
+            await job_model.update_job(
+                job_id=job_id,
+                job_status=JobStatusEnum.FAILED.value,
+                job_errors=errors,
+                finished_at=func.now(),
+            )
+            return False
+
+        finally:
+            await self.bump_project_index_version(project=project)
+
+        await job_model.update_job(
+            job_id=job_id,
+            job_status=JobStatusEnum.COMPLETED.value if no_files > 0 else JobStatusEnum.FAILED.value,
+            finished_at=func.now(),
+        )
+
+        return True
+
+    async def run_ingest_job(self, job_id: int, project: Project, project_files_ids: dict,
+                             chunk_size: int, overlap_size: int, do_reset: int = 0, storage: str = None):
+
+        job_model = await JobModel.create_instance(db_client=self.db_client)
+        chunk_model = await ChunkModel.create_instance(db_client=self.db_client)
+
+        if await job_model.get_job_status(job_id=job_id) == JobStatusEnum.CANCELLED.value:
+            return False
+
+        await job_model.update_job(
+            job_id=job_id,
+            job_status=JobStatusEnum.RUNNING.value,
+            started_at=func.now(),
+        )
+
+        pipeline_controller = PipelineController(
+            db_client=self.db_client,
+            nlp_controller=self.nlp_controller,
+            extraction_pool=self.extraction_pool,
+        )
+
+        async def on_progress(stats: PipelineStats):
+            _ = await job_model.update_job(
+                job_id=job_id,
+                job_processed_files=stats.processed_files,
+                job_inserted_chunks=stats.inserted_chunks,
+                job_errors=stats.errors,
+                job_stats=stats.to_dict(),
+            )
+            # the job may have been cancelled from another worker process
+            return await job_model.get_job_status(job_id=job_id) != JobStatusEnum.CANCELLED.value
+
+        stats = None
+        try:
+            if do_reset == 1:
+                # vectors reference chunks, so drop the collection first
+                _ = await self.nlp_controller.reset_vector_db_collection(project=project)
+                _ = await chunk_model.delete_chunks_by_project_id(
+                    project_id=project.project_id
+                )
+                await self.bump_project_index_version(project=project)
+
+            stats = await pipeline_controller.run(
+                project=project,
+                project_files_ids=project_files_ids,
+                chunk_size=chunk_size,
+                overlap_size=overlap_size,
+                storage=storage,
+                on_progress=on_progress,
+            )
+
+        except PipelineCancelledError:
+            logger.info(f"Job {job_id} was cancelled")
+            await job_model.update_job(job_id=job_id, finished_at=func.now())
+            return False
+
+        except asyncio.CancelledError:
+            await job_model.update_job(
+                job_id=job_id,
+                job_status=JobStatusEnum.CANCELLED.value,
+                finished_at=func.now(),
+            )
+            raise
+
+        except Exception as e:
+            logger.error(f"Error while running ingest job {job_id}: {e}")
+            await job_model.update_job(
+                job_id=job_id,
+                job_status=JobStatusEnum.FAILED.value,
+                job_errors=[{"file_id": None, "error": str(e)}],
+                finished_at=func.now(),
+            )
+            return False
+
+        finally:
+            await self.bump_project_index_version(project=project)
+
+        await job_model.update_job(
+            job_id=job_id,
+            job_status=JobStatusEnum.COMPLETED.value if stats.processed_files > 0 else JobStatusEnum.FAILED.value,
+            job_processed_files=stats.processed_files,
+            job_inserted_chunks=stats.inserted_chunks,
+            job_errors=stats.errors,
+            job_stats=stats.to_dict(),
+            finished_at=func.now(),
+        )
+
+        return True
+
+    async def run_index_job(self, job_id: int, project: Project, do_reset: int = 0, storage: str = None):
+        """
+        Pushes the project chunks that are not indexed for the current embedding model.
+        The last committed chunk_id is checkpointed on the job after every page,
+        so a failed run is resumed from there instead of starting over.
+        """
+
+        job_model = await JobModel.create_instance(db_client=self.db_client)
+        chunk_model = await ChunkModel.create_instance(db_client=self.db_client)
+        asset_model = await AssetModel.create_instance(db_client=self.db_client)
+
+        job = await job_model.get_job(job_id=job_id)
+        embedding_model_id = self.nlp_controller.embedding_client.embedding_model_id
+
+        checkpoint = job.job_checkpoint or {}
+        after_chunk_id = checkpoint.get("last_chunk_id", 0)
+        inserted_chunks = job.job_inserted_chunks or 0
+        job_stats = dict(job.job_stats or {})
+
+        await job_model.update_job(
+            job_id=job_id,
+            job_status=JobStatusEnum.RUNNING.value,
+            started_at=job.started_at or func.now(),
+            finished_at=None,
+        )
+        heartbeat_task = asyncio.create_task(self.keep_job_alive(job_model=job_model, job_id=job_id))
+
+        try:
+            collection_name = self.nlp_controller.create_collection_name(project_id=project.project_id)
+            is_collection_created = await self.nlp_controller.vectordb_client.create_collection(
+                collection_name=collection_name,
+                embedding_size=self.nlp_controller.embedding_client.embedding_size,
+                do_reset=do_reset,
+                storage=storage,
+            )
+
+            # a new collection holds no vectors, whatever the chunks say
+            if do_reset or is_collection_created:
+                _ = await chunk_model.reset_project_chunks_indexing(project_id=project.project_id)
+                after_chunk_id = 0
+
+            if "total_chunks" not in job_stats:
+                job_stats["total_chunks"] = await chunk_model.get_total_chunks_count(
+                    project_id=project.project_id,
+                    not_indexed_for=embedding_model_id,
+                )
+                await job_model.update_job(job_id=job_id, job_stats=job_stats)
+
+            # file names of the search results
+            asset_names = {
+                asset.asset_id: asset.asset_name
+                for asset in await asset_model.get_all_project_assets(asset_project_id=project.project_id,
+                                                                      asset_type=AssetTypeEnum.FILE.value)
+            }
+
+            async for page_chunks in chunk_model.iter_project_chunks(project_id=project.project_id,
+                                                                     after_chunk_id=after_chunk_id,
+                                                                     not_indexed_for=embedding_model_id):
+
+                if await job_model.get_job_status(job_id=job_id) == JobStatusEnum.CANCELLED.value:
+                    logger.info(f"Index job {job_id} was cancelled after {inserted_chunks} chunks")
+                    await job_model.update_job(job_id=job_id, finished_at=func.now())
+                    return False
+
+                chunks_ids = [ c.chunk_id for c in page_chunks ]
+
+                is_inserted = await self.nlp_controller.index_into_vector_db(
+                    project=project,
+                    chunks=page_chunks,
+                    chunks_ids=chunks_ids,
+                    replace_existing=True,
+                    asset_names=asset_names,
+                )
+
+                if not is_inserted:
+                    raise RuntimeError(f"Error while inserting into collection: {collection_name}")
+
+                _ = await chunk_model.mark_chunks_indexed(chunk_ids=chunks_ids,
+                                                          embedding_model_id=embedding_model_id)
+
+                inserted_chunks += len(chunks_ids)
+                after_chunk_id = chunks_ids[-1]
+                await job_model.update_job(
+                    job_id=job_id,
+                    job_inserted_chunks=inserted_chunks,
+                    job_checkpoint={
+                        "last_chunk_id": after_chunk_id,
+                        "embedding_model_id": embedding_model_id,
+                    },
+                )
+
+            # vectors of chunks that were deleted since the last push
+            job_stats["deleted_chunks"] = await self.nlp_controller.delete_orphan_vectors(
+                project=project,
+                chunk_model=chunk_model,
+            )
+
+            # bulk loads defer the vector index until all the chunks are in
+            job_stats["index_build"] = await self.nlp_controller.build_vector_db_index(project=project) or None
+
+        except asyncio.CancelledError:
+            await job_model.update_job(
+                job_id=job_id,
+                job_status=JobStatusEnum.CANCELLED.value,
+                finished_at=func.now(),
+            )
+            raise
+
+        except Exception as e:
+            logger.error(f"Error while running index job {job_id}: {e}")
+            await job_model.update_job(
+                job_id=job_id,
+                job_status=JobStatusEnum.FAILED.value,
+                job_errors=[{"last_chunk_id": after_chunk_id, "error": str(e)}],
+                finished_at=func.now(),
+            )
+            return False
+
+        finally:
+            heartbeat_task.cancel()
+            await self.bump_project_index_version(project=project)
+
+        await job_model.update_job(
+            job_id=job_id,
+            job_status=JobStatusEnum.COMPLETED.value,
+            job_stats=job_stats,
+            finished_at=func.now(),
+        )
+
+        return True
@@ -1,19 +1,28 @@
 from .BaseController import BaseController
-from models.db_schemes import Project, DataChunk
+from models.db_schemes import Project, DataChunk, RetrievedDocument
 from stores.llm.LLMEnums import DocumentTypeEnum
-from typing import List
+from stores.vectordb.VectorDBEnums import SearchModeEnums
+from typing import List, Union
+import asyncio
+import logging
 import json
 
+logger = logging.getLogger('uvicorn.error')
+
 class NLPController(BaseController):
 
     def __init__(self, vectordb_client, generation_client, 
-                 embedding_client, template_parser):
+                 embedding_client, template_parser, embedding_scheduler=None,
+                 query_embedding_cache=None, result_cache=None):
         super().__init__()
 
         self.vectordb_client = vectordb_client
         self.generation_client = generation_client
         self.embedding_client = embedding_client
         self.template_parser = template_parser
+        self.embedding_scheduler = embedding_scheduler
+        self.query_embedding_cache = query_embedding_cache
+        self.result_cache = result_cache
 
     def create_collection_name(self, project_id: str):
         return f"collection_{self.vectordb_client.default_vector_size}_{project_id}".strip()
@@ -30,18 +39,76 @@ class NLPController(BaseController):
             json.dumps(collection_info, default=lambda x: x.__dict__)
         )
     
+    async def embed_texts(self, texts: Union[str, List[str]], document_type: str):
+        if self.embedding_scheduler:
+            return await self.embedding_scheduler.embed(texts=texts, document_type=document_type)
+
+        return await self.embedding_client.aembed_text(text=texts, document_type=document_type)
+
+    async def embed_queries(self, texts: List[str]):
+        """
+        Query vectors in the order of `texts`. Cached queries are skipped and all
+        the others are embedded together in one call.
+        """
+
+        model_id = self.embedding_client.embedding_model_id
+        embedding_size = self.embedding_client.embedding_size
+
+        query_vectors = [None] * len(texts)
+        if self.query_embedding_cache:
+            # the cache key ignores whitespace differences, so embed the same normalized text
+            texts = [ self.query_embedding_cache.normalize_text(text) for text in texts ]
+            query_vectors = [
+                self.query_embedding_cache.get(text=text, model_id=model_id, embedding_size=embedding_size)
+                for text in texts
+            ]
+
+        missed_texts = list(dict.fromkeys(text for text, vector in zip(texts, query_vectors) if not vector))
+        if missed_texts:
+            vectors = await self.embed_texts(texts=missed_texts,
+                                             document_type=DocumentTypeEnum.QUERY.value)
+
+            if not vectors or len(vectors) != len(missed_texts):
+                return None
+
+            missed_vectors = dict(zip(missed_texts, vectors))
+            query_vectors = [ vector or missed_vectors[text] for text, vector in zip(texts, query_vectors) ]
+
+            if self.query_embedding_cache:
+                for text, vector in missed_vectors.items():
+                    self.query_embedding_cache.put(text=text, model_id=model_id,
+                                                   embedding_size=embedding_size, vector=vector)
+
+        return query_vectors
+
+    async def embed_query(self, text: str):
+        query_vectors = await self.embed_queries(texts=[text])
+
+        if not query_vectors or not query_vectors[0]:
+            return None
+
+        return query_vectors[0]
+
     async def index_into_vector_db(self, project: Project, chunks: List[DataChunk],
                                    chunks_ids: List[int], 
-                                   do_reset: bool = False):
+                                   do_reset: bool = False, defer_index: bool = None,
+                                   replace_existing: bool = False, asset_names: dict = None):
         
         # step1: get collection name
         collection_name = self.create_collection_name(project_id=project.project_id)
 
         # step2: manage items
         texts = [ c.chunk_text for c in chunks ]
-        metadata = [ c.chunk_metadata for c in  chunks]
-        vectors = self.embedding_client.embed_text(text=texts, 
-                                                  document_type=DocumentTypeEnum.DOCUMENT.value)
+        # the asset id travels with the vector for the search filters and the search results
+        asset_names = asset_names or {}
+        metadata = [ {**(c.chunk_metadata or {}), "asset_id": c.chunk_asset_id,
+                      "file_name": asset_names.get(c.chunk_asset_id), "chunk_order": c.chunk_order}
+                     for c in chunks ]
+        vectors = await self.embed_texts(texts=texts,
+                                         document_type=DocumentTypeEnum.DOCUMENT.value)
+
+        if not vectors or len(vectors) != len(texts):
+            return False
 
         # step3: create collection if not exists
         _ = await self.vectordb_client.create_collection(
@@ -51,62 +118,288 @@ class NLPController(BaseController):
         )
 
         # step4: insert into vector db
-        _ = await self.vectordb_client.insert_many(
+        if replace_existing:
+            # a chunk re-embedded with another model, or left over from an interrupted run
+            _ = await self.vectordb_client.delete_by_record_ids(
+                collection_name=collection_name,
+                record_ids=chunks_ids,
+            )
+
+        if defer_index is None:
+            defer_index = self.app_settings.VECTOR_DB_PGVEC_BULK_LOAD
+
+        is_inserted = await self.vectordb_client.insert_many(
             collection_name=collection_name,
             texts=texts,
             metadata=metadata,
             vectors=vectors,
             record_ids=chunks_ids,
+            defer_index=defer_index,
         )
 
-        return True
+        # the caller marks the chunks indexed on success only
+        return bool(is_inserted)
 
-    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10):
+    async def delete_orphan_vectors(self, project: Project, chunk_model):
+        # no orphans to look for, and no need to load all the project chunk ids
+        if self.vectordb_client.has_chunk_references:
+            return 0
 
-        # step1: get collection name
-        query_vector = None
         collection_name = self.create_collection_name(project_id=project.project_id)
 
-        # step2: get text embedding vector
-        vectors = self.embedding_client.embed_text(text=text, 
-                                                 document_type=DocumentTypeEnum.QUERY.value)
+        valid_ids = set(await chunk_model.get_project_chunk_ids(project_id=project.project_id))
+        orphan_ids = [
+            record_id
+            for record_id in await self.vectordb_client.list_record_ids(collection_name=collection_name)
+            if record_id not in valid_ids
+        ]
 
-        if not vectors or len(vectors) == 0:
-            return False
-        
-        if isinstance(vectors, list) and len(vectors) > 0:
-            query_vector = vectors[0]
+        if not orphan_ids:
+            return 0
+
+        _ = await self.vectordb_client.delete_by_record_ids(
+            collection_name=collection_name,
+            record_ids=orphan_ids,
+        )
+        return len(orphan_ids)
+
+    async def build_vector_db_index(self, project: Project):
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        return await self.vectordb_client.build_vector_index(collection_name=collection_name)
+
+    def make_result_cache_key(self, kind: str, project: Project, text: str, **params):
+        return self.result_cache.make_key(
+            kind=kind,
+            project_id=project.project_id,
+            index_version=project.project_index_version,
+            text=text,
+            embedding_model_id=self.embedding_client.embedding_model_id,
+            embedding_size=self.embedding_client.embedding_size,
+            # filters and search params are dicts, keys must be hashable
+            **{
+                key: json.dumps(value, sort_keys=True) if isinstance(value, dict) else value
+                for key, value in params.items()
+            },
+        )
+
+    def get_search_params(self, project: Project, search_params: dict = None):
+        """
+        ef_search / probes / exact of a search: the request values override
+        the project search config, which overrides the VECTOR_DB_SEARCH_* settings.
+        """
+
+        merged_params = {
+            "ef_search": self.app_settings.VECTOR_DB_SEARCH_EF,
+            "probes": self.app_settings.VECTOR_DB_SEARCH_PROBES,
+            "exact": self.app_settings.VECTOR_DB_SEARCH_EXACT,
+        }
+
+        for overrides in [project.project_search_config or {}, search_params or {}]:
+            merged_params.update({
+                key: value
+                for key, value in overrides.items()
+                if key in merged_params and value is not None
+            })
+
+        return merged_params
+
+    def fuse_results(self, results_lists: List[List[RetrievedDocument]], limit: int):
+        """
+        Reciprocal rank fusion: every list adds 1 / (k + rank) to the score of its documents,
+        so documents ranked well by both retrievers come first whatever their raw scores.
+        Documents are matched by chunk id, or by text for the results without payload.
+        """
+
+        rrf_k = self.app_settings.SEARCH_HYBRID_RRF_K
+
+        fused_scores, documents = {}, {}
+        for results in results_lists:
+            for rank, result in enumerate(results or [], start=1):
+                key = result.chunk_id if result.chunk_id is not None else result.text
+                fused_scores[key] = fused_scores.get(key, 0.0) + 1 / (rrf_k + rank)
+                documents.setdefault(key, result)
+
+        ranked_keys = sorted(fused_scores, key=fused_scores.get, reverse=True)[:limit]
+
+        return [
+            documents[key].copy(update={"score": fused_scores[key]})
+            for key in ranked_keys
+        ]
+
+    async def search_by_query_vector(self, collection_name: str, text: str, limit: int,
+                                     search_filter: dict = None, search_params: dict = None,
+                                     query_vector: list = None, with_payload: bool = True):
+        query_vector = query_vector or await self.embed_query(text=text)
 
         if not query_vector:
-            return False    
+            return None
 
-        # step3: do semantic search
-        results = await self.vectordb_client.search_by_vector(
+        return await self.vectordb_client.search_by_vector(
             collection_name=collection_name,
             vector=query_vector,
-            limit=limit
+            limit=limit,
+            search_filter=search_filter,
+            search_params=search_params,
+            with_payload=with_payload,
         )
 
+    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10,
+                                          mode: str = None, search_filter: dict = None,
+                                          search_params: dict = None, query_vector: list = None,
+                                          with_payload: bool = True):
+        """
+        search_filter: {"asset_ids": [...], "page_from": ..., "page_to": ...}, every key optional.
+        search_params: {"ef_search": ..., "probes": ..., "exact": ...}, see get_search_params.
+        query_vector: the embedding of `text` when the caller already has it.
+        with_payload: False returns only the text and score of the results.
+        """
+
+        mode = mode or self.app_settings.SEARCH_DEFAULT_MODE
+        search_params = self.get_search_params(project=project, search_params=search_params)
+
+        cache_key = None
+        if self.result_cache:
+            cache_key = self.make_result_cache_key("search", project=project, text=text, limit=limit, mode=mode,
+                                                   search_filter=search_filter, search_params=search_params,
+                                                   with_payload=with_payload)
+            cached_results = self.result_cache.get(cache_key)
+            if cached_results:
+                return cached_results
+
+        # step1: get collection name
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        # step2: do the semantic and / or lexical search
+        if mode == SearchModeEnums.LEXICAL.value:
+            results = await self.vectordb_client.search_by_text(
+                collection_name=collection_name,
+                text=text,
+                limit=limit,
+                search_filter=search_filter,
+                with_payload=with_payload,
+            )
+
+        elif mode == SearchModeEnums.HYBRID.value:
+            candidates = limit * self.app_settings.SEARCH_HYBRID_CANDIDATES_FACTOR
+            vector_results, text_results = await asyncio.gather(
+                self.search_by_query_vector(collection_name=collection_name, text=text, limit=candidates,
+                                            search_filter=search_filter, search_params=search_params,
+                                            query_vector=query_vector, with_payload=with_payload),
+                self.vectordb_client.search_by_text(collection_name=collection_name, text=text, limit=candidates,
+                                                    search_filter=search_filter, with_payload=with_payload),
+            )
+
+            results = self.fuse_results([vector_results, text_results], limit=limit)
+
+        else:
+            results = await self.search_by_query_vector(collection_name=collection_name, text=text, limit=limit,
+                                                        search_filter=search_filter, search_params=search_params,
+                                                        query_vector=query_vector, with_payload=with_payload)
+
         if not results:
             return False
 
+        if cache_key:
+            self.result_cache.put(cache_key, results)
+
         return results
-    
-    async def answer_rag_question(self, project: Project, query: str, limit: int = 10):
-        
-        answer, full_prompt, chat_history = None, None, None
 
-        # step1: retrieve related documents
-        retrieved_documents = await self.search_vector_db_collection(
-            project=project,
-            text=query,
+    async def search_vector_db_collection_batch(self, project: Project, texts: List[str], limit: int = 10,
+                                                search_filter: dict = None, search_params: dict = None,
+                                                with_payload: bool = True):
+
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        search_params = self.get_search_params(project=project, search_params=search_params)
+
+        results = [None] * len(texts)
+        cache_keys = [None] * len(texts)
+        if self.result_cache:
+            cache_keys = [
+                self.make_result_cache_key("search", project=project, text=text, limit=limit,
+                                           mode=SearchModeEnums.VECTOR.value, search_filter=search_filter,
+                                           search_params=search_params, with_payload=with_payload)
+                for text in texts
+            ]
+            results = [ self.result_cache.get(cache_key) for cache_key in cache_keys ]
+
+        missed_idx = [ idx for idx, result in enumerate(results) if not result ]
+        if not missed_idx:
+            return results
+
+        # one embedding call and one vector db round-trip for all the missed queries
+        query_vectors = await self.embed_queries(texts=[ texts[idx] for idx in missed_idx ])
+
+        if not query_vectors:
+            return False
+
+        missed_results = await self.vectordb_client.search_by_vectors(
+            collection_name=collection_name,
+            vectors=query_vectors,
             limit=limit,
+            search_filter=search_filter,
+            search_params=search_params,
+            with_payload=with_payload,
         )
 
-        if not retrieved_documents or len(retrieved_documents) == 0:
-            return answer, full_prompt, chat_history
-        
-        # step2: Construct LLM prompt
+        if missed_results is False or missed_results is None:
+            return False
+
+        for idx, query_results in zip(missed_idx, missed_results):
+            results[idx] = query_results
+            if query_results and cache_keys[idx]:
+                self.result_cache.put(cache_keys[idx], query_results)
+
+        return results
+
+    async def search_projects(self, projects: List[Project], text: str, limit: int = 10,
+                              mode: str = None, search_params: dict = None, with_payload: bool = True):
+        """
+        One search over several projects: the query is embedded once, every project
+        collection is searched concurrently within SEARCH_MULTI_PROJECT_TIMEOUT_SECONDS,
+        and the results are merged by score.
+        Returns ([(project_id, document), ...], ids of the projects that failed or timed out).
+        """
+
+        mode = mode or self.app_settings.SEARCH_DEFAULT_MODE
+        timeout = self.app_settings.SEARCH_MULTI_PROJECT_TIMEOUT_SECONDS
+
+        query_vector = None
+        if mode != SearchModeEnums.LEXICAL.value:
+            query_vector = await self.embed_query(text=text)
+            if not query_vector:
+                return None, [ project.project_id for project in projects ]
+
+        projects_results = await asyncio.gather(*[
+            asyncio.wait_for(
+                self.search_vector_db_collection(project=project, text=text, limit=limit, mode=mode,
+                                                 search_params=search_params, query_vector=query_vector,
+                                                 with_payload=with_payload),
+                timeout=timeout,
+            )
+            for project in projects
+        ], return_exceptions=True)
+
+        results, failed_project_ids = [], []
+        for project, project_results in zip(projects, projects_results):
+            if isinstance(project_results, asyncio.TimeoutError):
+                logger.warning(f"Search of project {project.project_id} timed out after {timeout}s")
+                failed_project_ids.append(project.project_id)
+                continue
+
+            if isinstance(project_results, Exception):
+                logger.error(f"Search of project {project.project_id} failed: {project_results}")
+                failed_project_ids.append(project.project_id)
+                continue
+
+            # False: empty or missing collection, not an error
+            results.extend([ (project.project_id, result) for result in project_results or [] ])
+
+        # one embedding model for all the collections, so the scores are comparable
+        results = sorted(results, key=lambda item: item[1].score, reverse=True)[:limit]
+
+        return results, failed_project_ids
+
+    def construct_rag_prompt(self, query: str, retrieved_documents: List[RetrievedDocument]):
         system_prompt = self.template_parser.get("rag", "system_prompt")
 
         documents_prompts = "\n".join([
@@ -121,7 +414,6 @@ class NLPController(BaseController):
             "query": query
         })
 
-        # step3: Construct Generation Client Prompts
         chat_history = [
             self.generation_client.construct_prompt(
                 prompt=system_prompt,
@@ -131,11 +423,78 @@ class NLPController(BaseController):
 
         full_prompt = "\n\n".join([ documents_prompts,  footer_prompt])
 
-        # step4: Retrieve the Answer
-        answer = self.generation_client.generate_text(
+        return full_prompt, chat_history
+
+    async def answer_rag_question(self, project: Project, query: str, limit: int = 10, mode: str = None,
+                                  search_filter: dict = None, search_params: dict = None):
+        
+        answer, full_prompt, chat_history = None, None, None
+
+        cache_key = None
+        if self.result_cache:
+            cache_key = self.make_result_cache_key(
+                "answer", project=project, text=query, limit=limit,
+                mode=mode or self.app_settings.SEARCH_DEFAULT_MODE,
+                search_filter=search_filter,
+                search_params=self.get_search_params(project=project, search_params=search_params),
+                generation_model_id=self.generation_client.generation_model_id,
+                language=self.template_parser.language,
+            )
+            cached_answer = self.result_cache.get(cache_key)
+            if cached_answer:
+                return cached_answer
+
+        # step1: retrieve related documents, the prompt only needs their text
+        retrieved_documents = await self.search_vector_db_collection(
+            project=project,
+            text=query,
+            limit=limit,
+            mode=mode,
+            search_filter=search_filter,
+            search_params=search_params,
+            with_payload=False,
+        )
+
+        if not retrieved_documents or len(retrieved_documents) == 0:
+            return answer, full_prompt, chat_history
+        
+        # step2: Construct LLM prompt
+        full_prompt, chat_history = self.construct_rag_prompt(query=query, retrieved_documents=retrieved_documents)
+
+        # step3: Retrieve the Answer
+        answer = await self.generation_client.agenerate_text(
             prompt=full_prompt,
             chat_history=chat_history
         )
 
+        if answer and cache_key:
+            self.result_cache.put(cache_key, (answer, full_prompt, chat_history))
+
         return answer, full_prompt, chat_history
 
+    async def answer_rag_question_multi(self, projects: List[Project], query: str, limit: int = 10,
+                                        mode: str = None, search_params: dict = None):
+        """
+        One answer from the best chunks of several projects, see search_projects.
+        """
+
+        answer, full_prompt, chat_history = None, None, None
+
+        results, failed_project_ids = await self.search_projects(projects=projects, text=query, limit=limit,
+                                                                 mode=mode, search_params=search_params,
+                                                                 with_payload=False)
+
+        if not results:
+            return answer, full_prompt, chat_history, failed_project_ids
+
+        full_prompt, chat_history = self.construct_rag_prompt(
+            query=query,
+            retrieved_documents=[ document for _, document in results ],
+        )
+
+        answer = await self.generation_client.agenerate_text(
+            prompt=full_prompt,
+            chat_history=chat_history
+        )
+
+        return answer, full_prompt, chat_history, failed_project_ids
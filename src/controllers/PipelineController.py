@@ -0,0 +1,297 @@
+from .BaseController import BaseController
+from .ProcessController import ProcessController
+from .NLPController import NLPController
+from models.ChunkModel import ChunkModel
+from models.db_schemes import Project
+from helpers.extraction_pool import ExtractionPool
+from stores.llm.LLMEnums import DocumentTypeEnum
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger('uvicorn.error')
+
+class PipelineCancelledError(Exception):
+    pass
+
+@dataclass
+class StageStats:
+    name: str
+    items: int = 0
+    batches: int = 0
+    busy_seconds: float = 0.0
+    started_at: float = None
+    finished_at: float = None
+
+    def to_dict(self):
+        elapsed = ((self.finished_at or time.perf_counter()) - self.started_at) if self.started_at else 0.0
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "elapsed_seconds": round(elapsed, 3),
+            "items_per_second": round(self.items / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+@dataclass
+class PipelineStats:
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+    processed_files: int = 0
+    inserted_chunks: int = 0
+    errors: list = field(default_factory=list)
+
+    def stage(self, name: str) -> StageStats:
+        if name not in self.stages:
+            self.stages[name] = StageStats(name=name)
+        return self.stages[name]
+
+    def to_dict(self):
+        return {
+            name: stage.to_dict()
+            for name, stage in self.stages.items()
+        }
+
+class PipelineController(BaseController):
+    """
+    Streaming ingest-and-index pipeline: extract -> chunk -> embed -> write.
+    Stages are joined by bounded queues so they overlap and memory stays flat.
+    """
+
+    _END = object()
+
+    def __init__(self, db_client: object, nlp_controller: NLPController,
+                       extraction_pool: ExtractionPool):
+        super().__init__()
+
+        self.db_client = db_client
+        self.nlp_controller = nlp_controller
+        self.extraction_pool = extraction_pool
+
+        self.queue_size = self.app_settings.PIPELINE_QUEUE_SIZE
+        self.embedding_batch_size = self.app_settings.PIPELINE_EMBEDDING_BATCH_SIZE
+        self.embedding_workers = self.app_settings.PIPELINE_EMBEDDING_WORKERS
+        self.defer_index = self.app_settings.VECTOR_DB_PGVEC_BULK_LOAD
+        self.embedding_model_id = self.nlp_controller.embedding_client.embedding_model_id
+
+    async def _extract_stage(self, process_controller: ProcessController, project_files_ids: dict,
+                             out_queue: asyncio.Queue, stats: PipelineStats):
+        stage = stats.stage("extract")
+        stage.started_at = time.perf_counter()
+
+        for asset_id, file_id in project_files_ids.items():
+            started_at = time.perf_counter()
+            try:
+                pages = await process_controller.aget_file_content(
+                    file_id=file_id,
+                    extraction_pool=self.extraction_pool,
+                )
+            except Exception as e:
+                logger.error(f"Error while extracting file {file_id}: {e}")
+                pages = None
+
+            stage.busy_seconds += time.perf_counter() - started_at
+
+            if not pages:
+                stats.errors.append({"file_id": file_id, "error": "file_content_not_found"})
+                continue
+
+            stage.items += len(pages)
+            stage.batches += 1
+            await out_queue.put((asset_id, file_id, pages))
+
+        stage.finished_at = time.perf_counter()
+        await out_queue.put(self._END)
+
+    async def _chunk_stage(self, project: Project, process_controller: ProcessController,
+                           chunk_size: int, overlap_size: int,
+                           in_queue: asyncio.Queue, out_queue: asyncio.Queue, stats: PipelineStats):
+        stage = stats.stage("chunk")
+        stage.started_at = time.perf_counter()
+
+        batch = []
+        while True:
+            item = await in_queue.get()
+            if item is self._END:
+                break
+
+            asset_id, file_id, pages = item
+            started_at = time.perf_counter()
+
+            no_chunks = 0
+            for chunk in process_controller.iter_chunks(records=pages, chunk_size=chunk_size,
+                                                        overlap_size=overlap_size):
+                no_chunks += 1
+                batch.append({
+                    "chunk_text": chunk.page_content,
+                    "chunk_metadata": chunk.metadata,
+                    "chunk_order": no_chunks,
+                    "chunk_project_id": project.project_id,
+                    "chunk_asset_id": asset_id,
+                })
+
+                if len(batch) >= self.embedding_batch_size:
+                    stage.busy_seconds += time.perf_counter() - started_at
+                    await out_queue.put((batch, 0))
+                    stage.batches += 1
+                    batch = []
+                    started_at = time.perf_counter()
+
+            stage.busy_seconds += time.perf_counter() - started_at
+            stage.items += no_chunks
+
+            if no_chunks == 0:
+                stats.errors.append({"file_id": file_id, "error": "no_chunks_generated"})
+                continue
+
+            # the batch holding the last chunks of a file also carries its completion
+            await out_queue.put((batch, 1))
+            stage.batches += 1
+            batch = []
+
+        stage.finished_at = time.perf_counter()
+        for _ in range(self.embedding_workers):
+            await out_queue.put(self._END)
+
+    async def _embed_stage(self, in_queue: asyncio.Queue, out_queue: asyncio.Queue, stats: PipelineStats):
+        stage = stats.stage("embed")
+        if stage.started_at is None:
+            stage.started_at = time.perf_counter()
+
+        while True:
+            item = await in_queue.get()
+            if item is self._END:
+                break
+
+            batch, completed_files = item
+            vectors = []
+            started_at = time.perf_counter()
+
+            if len(batch):
+                vectors = await self.nlp_controller.embed_texts(
+                    texts=[ chunk["chunk_text"] for chunk in batch ],
+                    document_type=DocumentTypeEnum.DOCUMENT.value,
+                )
+
+                if not vectors or len(vectors) != len(batch):
+                    raise RuntimeError("Embedding client returned an invalid response")
+
+            stage.busy_seconds += time.perf_counter() - started_at
+            stage.items += len(batch)
+            stage.batches += 1
+
+            await out_queue.put((batch, vectors, completed_files))
+
+        stage.finished_at = time.perf_counter()
+        await out_queue.put(self._END)
+
+    async def _write_stage(self, collection_name: str, asset_names: dict, in_queue: asyncio.Queue,
+                           stats: PipelineStats, on_progress: Callable[[PipelineStats], Awaitable[bool]] = None):
+        stage = stats.stage("write")
+        stage.started_at = time.perf_counter()
+
+        chunk_model = await ChunkModel.create_instance(db_client=self.db_client)
+
+        ended_workers = 0
+        while ended_workers < self.embedding_workers:
+            item = await in_queue.get()
+            if item is self._END:
+                ended_workers += 1
+                continue
+
+            batch, vectors, completed_files = item
+            started_at = time.perf_counter()
+
+            if len(batch):
+                chunks_ids = await chunk_model.bulk_insert_chunks(chunks=batch)
+
+                is_inserted = await self.nlp_controller.vectordb_client.insert_many(
+                    collection_name=collection_name,
+                    texts=[ chunk["chunk_text"] for chunk in batch ],
+                    vectors=vectors,
+                    metadata=[ {**(chunk["chunk_metadata"] or {}), "asset_id": chunk["chunk_asset_id"],
+                                "file_name": asset_names.get(chunk["chunk_asset_id"]),
+                                "chunk_order": chunk["chunk_order"]}
+                               for chunk in batch ],
+                    record_ids=chunks_ids,
+                    defer_index=self.defer_index,
+                )
+
+                if not is_inserted:
+                    raise RuntimeError(f"Error while inserting into collection: {collection_name}")
+
+                # keeps a later delta push from embedding these chunks again
+                _ = await chunk_model.mark_chunks_indexed(chunk_ids=chunks_ids,
+                                                          embedding_model_id=self.embedding_model_id)
+
+            stage.busy_seconds += time.perf_counter() - started_at
+            stage.items += len(batch)
+            stage.batches += 1
+
+            stats.inserted_chunks += len(batch)
+            stats.processed_files += completed_files
+
+            if on_progress and not await on_progress(stats):
+                raise PipelineCancelledError()
+
+        stage.finished_at = time.perf_counter()
+
+    async def run(self, project: Project, project_files_ids: dict,
+                  chunk_size: int, overlap_size: int, do_reset: int = 0, storage: str = None,
+                  on_progress: Callable[[PipelineStats], Awaitable[bool]] = None) -> PipelineStats:
+
+        stats = PipelineStats()
+        process_controller = ProcessController(project_id=project.project_id)
+
+        collection_name = self.nlp_controller.create_collection_name(project_id=project.project_id)
+        _ = await self.nlp_controller.vectordb_client.create_collection(
+            collection_name=collection_name,
+            embedding_size=self.nlp_controller.embedding_client.embedding_size,
+            do_reset=do_reset,
+            storage=storage,
+        )
+
+        pages_queue = asyncio.Queue(maxsize=self.queue_size)
+        chunks_queue = asyncio.Queue(maxsize=self.queue_size)
+        vectors_queue = asyncio.Queue(maxsize=self.queue_size)
+
+        tasks = [
+            asyncio.create_task(self._extract_stage(process_controller, project_files_ids,
+                                                    pages_queue, stats)),
+            asyncio.create_task(self._chunk_stage(project, process_controller, chunk_size, overlap_size,
+                                                  pages_queue, chunks_queue, stats)),
+            *[
+                asyncio.create_task(self._embed_stage(chunks_queue, vectors_queue, stats))
+                for _ in range(self.embedding_workers)
+            ],
+            # the file ids of the project are the asset names
+            asyncio.create_task(self._write_stage(collection_name, project_files_ids, vectors_queue, stats,
+                                                  on_progress=on_progress)),
+        ]
+
+        try:
+            # fail fast: one broken stage stops the whole pipeline
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if not task.cancelled() and task.exception():
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        # the vector index is built once, after the bulk load
+        stage = stats.stage("index")
+        stage.started_at = time.perf_counter()
+        index_report = await self.nlp_controller.vectordb_client.build_vector_index(
+            collection_name=collection_name
+        )
+        stage.finished_at = time.perf_counter()
+
+        if index_report:
+            stage.items = index_report["records_count"]
+            stage.batches = 1
+            stage.busy_seconds = index_report["build_seconds"]
+
+        return stats
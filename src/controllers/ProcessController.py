@@ -1,10 +1,12 @@
 from .BaseController import BaseController
 from .ProjectController import ProjectController
 import os
+import re
 from langchain_community.document_loaders import TextLoader
 from langchain_community.document_loaders import PyMuPDFLoader
 from models import ProcessingEnum
-from typing import List
+from helpers.extraction_pool import ExtractionPool
+from typing import List, Iterable, Iterator
 from dataclasses import dataclass
 
 @dataclass
@@ -50,31 +52,125 @@ class ProcessController(BaseController):
 
         return None
 
-    def process_file_content(self, file_content: list, file_id: str,
-                            chunk_size: int=100, overlap_size: int=20):
+    async def aget_file_content(self, file_id: str, extraction_pool: ExtractionPool):
 
-        file_content_texts = [
-            rec.page_content
-            for rec in file_content
-        ]
+        file_path = os.path.join(
+            self.project_path,
+            file_id
+        )
 
-        file_content_metadata = [
-            rec.metadata
-            for rec in file_content
+        if not os.path.exists(file_path):
+            return None
+
+        pages = await extraction_pool.extract_file(
+            file_path=file_path,
+            file_ext=self.get_file_extension(file_id=file_id),
+        )
+
+        if pages is None:
+            return None
+
+        return [
+            Document(page_content=page["page_content"], metadata=page["metadata"])
+            for page in pages
         ]
 
-        # chunks = text_splitter.create_documents(
-        #     file_content_texts,
-        #     metadatas=file_content_metadata
-        # )
+    def process_file_content(self, file_content: Iterable[Document], file_id: str,
+                            chunk_size: int=100, overlap_size: int=20):
 
-        chunks = self.process_simpler_splitter(
-            texts=file_content_texts,
-            metadatas=file_content_metadata,
+        chunks = self.iter_chunks(
+            records=file_content,
             chunk_size=chunk_size,
+            overlap_size=overlap_size,
         )
 
-        return chunks
+        return list(chunks)
+
+    def iter_chunks(self, records: Iterable[Document], chunk_size: int, overlap_size: int=0,
+                    splitter_tag: str="\n") -> Iterator[Document]:
+        """
+        Streaming splitter: consumes page records one at a time and yields chunks
+        of at least `chunk_size` characters, each one starting with the last
+        `overlap_size` characters of the previous chunk.
+        Runs in linear time and only keeps the current chunk in memory.
+        """
+
+        overlap_size = max(0, min(overlap_size or 0, chunk_size - 1))
+
+        # each segment is (text, page, start_offset, end_offset) inside its page
+        segments = []
+        segments_len = 0
+        has_new_content = False
+
+        def build_chunk():
+            first, last = segments[0], segments[-1]
+            return Document(
+                page_content="".join([ seg[0] for seg in segments ]).strip(),
+                metadata={
+                    "page": first[1],
+                    "start_offset": first[2],
+                    "page_end": last[1],
+                    "end_offset": last[3],
+                }
+            )
+
+        def overlap_segments():
+            tail, tail_len = [], 0
+            for text, page, start, end in reversed(segments):
+                if tail_len >= overlap_size:
+                    break
+
+                remaining = overlap_size - tail_len
+                if len(text) > remaining:
+                    # keep the end of the segment, starting at a word boundary if possible,
+                    # the trailing splitter_tag is not a boundary: keep the raw cut instead
+                    cut = len(text) - remaining
+                    boundary = re.search(r"\s", text[cut:].rstrip())
+                    if boundary:
+                        cut += boundary.start() + 1
+                    text, start = text[cut:], start + cut
+
+                if len(text.strip()) == 0:
+                    break
+
+                tail.append((text, page, start, end))
+                tail_len += len(text)
+
+            tail.reverse()
+            return tail, tail_len
+
+        for page_idx, record in enumerate(records):
+            page = (record.metadata or {}).get("page", page_idx)
+            offset = 0
+
+            for line in record.page_content.split(splitter_tag):
+                line_start, offset = offset, offset + len(line) + len(splitter_tag)
+
+                line_text = line.strip()
+                if len(line_text) <= 1:
+                    continue
+
+                # offsets of the stripped line inside the page
+                text_start = line_start + len(line) - len(line.lstrip())
+                text_end = text_start + len(line_text)
+
+                line_text += splitter_tag
+                segments.append((line_text, page, text_start, text_end))
+                segments_len += len(line_text)
+                has_new_content = True
+
+                if segments_len >= chunk_size:
+                    yield build_chunk()
+                    has_new_content = False
+
+                    if overlap_size > 0:
+                        segments, segments_len = overlap_segments()
+                    else:
+                        segments, segments_len = [], 0
+
+        # do not emit a trailing chunk made only of the previous overlap
+        if segments and has_new_content:
+            yield build_chunk()
 
     def process_simpler_splitter(self, texts: List[str], metadatas: List[dict], chunk_size: int, splitter_tag: str="\n"):
         
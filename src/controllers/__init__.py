@@ -2,4 +2,6 @@ from .DataController import DataController
 from .ProjectController import ProjectController
 from .ProcessController import ProcessController
 from .NLPController import NLPController
+from .PipelineController import PipelineController
+from .JobController import JobController
 
@@ -17,6 +17,21 @@ class Settings(BaseSettings):
     POSTGRES_PORT: int
     POSTGRES_MAIN_DATABASE: str
 
+    PROCESSING_JOB_WORKERS: int = 2
+    PROCESSING_JOB_MAX_PENDING: int = 100
+    PROCESSING_JOB_HEARTBEAT_SECONDS: int = 300
+    INDEX_JOB_HEARTBEAT_SECONDS: int = 300
+
+    EXTRACTION_POOL_WORKERS: int = 2
+    EXTRACTION_FILE_TIMEOUT: int = 120
+    EXTRACTION_PDF_PAGES_PER_TASK: int = 50
+
+    PIPELINE_QUEUE_SIZE: int = 8
+    PIPELINE_EMBEDDING_BATCH_SIZE: int = 64
+    PIPELINE_EMBEDDING_WORKERS: int = 2
+
+    CHUNKS_SCAN_PAGE_SIZE: int = 500
+
     GENERATION_BACKEND: str
     EMBEDDING_BACKEND: str
 
@@ -34,12 +49,67 @@ class Settings(BaseSettings):
     GENERATION_DAFAULT_MAX_TOKENS: int = None
     GENERATION_DAFAULT_TEMPERATURE: float = None
 
+    LLM_HTTP_TIMEOUT: float = 60.0
+    LLM_HTTP_CONNECT_TIMEOUT: float = 10.0
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+
+    EMBEDDING_MAX_CONCURRENCY: int = 4
+    EMBEDDING_REQUESTS_PER_MINUTE: int = 0
+    EMBEDDING_TOKENS_PER_MINUTE: int = 0
+    EMBEDDING_MAX_BATCH_SIZE: int = None
+    EMBEDDING_MAX_BATCH_TOKENS: int = None
+    EMBEDDING_MAX_RETRIES: int = 5
+
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 1000000
+
+    QUERY_EMBEDDING_CACHE_ENABLED: bool = True
+    QUERY_EMBEDDING_CACHE_MAX_ENTRIES: int = 10000
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS: int = 3600
+
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_MAX_ENTRIES: int = 2000
+    RESULT_CACHE_TTL_SECONDS: int = 600
+
+    SEARCH_BATCH_MAX_QUERIES: int = 100
+    SEARCH_DEFAULT_MODE: str = "vector"
+    SEARCH_HYBRID_RRF_K: int = 60
+    SEARCH_HYBRID_CANDIDATES_FACTOR: int = 4
+    SEARCH_MULTI_PROJECT_MAX_PROJECTS: int = 20
+    SEARCH_MULTI_PROJECT_TIMEOUT_SECONDS: float = 5
+
     VECTOR_DB_BACKEND_LITERAL: List[str] = None
     VECTOR_DB_BACKEND : str
     VECTOR_DB_PATH : str
     VECTOR_DB_DISTANCE_METHOD: str = None
+    VECTOR_DB_STORAGE: str = "float"
+    VECTOR_DB_QUANTIZATION_OVERSAMPLING: float = 2.0
+    VECTOR_DB_SEARCH_EF: int = None
+    VECTOR_DB_SEARCH_PROBES: int = None
+    VECTOR_DB_SEARCH_EXACT: bool = False
     VECTOR_DB_PGVEC_INDEX_THRESHOLD: int = 100
 
+    VECTOR_DB_QDRANT_URL: str = None
+    VECTOR_DB_QDRANT_API_KEY: str = None
+    VECTOR_DB_QDRANT_PREFER_GRPC: bool = True
+    VECTOR_DB_QDRANT_GRPC_PORT: int = 6334
+    VECTOR_DB_QDRANT_TIMEOUT: int = 30
+    VECTOR_DB_QDRANT_UPLOAD_PARALLELISM: int = 4
+
+    VECTOR_DB_PGVEC_BULK_LOAD: bool = True
+    VECTOR_DB_PGVEC_INDEX_TYPE: str = "hnsw"
+    VECTOR_DB_PGVEC_HNSW_M: int = 16
+    VECTOR_DB_PGVEC_HNSW_EF_CONSTRUCTION: int = 64
+    VECTOR_DB_PGVEC_IVFFLAT_LISTS: int = None
+    VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM: str = "512MB"
+    VECTOR_DB_PGVEC_TEXT_SEARCH_CONFIG: str = "simple"
+    VECTOR_DB_PGVEC_ITERATIVE_SCAN: str = "relaxed_order"
+
+    VECTOR_DB_HNSW_M: int = 16
+    VECTOR_DB_HNSW_EF_CONSTRUCTION: int = 128
+    VECTOR_DB_HNSW_SAVE_DELAY_SECONDS: float = 5
+
     PRIMARY_LANG: str = "en"
     DEFAULT_LANG: str = "en"
 
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import multiprocessing
+from typing import List
+from models.enums.ProcessingEnum import ProcessingEnum
+
+logger = logging.getLogger('uvicorn.error')
+
+# ========================= Worker Functions =========================
+# these run inside the pool processes, so they have to stay importable
+# and picklable (module level, plain arguments, plain return values).
+
+def count_pdf_pages(file_path: str) -> int:
+    import fitz
+
+    with fitz.open(file_path) as doc:
+        return doc.page_count
+
+def extract_pdf_pages(file_path: str, page_from: int, page_to: int) -> List[dict]:
+    import fitz
+
+    pages = []
+    with fitz.open(file_path) as doc:
+        for page_no in range(page_from, page_to):
+            page = doc.load_page(page_no)
+            pages.append({
+                "page_content": page.get_text(),
+                "metadata": {
+                    "source": file_path,
+                    "file_path": file_path,
+                    "page": page_no,
+                    "total_pages": doc.page_count,
+                },
+            })
+
+    return pages
+
+def extract_text_file(file_path: str) -> List[dict]:
+    with open(file_path, encoding="utf-8") as f:
+        return [{
+            "page_content": f.read(),
+            "metadata": {"source": file_path},
+        }]
+
+
+class ExtractionTimeoutError(Exception):
+    pass
+
+
+class ExtractionPool:
+    """
+    Process pools that parse files off the event loop.
+    Large PDFs are split into page ranges so one file can use several cores.
+
+    Every file is leased a pool of `max_workers` processes of its own (idle pools are reused),
+    so a file that times out only terminates its own pool and never the extraction of another file.
+    """
+
+    def __init__(self, max_workers: int = 2, file_timeout: int = 120,
+                       pdf_pages_per_task: int = 50):
+        self.max_workers = max_workers
+        self.file_timeout = file_timeout
+        self.pdf_pages_per_task = pdf_pages_per_task
+
+        self.mp_context = multiprocessing.get_context("spawn")
+        self.pools = set()
+        self.idle_pools = []
+
+    def start(self):
+        # warm one pool up, the others are started on demand
+        self.idle_pools.append(self._create_pool())
+
+    def stop(self):
+        for pool in list(self.pools):
+            pool.terminate()
+
+        self.pools = set()
+        self.idle_pools = []
+
+    def _create_pool(self):
+        pool = self.mp_context.Pool(processes=self.max_workers)
+        self.pools.add(pool)
+        return pool
+
+    def _acquire_pool(self):
+        if self.idle_pools:
+            return self.idle_pools.pop()
+        return self._create_pool()
+
+    def _discard_pool(self, pool):
+        # the pool may still be busy with the file, its processes are killed off the event loop
+        self.pools.discard(pool)
+        asyncio.get_running_loop().run_in_executor(None, pool.terminate)
+
+    def _run(self, pool, fn, *args):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def set_result(result):
+            if not future.done():
+                future.set_result(result)
+
+        def set_exception(exc):
+            if not future.done():
+                future.set_exception(exc)
+
+        # the callbacks are called from the pool's result thread
+        pool.apply_async(
+            fn, args,
+            callback=lambda result: loop.call_soon_threadsafe(set_result, result),
+            error_callback=lambda exc: loop.call_soon_threadsafe(set_exception, exc),
+        )
+
+        return future
+
+    async def _extract_pdf(self, pool, file_path: str):
+        total_pages = await self._run(pool, count_pdf_pages, file_path)
+
+        tasks = [
+            self._run(pool, extract_pdf_pages, file_path, page_from,
+                      min(page_from + self.pdf_pages_per_task, total_pages))
+            for page_from in range(0, total_pages, self.pdf_pages_per_task)
+        ]
+
+        page_ranges = await asyncio.gather(*tasks)
+
+        return [ page for page_range in page_ranges for page in page_range ]
+
+    async def _extract(self, pool, file_path: str, file_ext: str):
+        if file_ext == ProcessingEnum.TXT.value:
+            return await self._run(pool, extract_text_file, file_path)
+
+        if file_ext == ProcessingEnum.PDF.value:
+            return await self._extract_pdf(pool, file_path)
+
+        return None
+
+    async def extract_file(self, file_path: str, file_ext: str):
+        pool = self._acquire_pool()
+
+        try:
+            pages = await asyncio.wait_for(
+                self._extract(pool, file_path=file_path, file_ext=file_ext),
+                timeout=self.file_timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Extraction timed out after {self.file_timeout}s: {file_path}")
+            self._discard_pool(pool)
+            raise ExtractionTimeoutError(file_path)
+        except BaseException:
+            # a failed page range or a cancelled job can leave tasks running in the pool
+            self._discard_pool(pool)
+            raise
+
+        self.idle_pools.append(pool)
+        return pages
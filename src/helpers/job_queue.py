@@ -0,0 +1,105 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger('uvicorn.error')
+
+class JobQueue:
+    """
+    Bounded in-process worker pool for long running jobs (e.g. file processing).
+    Jobs are queued as coroutine factories and executed by `max_workers` asyncio workers.
+    The queue lives in memory only, `heartbeat_fn` is called every third of `heartbeat_seconds`
+    with the ids of the queued and running jobs so the ones lost with the process can be told apart.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 100,
+                 heartbeat_fn: Optional[Callable[[List[int]], Awaitable]] = None,
+                 heartbeat_seconds: int = 300):
+        self.max_workers = max_workers
+        self.queue = asyncio.Queue(maxsize=max_pending)
+        self.heartbeat_fn = heartbeat_fn
+        self.heartbeat_seconds = heartbeat_seconds
+
+        self.workers = []
+        self.queued_jobs: Set[int] = set()
+        self.running_tasks: Dict[int, asyncio.Task] = {}
+        self.cancelled_jobs: Set[int] = set()
+
+    async def start(self):
+        for i in range(self.max_workers):
+            self.workers.append(asyncio.create_task(self._worker(worker_no=i)))
+
+        if self.heartbeat_fn is not None:
+            self.workers.append(asyncio.create_task(self._heartbeat()))
+
+    async def stop(self):
+        for task in list(self.running_tasks.values()):
+            task.cancel()
+
+        for worker in self.workers:
+            worker.cancel()
+
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    def is_full(self) -> bool:
+        return self.queue.full()
+
+    def submit(self, job_id: int, job_fn: Callable[[], Awaitable]) -> bool:
+        try:
+            self.queue.put_nowait((job_id, job_fn))
+        except asyncio.QueueFull:
+            logger.error(f"Job queue is full, can not submit job: {job_id}")
+            return False
+
+        self.queued_jobs.add(job_id)
+        return True
+
+    def cancel(self, job_id: int) -> bool:
+        task = self.running_tasks.get(job_id)
+        if task:
+            task.cancel()
+            return True
+
+        # the job is still waiting in the queue (or runs on another worker process)
+        self.cancelled_jobs.add(job_id)
+        return False
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds / 3)
+
+            job_ids = list(self.queued_jobs | set(self.running_tasks.keys()))
+            try:
+                await self.heartbeat_fn(job_ids)
+            except Exception as e:
+                logger.error(f"Error while refreshing the jobs heartbeat: {e}")
+
+    async def _worker(self, worker_no: int):
+        while True:
+            job_id, job_fn = await self.queue.get()
+
+            try:
+                self.queued_jobs.discard(job_id)
+                if job_id in self.cancelled_jobs:
+                    self.cancelled_jobs.discard(job_id)
+                    continue
+
+                logger.info(f"Worker {worker_no} started job: {job_id}")
+
+                task = asyncio.create_task(job_fn())
+                self.running_tasks[job_id] = task
+
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    if not task.cancelled():
+                        # the worker itself is being stopped
+                        raise
+                    logger.info(f"Job was cancelled: {job_id}")
+                except Exception as e:
+                    logger.error(f"Error while running job {job_id}: {e}")
+
+            finally:
+                self.running_tasks.pop(job_id, None)
+                self.queue.task_done()
@@ -0,0 +1,14 @@
+from .ttl_cache import TTLCache
+
+class ResultCache(TTLCache):
+    """
+    In-process LRU cache with a TTL for search results and generated answers.
+    Keys carry the project index version, so a process, push or reset makes the
+    older entries unreachable; they are never flushed and age out of the LRU instead.
+    """
+
+    def __init__(self, max_entries: int = 2000, ttl_seconds: float = 600):
+        super().__init__(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def make_key(self, kind: str, project_id: int, index_version: int, text: str, **params):
+        return (kind, project_id, index_version, self.normalize_text(text), tuple(sorted(params.items())))
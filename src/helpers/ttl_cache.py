@@ -0,0 +1,61 @@
+from collections import OrderedDict
+import time
+import unicodedata
+
+class TTLCache:
+    """
+    In-process LRU cache with a TTL per entry. Subclasses only build their keys,
+    entries past the TTL are dropped on lookup and the least recently used
+    ones are evicted above `max_entries`.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self.entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def normalize_text(self, text: str) -> str:
+        return " ".join(unicodedata.normalize("NFKC", text).split())
+
+    def get(self, key: tuple):
+        entry = self.entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+            del self.entries[key]
+            self.expirations += 1
+
+        self.misses += 1
+        return None
+
+    def put(self, key: tuple, value):
+        self.entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_stats(self):
+        lookups = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -2,8 +2,16 @@ from fastapi import FastAPI
 from routes import base, data, nlp, projects
 from helpers.config import get_settings
 from stores.llm.LLMProviderFactory import LLMProviderFactory
+from stores.llm.EmbeddingScheduler import EmbeddingScheduler
+from stores.llm.EmbeddingCache import EmbeddingCache
+from stores.llm.QueryEmbeddingCache import QueryEmbeddingCache
 from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
 from stores.llm.templates.template_parser import TemplateParser
+from helpers.job_queue import JobQueue
+from helpers.extraction_pool import ExtractionPool
+from helpers.result_cache import ResultCache
+from models.JobModel import JobModel
+from models.enums.JobEnums import JobTypeEnum
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
@@ -19,17 +27,49 @@ async def startup_span():
         app.db_engine, class_=AsyncSession, expire_on_commit=False
     )
 
-    llm_provider_factory = LLMProviderFactory(settings)
+    app.llm_provider_factory = LLMProviderFactory(settings)
     vectordb_provider_factory = VectorDBProviderFactory(config=settings, db_client=app.db_client)
 
     # generation client
-    app.generation_client = llm_provider_factory.create(provider=settings.GENERATION_BACKEND)
+    app.generation_client = app.llm_provider_factory.create(provider=settings.GENERATION_BACKEND)
     app.generation_client.set_generation_model(model_id = settings.GENERATION_MODEL_ID)
 
     # embedding client
-    app.embedding_client = llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
+    app.embedding_client = app.llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
     app.embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
                                              embedding_size=settings.EMBEDDING_MODEL_SIZE)
+
+    app.embedding_cache = None
+    if settings.EMBEDDING_CACHE_ENABLED:
+        app.embedding_cache = EmbeddingCache(
+            db_client=app.db_client,
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+        )
+
+    app.embedding_scheduler = EmbeddingScheduler(
+        embedding_client=app.embedding_client,
+        max_concurrency=settings.EMBEDDING_MAX_CONCURRENCY,
+        requests_per_minute=settings.EMBEDDING_REQUESTS_PER_MINUTE,
+        tokens_per_minute=settings.EMBEDDING_TOKENS_PER_MINUTE,
+        max_batch_size=settings.EMBEDDING_MAX_BATCH_SIZE,
+        max_batch_tokens=settings.EMBEDDING_MAX_BATCH_TOKENS,
+        max_retries=settings.EMBEDDING_MAX_RETRIES,
+        embedding_cache=app.embedding_cache,
+    )
+
+    app.query_embedding_cache = None
+    if settings.QUERY_EMBEDDING_CACHE_ENABLED:
+        app.query_embedding_cache = QueryEmbeddingCache(
+            max_entries=settings.QUERY_EMBEDDING_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+        )
+
+    app.result_cache = None
+    if settings.RESULT_CACHE_ENABLED:
+        app.result_cache = ResultCache(
+            max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+        )
     
     # vector db client
     app.vectordb_client = vectordb_provider_factory.create(
@@ -42,10 +82,36 @@ async def startup_span():
         default_language=settings.DEFAULT_LANG,
     )
 
+    # file extraction pool
+    app.extraction_pool = ExtractionPool(
+        max_workers=settings.EXTRACTION_POOL_WORKERS,
+        file_timeout=settings.EXTRACTION_FILE_TIMEOUT,
+        pdf_pages_per_task=settings.EXTRACTION_PDF_PAGES_PER_TASK,
+    )
+    app.extraction_pool.start()
+
+    # background jobs, the ones left queued or running by a stopped worker are failed
+    job_model = await JobModel.create_instance(db_client=app.db_client)
+    _ = await job_model.fail_abandoned_jobs(
+        job_types=[JobTypeEnum.PROCESS.value, JobTypeEnum.INGEST.value],
+        heartbeat_seconds=settings.PROCESSING_JOB_HEARTBEAT_SECONDS,
+    )
+
+    app.job_queue = JobQueue(
+        max_workers=settings.PROCESSING_JOB_WORKERS,
+        max_pending=settings.PROCESSING_JOB_MAX_PENDING,
+        heartbeat_fn=job_model.touch_jobs,
+        heartbeat_seconds=settings.PROCESSING_JOB_HEARTBEAT_SECONDS,
+    )
+    await app.job_queue.start()
+
 
 async def shutdown_span():
+    await app.job_queue.stop()
+    app.extraction_pool.stop()
     app.db_engine.dispose()
     await app.vectordb_client.disconnect()
+    await app.llm_provider_factory.close()
 
 app.on_event("startup")(startup_span)
 app.on_event("shutdown")(shutdown_span)
@@ -4,7 +4,11 @@ from .enums.DataBaseEnum import DataBaseEnum
 from bson.objectid import ObjectId
 from pymongo import InsertOne
 from sqlalchemy.future import select
-from sqlalchemy import func, delete
+from sqlalchemy import func, delete, update, or_
+from sqlalchemy.sql import text as sql_text
+from typing import List
+import json
+import uuid
 
 class ChunkModel(BaseDataModel):
 
@@ -43,6 +47,63 @@ class ChunkModel(BaseDataModel):
             await session.commit()
         return len(chunks)
 
+    async def bulk_insert_chunks(self, chunks: List[dict], batch_size: int=5000) -> List[int]:
+        """
+        Streams chunk rows into the chunks table with COPY and returns the new
+        chunk ids in the same order as `chunks`.
+        Each item holds chunk_text, chunk_metadata, chunk_order, chunk_project_id and chunk_asset_id.
+        """
+
+        chunk_ids = []
+        if not chunks:
+            return chunk_ids
+
+        columns = ["chunk_id", "chunk_uuid", "chunk_text", "chunk_metadata",
+                   "chunk_order", "chunk_project_id", "chunk_asset_id"]
+
+        async with self.db_client() as session:
+            async with session.begin():
+                connection = await session.connection()
+                raw_connection = await connection.get_raw_connection()
+                asyncpg_connection = raw_connection.driver_connection
+
+                for i in range(0, len(chunks), batch_size):
+                    batch = chunks[i:i+batch_size]
+
+                    # reserve the ids up front, COPY can not return them
+                    ids_sql = sql_text(
+                        "SELECT nextval(pg_get_serial_sequence(:table_name, 'chunk_id')) "
+                        "FROM generate_series(1, :batch_len)"
+                    )
+                    result = await session.execute(ids_sql, {
+                        "table_name": DataBaseEnum.COLLECTION_CHUNK_NAME.value,
+                        "batch_len": len(batch),
+                    })
+                    batch_ids = result.scalars().all()
+
+                    records = [
+                        (
+                            chunk_id,
+                            uuid.uuid4(),
+                            chunk["chunk_text"],
+                            json.dumps(chunk.get("chunk_metadata") or {}, ensure_ascii=False),
+                            chunk["chunk_order"],
+                            chunk["chunk_project_id"],
+                            chunk["chunk_asset_id"],
+                        )
+                        for chunk_id, chunk in zip(batch_ids, batch)
+                    ]
+
+                    await asyncpg_connection.copy_records_to_table(
+                        DataBaseEnum.COLLECTION_CHUNK_NAME.value,
+                        records=records,
+                        columns=columns,
+                    )
+
+                    chunk_ids.extend(batch_ids)
+
+        return chunk_ids
+
     async def delete_chunks_by_project_id(self, project_id: ObjectId):
         async with self.db_client() as session:
             stmt = delete(DataChunk).where(DataChunk.chunk_project_id == project_id)
@@ -57,13 +118,98 @@ class ChunkModel(BaseDataModel):
             records = result.scalars().all()
         return records
     
-    async def get_total_chunks_count(self, project_id: ObjectId):
+    def get_not_indexed_filter(self, embedding_model_id: str):
+        return or_(
+            DataChunk.chunk_indexed_at.is_(None),
+            DataChunk.chunk_embedding_model_id != embedding_model_id,
+        )
+
+    async def get_project_chunks_page(self, project_id: int, after_chunk_id: int=0, page_size: int=50,
+                                      not_indexed_for: str=None):
+        async with self.db_client() as session:
+            stmt = select(DataChunk).where(
+                DataChunk.chunk_project_id == project_id,
+                DataChunk.chunk_id > after_chunk_id,
+            )
+            if not_indexed_for:
+                stmt = stmt.where(self.get_not_indexed_filter(embedding_model_id=not_indexed_for))
+
+            stmt = stmt.order_by(DataChunk.chunk_id).limit(page_size)
+            result = await session.execute(stmt)
+            records = result.scalars().all()
+        return records
+
+    async def iter_project_chunks(self, project_id: int, after_chunk_id: int=0, page_size: int=None,
+                                  not_indexed_for: str=None):
+        """
+        Keyset scan over the project chunks ordered by chunk_id.
+        Every page is an index range scan on (chunk_project_id, chunk_id), so the
+        cost per page does not grow with the number of pages already read.
+        With `not_indexed_for` only the chunks without a vector for that embedding model are returned.
+        """
+
+        page_size = page_size or self.app_settings.CHUNKS_SCAN_PAGE_SIZE
+
+        while True:
+            page_chunks = await self.get_project_chunks_page(
+                project_id=project_id,
+                after_chunk_id=after_chunk_id,
+                page_size=page_size,
+                not_indexed_for=not_indexed_for,
+            )
+
+            if not page_chunks:
+                break
+
+            yield page_chunks
+
+            if len(page_chunks) < page_size:
+                break
+
+            after_chunk_id = page_chunks[-1].chunk_id
+
+    async def get_total_chunks_count(self, project_id: ObjectId, not_indexed_for: str=None):
         total_count = 0
         async with self.db_client() as session:
             count_sql = select(func.count(DataChunk.chunk_id)).where(DataChunk.chunk_project_id == project_id)
+            if not_indexed_for:
+                count_sql = count_sql.where(self.get_not_indexed_filter(embedding_model_id=not_indexed_for))
             records_count = await session.execute(count_sql)
             total_count = records_count.scalar()
         
         return total_count
 
+    async def get_project_chunk_ids(self, project_id: int):
+        async with self.db_client() as session:
+            stmt = select(DataChunk.chunk_id).where(DataChunk.chunk_project_id == project_id)
+            result = await session.execute(stmt)
+            chunk_ids = result.scalars().all()
+        return chunk_ids
+
+    async def mark_chunks_indexed(self, chunk_ids: List[int], embedding_model_id: str):
+        if not chunk_ids:
+            return 0
+
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = update(DataChunk).where(DataChunk.chunk_id.in_(chunk_ids)).values(
+                    chunk_indexed_at=func.now(),
+                    chunk_embedding_model_id=embedding_model_id,
+                )
+                result = await session.execute(stmt)
+        return result.rowcount
+
+    async def reset_project_chunks_indexing(self, project_id: int):
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = update(DataChunk).where(
+                    DataChunk.chunk_project_id == project_id,
+                    DataChunk.chunk_indexed_at.is_not(None),
+                ).values(
+                    chunk_indexed_at=None,
+                    chunk_embedding_model_id=None,
+                )
+                result = await session.execute(stmt)
+        return result.rowcount
+
 
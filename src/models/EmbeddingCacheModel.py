@@ -0,0 +1,100 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemes import EmbeddingCacheEntry
+from sqlalchemy.future import select
+from sqlalchemy import func, update, delete
+from sqlalchemy.dialects.postgresql import insert
+from typing import List
+from datetime import datetime, timedelta, timezone
+
+class EmbeddingCacheModel(BaseDataModel):
+
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.db_client = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client)
+        return instance
+
+    async def get_entries(self, cache_keys: List[str], batch_size: int=1000, touch_seconds: int=600):
+
+        records = {}
+        if not cache_keys:
+            return records
+
+        async with self.db_client() as session:
+            async with session.begin():
+                for i in range(0, len(cache_keys), batch_size):
+                    batch_keys = cache_keys[i:i+batch_size]
+
+                    stmt = select(
+                        EmbeddingCacheEntry.cache_key,
+                        EmbeddingCacheEntry.embedding_vector,
+                        EmbeddingCacheEntry.last_accessed_at,
+                    ).where(
+                        EmbeddingCacheEntry.cache_key.in_(batch_keys)
+                    )
+                    result = await session.execute(stmt)
+                    rows = result.all()
+                    batch_records = { row.cache_key: row.embedding_vector for row in rows }
+
+                    # keeps the eviction order close to LRU, an entry is touched
+                    # at most once every `touch_seconds` so hits stay read-only
+                    touched_before = datetime.now(timezone.utc) - timedelta(seconds=touch_seconds)
+                    stale_keys = [ row.cache_key for row in rows if row.last_accessed_at < touched_before ]
+
+                    if stale_keys:
+                        touch_stmt = update(EmbeddingCacheEntry).where(
+                            EmbeddingCacheEntry.cache_key.in_(stale_keys)
+                        ).values(last_accessed_at=func.now())
+                        await session.execute(touch_stmt)
+
+                    records.update(batch_records)
+
+        return records
+
+    async def insert_entries(self, entries: List[dict], batch_size: int=1000):
+
+        inserted_count = 0
+        if not entries:
+            return inserted_count
+
+        async with self.db_client() as session:
+            async with session.begin():
+                for i in range(0, len(entries), batch_size):
+                    stmt = insert(EmbeddingCacheEntry).values(entries[i:i+batch_size]).on_conflict_do_nothing(
+                        index_elements=[EmbeddingCacheEntry.cache_key]
+                    )
+                    result = await session.execute(stmt)
+                    inserted_count += result.rowcount
+
+        return inserted_count
+
+    async def get_entries_count(self):
+
+        async with self.db_client() as session:
+            result = await session.execute(select(func.count(EmbeddingCacheEntry.cache_key)))
+            total_count = result.scalar()
+
+        return total_count
+
+    async def evict_entries(self, max_entries: int):
+        """
+        Deletes the least recently used entries above `max_entries`.
+        """
+
+        total_count = await self.get_entries_count()
+        if total_count <= max_entries:
+            return 0
+
+        async with self.db_client() as session:
+            async with session.begin():
+                oldest_keys = select(EmbeddingCacheEntry.cache_key).order_by(
+                    EmbeddingCacheEntry.last_accessed_at.asc()
+                ).limit(total_count - max_entries)
+
+                stmt = delete(EmbeddingCacheEntry).where(EmbeddingCacheEntry.cache_key.in_(oldest_keys))
+                result = await session.execute(stmt)
+
+        return result.rowcount
@@ -0,0 +1,183 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemes import ProcessingJob
+from .enums.JobEnums import JobStatusEnum
+from sqlalchemy.future import select
+from sqlalchemy import update, func, literal
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime, timedelta, timezone
+
+class JobModel(BaseDataModel):
+
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.db_client = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client)
+        return instance
+
+    async def create_job(self, job: ProcessingJob):
+
+        async with self.db_client() as session:
+            async with session.begin():
+                session.add(job)
+            await session.commit()
+            await session.refresh(job)
+        return job
+
+    async def get_job(self, job_id: int):
+
+        async with self.db_client() as session:
+            result = await session.execute(select(ProcessingJob).where(ProcessingJob.job_id == job_id))
+            job = result.scalar_one_or_none()
+        return job
+
+    async def get_job_status(self, job_id: int):
+
+        async with self.db_client() as session:
+            result = await session.execute(
+                select(ProcessingJob.job_status).where(ProcessingJob.job_id == job_id)
+            )
+            job_status = result.scalar_one_or_none()
+        return job_status
+
+    async def get_latest_job(self, project_id: int, job_type: str):
+
+        async with self.db_client() as session:
+            result = await session.execute(
+                select(ProcessingJob).where(
+                    ProcessingJob.job_project_id == project_id,
+                    ProcessingJob.job_type == job_type,
+                ).order_by(ProcessingJob.job_id.desc()).limit(1)
+            )
+            job = result.scalar_one_or_none()
+        return job
+
+    def is_job_alive(self, job: ProcessingJob, heartbeat_seconds: int):
+        # a running job updates its row after every page, a silent one was left by a crashed worker
+        if job.job_status != JobStatusEnum.RUNNING.value:
+            return False
+
+        last_seen_at = job.updated_at or job.started_at or job.created_at
+        if last_seen_at is None:
+            return True
+
+        return datetime.now(timezone.utc) - last_seen_at < timedelta(seconds=heartbeat_seconds)
+
+    async def get_resumable_job(self, project_id: int, job_type: str, embedding_model_id: str,
+                                heartbeat_seconds: int):
+        """
+        Returns the latest run of `job_type` for the project when it did not finish
+        (failed, or running without a heartbeat for `heartbeat_seconds`) and was checkpointed
+        with the same embedding model. The job still has to be claimed, see claim_job.
+        """
+
+        job = await self.get_latest_job(project_id=project_id, job_type=job_type)
+        if job is None:
+            return None
+
+        if job.job_status == JobStatusEnum.RUNNING.value:
+            if self.is_job_alive(job=job, heartbeat_seconds=heartbeat_seconds):
+                return None
+        elif job.job_status != JobStatusEnum.FAILED.value:
+            return None
+
+        checkpoint = job.job_checkpoint or {}
+        if checkpoint.get("embedding_model_id") != embedding_model_id:
+            return None
+
+        return job
+
+    async def touch_job(self, job_id: int):
+        # heartbeat of a running job, see is_job_alive
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = update(ProcessingJob).where(
+                    ProcessingJob.job_id == job_id,
+                    ProcessingJob.job_status == JobStatusEnum.RUNNING.value,
+                ).values(updated_at=func.now())
+                result = await session.execute(stmt)
+        return result.rowcount > 0
+
+    async def touch_jobs(self, job_ids: list):
+        # heartbeat of the jobs held by a worker's job queue, see fail_abandoned_jobs
+        if len(job_ids) == 0:
+            return 0
+
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = update(ProcessingJob).where(
+                    ProcessingJob.job_id.in_(job_ids),
+                    ProcessingJob.job_status.in_([
+                        JobStatusEnum.PENDING.value,
+                        JobStatusEnum.RUNNING.value,
+                    ])
+                ).values(updated_at=func.now())
+                result = await session.execute(stmt)
+        return result.rowcount
+
+    async def fail_abandoned_jobs(self, job_types: list, heartbeat_seconds: int):
+        """
+        Marks as failed the pending and running jobs of `job_types` without a heartbeat
+        for `heartbeat_seconds`, they were left by a worker that stopped before finishing them.
+        """
+
+        last_seen_at = func.coalesce(ProcessingJob.updated_at, ProcessingJob.created_at)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = update(ProcessingJob).where(
+                    ProcessingJob.job_type.in_(job_types),
+                    ProcessingJob.job_status.in_([
+                        JobStatusEnum.PENDING.value,
+                        JobStatusEnum.RUNNING.value,
+                    ]),
+                    last_seen_at < func.now() - timedelta(seconds=heartbeat_seconds),
+                ).values(
+                    job_status=JobStatusEnum.FAILED.value,
+                    job_errors=func.coalesce(ProcessingJob.job_errors, literal([], JSONB)).op("||")(
+                        literal([{"file_id": None, "error": "job_abandoned"}], JSONB)
+                    ),
+                    finished_at=func.now(),
+                )
+                result = await session.execute(stmt)
+        return result.rowcount
+
+    async def claim_job(self, job: ProcessingJob):
+        """
+        Marks a resumable job as running, only if nobody touched it since it was read.
+        Returns False when another request claimed it first.
+        """
+
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = update(ProcessingJob).where(
+                    ProcessingJob.job_id == job.job_id,
+                    ProcessingJob.job_status == job.job_status,
+                    ProcessingJob.updated_at.is_not_distinct_from(job.updated_at),
+                ).values(job_status=JobStatusEnum.RUNNING.value)
+                result = await session.execute(stmt)
+        return result.rowcount > 0
+
+    async def update_job(self, job_id: int, **values):
+
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = update(ProcessingJob).where(ProcessingJob.job_id == job_id).values(**values)
+                result = await session.execute(stmt)
+        return result.rowcount
+
+    async def cancel_job(self, job_id: int):
+        # only jobs that did not reach a final state can be cancelled
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = update(ProcessingJob).where(
+                    ProcessingJob.job_id == job_id,
+                    ProcessingJob.job_status.in_([
+                        JobStatusEnum.PENDING.value,
+                        JobStatusEnum.RUNNING.value,
+                    ])
+                ).values(job_status=JobStatusEnum.CANCELLED.value)
+                result = await session.execute(stmt)
+        return result.rowcount > 0
@@ -2,7 +2,7 @@ from .BaseDataModel import BaseDataModel
 from .db_schemes import Project
 from .enums.DataBaseEnum import DataBaseEnum
 from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy import func, update
 
 class ProjectModel(BaseDataModel):
 
@@ -53,6 +53,30 @@ class ProjectModel(BaseDataModel):
                     return project
                 return None
 
+    async def update_project_search_config(self, project_id: int, search_config: dict):
+        async with self.db_client() as session:
+            async with session.begin():
+                query = select(Project).where(Project.project_id == project_id)
+                result = await session.execute(query)
+                project = result.scalar_one_or_none()
+                if project:
+                    project.project_search_config = search_config
+                    await session.commit()
+                    return project
+                return None
+
+    async def bump_index_version(self, project_id: int):
+        async with self.db_client() as session:
+            async with session.begin():
+                query = (
+                    update(Project)
+                    .where(Project.project_id == project_id)
+                    .values(project_index_version=Project.project_index_version + 1)
+                    .returning(Project.project_index_version)
+                )
+                result = await session.execute(query)
+                return result.scalar_one_or_none()
+
     async def get_project_by_id(self, project_id: int):
         async with self.db_client() as session:
             async with session.begin():
@@ -60,6 +84,13 @@ class ProjectModel(BaseDataModel):
                 result = await session.execute(query)
                 return result.scalar_one_or_none()
 
+    async def get_projects_by_ids(self, project_ids: list):
+        async with self.db_client() as session:
+            async with session.begin():
+                query = select(Project).where(Project.project_id.in_(project_ids))
+                result = await session.execute(query)
+                return result.scalars().all()
+
     async def get_all_projects(self, page: int=1, page_size: int=10):
 
         async with self.db_client() as session:
@@ -4,6 +4,7 @@ from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy import Index
 from pydantic import BaseModel
+from typing import Optional
 import uuid
 
 class DataChunk(SQLAlchemyBase):
@@ -20,6 +21,10 @@ class DataChunk(SQLAlchemyBase):
     chunk_project_id = Column(Integer, ForeignKey("projects.project_id"), nullable=False)
     chunk_asset_id = Column(Integer, ForeignKey("assets.asset_id"), nullable=False)
 
+    # set once the chunk vector is written, used by delta indexing
+    chunk_indexed_at = Column(DateTime(timezone=True), nullable=True)
+    chunk_embedding_model_id = Column(String, nullable=True)
+
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
 
@@ -29,8 +34,15 @@ class DataChunk(SQLAlchemyBase):
     __table_args__ = (
         Index('ix_chunk_project_id', chunk_project_id),
         Index('ix_chunk_asset_id', chunk_asset_id),
+        Index('ix_chunk_project_id_chunk_id', chunk_project_id, chunk_id),
     )
 
 class RetrievedDocument(BaseModel):
     text: str
     score: float
+    # payload of the record, left unset by the searches without payload
+    chunk_id: Optional[int] = None
+    asset_id: Optional[int] = None
+    file_name: Optional[str] = None
+    chunk_order: Optional[int] = None
+    metadata: Optional[dict] = None
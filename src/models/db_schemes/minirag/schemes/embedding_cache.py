@@ -0,0 +1,24 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column, Integer, DateTime, func, String, LargeBinary
+from sqlalchemy import Index
+
+class EmbeddingCacheEntry(SQLAlchemyBase):
+
+    __tablename__ = "embedding_cache"
+
+    # sha256 of (model id, embedding size, document type, sha256 of the text)
+    cache_key = Column(String(64), primary_key=True)
+
+    embedding_model_id = Column(String, nullable=False)
+    embedding_size = Column(Integer, nullable=False)
+    document_type = Column(String, nullable=False)
+
+    # float32 little-endian array
+    embedding_vector = Column(LargeBinary, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_accessed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('ix_embedding_cache_last_accessed_at', last_accessed_at),
+    )
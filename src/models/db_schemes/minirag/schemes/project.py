@@ -1,6 +1,6 @@
 from .minirag_base import SQLAlchemyBase
 from sqlalchemy import Column, Integer, DateTime, func, String
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 from sqlalchemy.orm import relationship
 
@@ -11,9 +11,14 @@ class Project(SQLAlchemyBase):
     project_id = Column(Integer, primary_key=True, autoincrement=True)
     project_uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
     name = Column(String(255), nullable=True, default="Untitled Project")
+    # bumped whenever the project chunks or vectors change, versions the cached search results
+    project_index_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # search defaults of the project: ef_search, probes, exact
+    project_search_config = Column(JSONB, nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
 
     chunks = relationship("DataChunk", back_populates="project")
     assets = relationship("Asset", back_populates="project")
+    jobs = relationship("ProcessingJob", back_populates="project")
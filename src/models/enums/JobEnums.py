@@ -0,0 +1,15 @@
+from enum import Enum
+
+class JobTypeEnum(Enum):
+
+    PROCESS = "process"
+    INGEST = "ingest"
+    INDEX = "index"
+
+class JobStatusEnum(Enum):
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
@@ -10,6 +10,13 @@ class ResponseSignal(Enum):
     FILE_UPLOAD_FAILED = "file_upload_failed"
     PROCESSING_SUCCESS = "processing_success"
     PROCESSING_FAILED = "processing_failed"
+    PROCESSING_JOB_SUBMITTED = "processing_job_submitted"
+    JOB_QUEUE_FULL_ERROR = "job_queue_full"
+    JOB_NOT_FOUND_ERROR = "job_not_found"
+    JOB_STATUS_RETRIEVED = "job_status_retrieved"
+    JOB_CANCELLED = "job_cancelled"
+    JOB_CANCEL_FAILED = "job_cancel_failed"
+    JOB_ALREADY_RUNNING_ERROR = "job_already_running"
     NO_FILES_ERROR = "not_found_files"
     FILE_ID_ERROR = "no_file_found_with_this_id"
     PROJECT_NOT_FOUND_ERROR = "project_not_found"
@@ -18,6 +25,13 @@ class ResponseSignal(Enum):
     VECTORDB_COLLECTION_RETRIEVED = "vectordb_collection_retrieved"
     VECTORDB_SEARCH_ERROR = "vectordb_search_error"
     VECTORDB_SEARCH_SUCCESS = "vectordb_search_success"
+    VECTORDB_SEARCH_BATCH_SIZE_ERROR = "vectordb_search_batch_size_error"
+    VECTORDB_SEARCH_MODE_ERROR = "vectordb_search_mode_error"
+    VECTORDB_SEARCH_PROJECTS_SIZE_ERROR = "vectordb_search_projects_size_error"
     RAG_ANSWER_ERROR = "rag_answer_error"
     RAG_ANSWER_SUCCESS = "rag_answer_success"
+    EMBEDDING_CACHE_DISABLED = "embedding_cache_disabled"
+    EMBEDDING_CACHE_STATS_RETRIEVED = "embedding_cache_stats_retrieved"
+    RESULT_CACHE_DISABLED = "result_cache_disabled"
+    RESULT_CACHE_STATS_RETRIEVED = "result_cache_stats_retrieved"
     
\ No newline at end of file
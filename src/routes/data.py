@@ -2,7 +2,7 @@ from fastapi import FastAPI, APIRouter, Depends, UploadFile, status, Request
 from fastapi.responses import JSONResponse
 import os
 from helpers.config import get_settings, Settings
-from controllers import DataController, ProjectController, ProcessController
+from controllers import DataController, ProjectController
 import aiofiles
 from models import ResponseSignal
 import logging
@@ -10,9 +10,11 @@ from .schemes.data import ProcessRequest
 from models.ProjectModel import ProjectModel
 from models.ChunkModel import ChunkModel
 from models.AssetModel import AssetModel
-from models.db_schemes import DataChunk, Asset
+from models.JobModel import JobModel
+from models.db_schemes import Asset, ProcessingJob
 from models.enums.AssetTypeEnum import AssetTypeEnum
-from controllers import NLPController
+from models.enums.JobEnums import JobTypeEnum, JobStatusEnum
+from controllers import NLPController, JobController
 
 logger = logging.getLogger('uvicorn.error')
 
@@ -111,6 +113,9 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        embedding_scheduler=request.app.embedding_scheduler,
+        query_embedding_cache=request.app.query_embedding_cache,
+        result_cache=request.app.result_cache,
     )
 
     asset_model = await AssetModel.create_instance(
@@ -157,66 +162,129 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
             }
         )
     
-    process_controller = ProcessController(project_id=project_id)
+    if request.app.job_queue.is_full():
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "signal": ResponseSignal.JOB_QUEUE_FULL_ERROR.value,
+            }
+        )
 
-    no_records = 0
-    no_files = 0
+    job_model = await JobModel.create_instance(
+        db_client=request.app.db_client
+    )
 
-    chunk_model = await ChunkModel.create_instance(
-                        db_client=request.app.db_client
-                    )
+    job = await job_model.create_job(job=ProcessingJob(
+        job_type=JobTypeEnum.PROCESS.value,
+        job_status=JobStatusEnum.PENDING.value,
+        job_config={
+            "file_id": process_request.file_id,
+            "chunk_size": chunk_size,
+            "overlap_size": overlap_size,
+            "do_reset": do_reset,
+        },
+        job_total_files=len(project_files_ids),
+        job_processed_files=0,
+        job_inserted_chunks=0,
+        job_errors=[],
+        job_project_id=project.project_id,
+    ))
+
+    job_controller = JobController(
+        db_client=request.app.db_client,
+        nlp_controller=nlp_controller,
+        extraction_pool=request.app.extraction_pool,
+    )
 
-    if do_reset == 1:
-        # delete associated vectors collection
-        collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
-        _ = await request.app.vectordb_client.delete_collection(collection_name=collection_name)
+    is_submitted = request.app.job_queue.submit(
+        job_id=job.job_id,
+        job_fn=lambda: job_controller.run_process_job(
+            job_id=job.job_id,
+            project=project,
+            project_files_ids=project_files_ids,
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            do_reset=do_reset,
+        )
+    )
 
-        # delete associated chunks
-        _ = await chunk_model.delete_chunks_by_project_id(
-            project_id=project.project_id
+    if not is_submitted:
+        _ = await job_model.update_job(job_id=job.job_id, job_status=JobStatusEnum.FAILED.value)
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "signal": ResponseSignal.JOB_QUEUE_FULL_ERROR.value,
+            }
         )
 
-    for asset_id, file_id in project_files_ids.items():
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "signal": ResponseSignal.PROCESSING_JOB_SUBMITTED.value,
+            "job_id": job.job_id,
+            "total_files": len(project_files_ids),
+        }
+    )
+
+@data_router.get("/process/status/{job_id}")
+async def process_job_status(request: Request, job_id: int):
 
-        file_content = process_controller.get_file_content(file_id=file_id)
+    job_model = await JobModel.create_instance(
+        db_client=request.app.db_client
+    )
 
-        if file_content is None:
-            logger.error(f"Error while processing file: {file_id}")
-            continue
+    job = await job_model.get_job(job_id=job_id)
 
-        file_chunks = process_controller.process_file_content(
-            file_content=file_content,
-            file_id=file_id,
-            chunk_size=chunk_size,
-            overlap_size=overlap_size
+    if job is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.JOB_NOT_FOUND_ERROR.value,
+            }
         )
 
-        if file_chunks is None or len(file_chunks) == 0:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={
-                    "signal": ResponseSignal.PROCESSING_FAILED.value
-                }
-            )
+    job_controller = JobController(db_client=request.app.db_client)
 
-        file_chunks_records = [
-            DataChunk(
-                chunk_text=chunk.page_content,
-                chunk_metadata=chunk.metadata,
-                chunk_order=i+1,
-                chunk_project_id=project.project_id,
-                chunk_asset_id=asset_id
-            )
-            for i, chunk in enumerate(file_chunks)
-        ]
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.JOB_STATUS_RETRIEVED.value,
+            "job": job_controller.get_job_details(job=job),
+        }
+    )
+
+@data_router.post("/process/cancel/{job_id}")
+async def cancel_process_job(request: Request, job_id: int):
+
+    job_model = await JobModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    job = await job_model.get_job(job_id=job_id)
+
+    if job is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.JOB_NOT_FOUND_ERROR.value,
+            }
+        )
+
+    is_cancelled = await job_model.cancel_job(job_id=job_id)
+    if not is_cancelled:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.JOB_CANCEL_FAILED.value,
+                "job_status": job.job_status,
+            }
+        )
 
-        no_records += await chunk_model.insert_many_chunks(chunks=file_chunks_records)
-        no_files += 1
+    # stop the job right away if it runs (or waits) on this worker
+    _ = request.app.job_queue.cancel(job_id=job_id)
 
     return JSONResponse(
         content={
-            "signal": ResponseSignal.PROCESSING_SUCCESS.value,
-            "inserted_chunks": no_records,
-            "processed_files": no_files
+            "signal": ResponseSignal.JOB_CANCELLED.value,
+            "job_id": job_id,
         }
     )
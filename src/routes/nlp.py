@@ -1,11 +1,16 @@
-from fastapi import FastAPI, APIRouter, status, Request
+from fastapi import FastAPI, APIRouter, Depends, status, Request
 from fastapi.responses import JSONResponse
-from routes.schemes.nlp import PushRequest, SearchRequest
+from routes.schemes.nlp import PushRequest, SearchRequest, BatchSearchRequest, IngestRequest, MultiProjectSearchRequest
 from models.ProjectModel import ProjectModel
-from models.ChunkModel import ChunkModel
-from controllers import NLPController
+from models.AssetModel import AssetModel
+from models.JobModel import JobModel
+from models.db_schemes import ProcessingJob
+from models.enums.AssetTypeEnum import AssetTypeEnum
+from models.enums.JobEnums import JobTypeEnum, JobStatusEnum
+from controllers import NLPController, JobController
 from models import ResponseSignal
-from tqdm.auto import tqdm
+from helpers.config import get_settings, Settings
+from stores.vectordb.VectorDBEnums import SearchModeEnums
 
 import logging
 
@@ -16,17 +21,46 @@ nlp_router = APIRouter(
     tags=["api_v1", "nlp"],
 )
 
+async def get_search_filter(request: Request, project, search_filter):
+    """
+    Search filter of the vector db providers, file names resolved to asset ids.
+    Returns None for no filter, or False when a file name does not match any asset.
+    """
+
+    if not search_filter:
+        return None
+
+    asset_ids = list(search_filter.asset_ids or [])
+    if search_filter.file_names:
+        asset_model = await AssetModel.create_instance(
+            db_client=request.app.db_client
+        )
+
+        for file_name in search_filter.file_names:
+            asset_record = await asset_model.get_asset_record(
+                asset_project_id=project.project_id,
+                asset_name=file_name
+            )
+            if asset_record is None:
+                return False
+            asset_ids.append(asset_record.asset_id)
+
+    filter_dict = {
+        "asset_ids": sorted(set(asset_ids)) or None,
+        "page_from": search_filter.page_from,
+        "page_to": search_filter.page_to,
+    }
+
+    return { key: value for key, value in filter_dict.items() if value is not None } or None
+
 @nlp_router.post("/index/push/{project_id}")
-async def index_project(request: Request, project_id: int, push_request: PushRequest):
+async def index_project(request: Request, project_id: int, push_request: PushRequest,
+                        app_settings: Settings = Depends(get_settings)):
 
     project_model = await ProjectModel.create_instance(
         db_client=request.app.db_client
     )
 
-    chunk_model = await ChunkModel.create_instance(
-        db_client=request.app.db_client
-    )
-
     project = await project_model.get_project_or_create_one(
         project_id=project_id,
         project_name=f"Project {project_id}"
@@ -45,59 +79,257 @@ async def index_project(request: Request, project_id: int, push_request: PushReq
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        embedding_scheduler=request.app.embedding_scheduler,
+        query_embedding_cache=request.app.query_embedding_cache,
+        result_cache=request.app.result_cache,
     )
 
-    has_records = True
-    page_no = 1
-    inserted_items_count = 0
-    idx = 0
+    job_model = await JobModel.create_instance(
+        db_client=request.app.db_client
+    )
 
-    # create collection if not exists
-    collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
+    # one index run per project at a time
+    latest_job = await job_model.get_latest_job(project_id=project.project_id, job_type=JobTypeEnum.INDEX.value)
+    if latest_job and job_model.is_job_alive(job=latest_job,
+                                             heartbeat_seconds=app_settings.INDEX_JOB_HEARTBEAT_SECONDS):
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={
+                "signal": ResponseSignal.JOB_ALREADY_RUNNING_ERROR.value,
+                "job_id": latest_job.job_id,
+            }
+        )
 
-    _ = await request.app.vectordb_client.create_collection(
-        collection_name=collection_name,
-        embedding_size=request.app.embedding_client.embedding_size,
-        do_reset=push_request.do_reset,
+    # an unfinished run for the same embedding model is resumed from its checkpoint
+    embedding_model_id = request.app.embedding_client.embedding_model_id
+    job = None
+    if not push_request.do_reset:
+        job = await job_model.get_resumable_job(
+            project_id=project.project_id,
+            job_type=JobTypeEnum.INDEX.value,
+            embedding_model_id=embedding_model_id,
+            heartbeat_seconds=app_settings.INDEX_JOB_HEARTBEAT_SECONDS,
+        )
+
+    if job:
+        # a concurrent push may have read the same job, only one of them resumes it
+        if not await job_model.claim_job(job=job):
+            return JSONResponse(
+                status_code=status.HTTP_409_CONFLICT,
+                content={
+                    "signal": ResponseSignal.JOB_ALREADY_RUNNING_ERROR.value,
+                    "job_id": job.job_id,
+                }
+            )
+
+        logger.info(f"Resuming index job {job.job_id} after chunk {job.job_checkpoint.get('last_chunk_id')}")
+    else:
+        job = await job_model.create_job(job=ProcessingJob(
+            job_type=JobTypeEnum.INDEX.value,
+            job_status=JobStatusEnum.PENDING.value,
+            job_config={
+                "do_reset": push_request.do_reset,
+                "storage": push_request.storage,
+            },
+            job_total_files=0,
+            job_processed_files=0,
+            job_inserted_chunks=0,
+            job_errors=[],
+            job_checkpoint={
+                "last_chunk_id": 0,
+                "embedding_model_id": embedding_model_id,
+            },
+            job_project_id=project.project_id,
+        ))
+
+    job_controller = JobController(
+        db_client=request.app.db_client,
+        nlp_controller=nlp_controller,
     )
 
-    # setup batching
-    total_chunks_count = await chunk_model.get_total_chunks_count(project_id=project.project_id)
-    pbar = tqdm(total=total_chunks_count, desc="Vector Indexing", position=0)
+    is_indexed = await job_controller.run_index_job(
+        job_id=job.job_id,
+        project=project,
+        do_reset=job.job_config.get("do_reset", 0) if job.job_status == JobStatusEnum.PENDING.value else 0,
+        storage=job.job_config.get("storage"),
+    )
 
-    while has_records:
-        page_chunks = await chunk_model.get_poject_chunks(project_id=project.project_id, page_no=page_no)
-        if len(page_chunks):
-            page_no += 1
-        
-        if not page_chunks or len(page_chunks) == 0:
-            has_records = False
-            break
+    job = await job_model.get_job(job_id=job.job_id)
+
+    if not is_indexed:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value,
+                "job": job_controller.get_job_details(job=job),
+            }
+        )
 
-        chunks_ids =  [ c.chunk_id for c in page_chunks ]
-        idx += len(page_chunks)
+    job_stats = job.job_stats or {}
         
-        is_inserted = await nlp_controller.index_into_vector_db(
-            project=project,
-            chunks=page_chunks,
-            chunks_ids=chunks_ids
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.INSERT_INTO_VECTORDB_SUCCESS.value,
+            "inserted_items_count": job.job_inserted_chunks,
+            "deleted_items_count": job_stats.get("deleted_chunks", 0),
+            "index_build": job_stats.get("index_build"),
+            "job_id": job.job_id,
+        }
+    )
+
+@nlp_router.get("/index/push/status/{project_id}")
+async def index_project_status(request: Request, project_id: int):
+
+    job_model = await JobModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    job = await job_model.get_latest_job(project_id=project_id, job_type=JobTypeEnum.INDEX.value)
+
+    if job is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.JOB_NOT_FOUND_ERROR.value,
+            }
+        )
+
+    job_controller = JobController(db_client=request.app.db_client)
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.JOB_STATUS_RETRIEVED.value,
+            "job": job_controller.get_job_details(job=job),
+        }
+    )
+
+@nlp_router.post("/index/ingest/{project_id}")
+async def ingest_project(request: Request, project_id: int, ingest_request: IngestRequest):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id,
+        project_name=f"Project {project_id}"
+    )
+
+    asset_model = await AssetModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project_files_ids = {}
+    if ingest_request.file_id:
+        asset_record = await asset_model.get_asset_record(
+            asset_project_id=project.project_id,
+            asset_name=ingest_request.file_id
         )
 
-        if not is_inserted:
+        if asset_record is None:
             return JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={
-                    "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
+                    "signal": ResponseSignal.FILE_ID_ERROR.value,
                 }
             )
 
-        pbar.update(len(page_chunks))
-        inserted_items_count += len(page_chunks)
-        
+        project_files_ids = {
+            asset_record.asset_id: asset_record.asset_name
+        }
+
+    else:
+        project_files = await asset_model.get_all_project_assets(
+            asset_project_id=project.project_id,
+            asset_type=AssetTypeEnum.FILE.value,
+        )
+
+        project_files_ids = {
+            record.asset_id: record.asset_name
+            for record in project_files
+        }
+
+    if len(project_files_ids) == 0:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.NO_FILES_ERROR.value,
+            }
+        )
+
+    if request.app.job_queue.is_full():
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "signal": ResponseSignal.JOB_QUEUE_FULL_ERROR.value,
+            }
+        )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        embedding_scheduler=request.app.embedding_scheduler,
+        query_embedding_cache=request.app.query_embedding_cache,
+        result_cache=request.app.result_cache,
+    )
+
+    job_model = await JobModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    job = await job_model.create_job(job=ProcessingJob(
+        job_type=JobTypeEnum.INGEST.value,
+        job_status=JobStatusEnum.PENDING.value,
+        job_config={
+            "file_id": ingest_request.file_id,
+            "chunk_size": ingest_request.chunk_size,
+            "overlap_size": ingest_request.overlap_size,
+            "do_reset": ingest_request.do_reset,
+            "storage": ingest_request.storage,
+        },
+        job_total_files=len(project_files_ids),
+        job_processed_files=0,
+        job_inserted_chunks=0,
+        job_errors=[],
+        job_project_id=project.project_id,
+    ))
+
+    job_controller = JobController(
+        db_client=request.app.db_client,
+        nlp_controller=nlp_controller,
+        extraction_pool=request.app.extraction_pool,
+    )
+
+    is_submitted = request.app.job_queue.submit(
+        job_id=job.job_id,
+        job_fn=lambda: job_controller.run_ingest_job(
+            job_id=job.job_id,
+            project=project,
+            project_files_ids=project_files_ids,
+            chunk_size=ingest_request.chunk_size,
+            overlap_size=ingest_request.overlap_size,
+            do_reset=ingest_request.do_reset,
+            storage=ingest_request.storage,
+        )
+    )
+
+    if not is_submitted:
+        _ = await job_model.update_job(job_id=job.job_id, job_status=JobStatusEnum.FAILED.value)
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "signal": ResponseSignal.JOB_QUEUE_FULL_ERROR.value,
+            }
+        )
+
     return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
         content={
-            "signal": ResponseSignal.INSERT_INTO_VECTORDB_SUCCESS.value,
-            "inserted_items_count": inserted_items_count
+            "signal": ResponseSignal.PROCESSING_JOB_SUBMITTED.value,
+            "job_id": job.job_id,
+            "total_files": len(project_files_ids),
         }
     )
 
@@ -118,6 +350,9 @@ async def get_project_index_info(request: Request, project_id: int):
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        embedding_scheduler=request.app.embedding_scheduler,
+        query_embedding_cache=request.app.query_embedding_cache,
+        result_cache=request.app.result_cache,
     )
 
     collection_info = await nlp_controller.get_vector_db_collection_info(project=project)
@@ -131,6 +366,14 @@ async def get_project_index_info(request: Request, project_id: int):
 
 @nlp_router.post("/index/search/{project_id}")
 async def search_index(request: Request, project_id: int, search_request: SearchRequest):
+
+    if search_request.mode and search_request.mode not in [ mode.value for mode in SearchModeEnums ]:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_SEARCH_MODE_ERROR.value
+                }
+            )
     
     project_model = await ProjectModel.create_instance(
         db_client=request.app.db_client
@@ -141,15 +384,30 @@ async def search_index(request: Request, project_id: int, search_request: Search
         project_name=f"Project {project_id}"
     )
 
+    search_filter = await get_search_filter(request, project, search_request.filter)
+    if search_filter is False:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.FILE_ID_ERROR.value,
+            }
+        )
+
     nlp_controller = NLPController(
         vectordb_client=request.app.vectordb_client,
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        embedding_scheduler=request.app.embedding_scheduler,
+        query_embedding_cache=request.app.query_embedding_cache,
+        result_cache=request.app.result_cache,
     )
 
     results = await nlp_controller.search_vector_db_collection(
-        project=project, text=search_request.text, limit=search_request.limit
+        project=project, text=search_request.text, limit=search_request.limit,
+        mode=search_request.mode, search_filter=search_filter,
+        search_params=search_request.search_params.dict() if search_request.search_params else None,
+        with_payload=search_request.with_payload is not False,
     )
 
     if not results:
@@ -163,12 +421,89 @@ async def search_index(request: Request, project_id: int, search_request: Search
     return JSONResponse(
         content={
             "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
-            "results": [ result.dict()  for result in results ]
+            "results": [ result.dict(exclude_none=True) for result in results ]
+        }
+    )
+
+@nlp_router.post("/index/search/batch/{project_id}")
+async def search_index_batch(request: Request, project_id: int, search_request: BatchSearchRequest,
+                             app_settings: Settings = Depends(get_settings)):
+
+    if not search_request.texts or len(search_request.texts) > app_settings.SEARCH_BATCH_MAX_QUERIES:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_SEARCH_BATCH_SIZE_ERROR.value,
+                    "max_queries": app_settings.SEARCH_BATCH_MAX_QUERIES,
+                }
+            )
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id,
+        project_name=f"Project {project_id}"
+    )
+
+    search_filter = await get_search_filter(request, project, search_request.filter)
+    if search_filter is False:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.FILE_ID_ERROR.value,
+            }
+        )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        embedding_scheduler=request.app.embedding_scheduler,
+        query_embedding_cache=request.app.query_embedding_cache,
+        result_cache=request.app.result_cache,
+    )
+
+    results = await nlp_controller.search_vector_db_collection_batch(
+        project=project, texts=search_request.texts, limit=search_request.limit,
+        search_filter=search_filter,
+        search_params=search_request.search_params.dict() if search_request.search_params else None,
+        with_payload=search_request.with_payload is not False,
+    )
+
+    if not results:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value
+                }
+            )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
+            "results": [
+                {
+                    "text": text,
+                    "results": [ result.dict(exclude_none=True) for result in query_results or [] ],
+                }
+                for text, query_results in zip(search_request.texts, results)
+            ]
         }
     )
 
 @nlp_router.post("/index/answer/{project_id}")
 async def answer_rag(request: Request, project_id: int, search_request: SearchRequest):
+
+    if search_request.mode and search_request.mode not in [ mode.value for mode in SearchModeEnums ]:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_SEARCH_MODE_ERROR.value
+                }
+            )
     
     project_model = await ProjectModel.create_instance(
         db_client=request.app.db_client
@@ -179,17 +514,32 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
         project_name=f"Project {project_id}"
     )
 
+    search_filter = await get_search_filter(request, project, search_request.filter)
+    if search_filter is False:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.FILE_ID_ERROR.value,
+            }
+        )
+
     nlp_controller = NLPController(
         vectordb_client=request.app.vectordb_client,
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        embedding_scheduler=request.app.embedding_scheduler,
+        query_embedding_cache=request.app.query_embedding_cache,
+        result_cache=request.app.result_cache,
     )
 
     answer, full_prompt, chat_history = await nlp_controller.answer_rag_question(
         project=project,
         query=search_request.text,
         limit=search_request.limit,
+        mode=search_request.mode,
+        search_filter=search_filter,
+        search_params=search_request.search_params.dict() if search_request.search_params else None,
     )
 
     if not answer:
@@ -208,3 +558,178 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
             "chat_history": chat_history
         }
     )
+
+async def get_search_projects(request: Request, search_request: MultiProjectSearchRequest,
+                              app_settings: Settings):
+    """
+    Projects of a multi-project search, or the error response of the request.
+    """
+
+    if search_request.mode and search_request.mode not in [ mode.value for mode in SearchModeEnums ]:
+        return None, JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_SEARCH_MODE_ERROR.value
+                }
+            )
+
+    project_ids = list(dict.fromkeys(search_request.project_ids))
+    if not project_ids or len(project_ids) > app_settings.SEARCH_MULTI_PROJECT_MAX_PROJECTS:
+        return None, JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_SEARCH_PROJECTS_SIZE_ERROR.value,
+                    "max_projects": app_settings.SEARCH_MULTI_PROJECT_MAX_PROJECTS,
+                }
+            )
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    projects = await project_model.get_projects_by_ids(project_ids=project_ids)
+    missing_project_ids = sorted(set(project_ids) - set(project.project_id for project in projects))
+    if missing_project_ids:
+        return None, JSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND,
+                content={
+                    "signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value,
+                    "project_ids": missing_project_ids,
+                }
+            )
+
+    return projects, None
+
+@nlp_router.post("/index/multi/search")
+async def search_index_multi(request: Request, search_request: MultiProjectSearchRequest,
+                             app_settings: Settings = Depends(get_settings)):
+
+    projects, error_response = await get_search_projects(request, search_request, app_settings)
+    if error_response:
+        return error_response
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        embedding_scheduler=request.app.embedding_scheduler,
+        query_embedding_cache=request.app.query_embedding_cache,
+        result_cache=request.app.result_cache,
+    )
+
+    results, failed_project_ids = await nlp_controller.search_projects(
+        projects=projects, text=search_request.text, limit=search_request.limit,
+        mode=search_request.mode,
+        search_params=search_request.search_params.dict() if search_request.search_params else None,
+        with_payload=search_request.with_payload is not False,
+    )
+
+    if not results:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value,
+                    "failed_project_ids": failed_project_ids,
+                }
+            )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
+            "results": [
+                { "project_id": project_id, **result.dict(exclude_none=True) }
+                for project_id, result in results
+            ],
+            "failed_project_ids": failed_project_ids,
+        }
+    )
+
+@nlp_router.post("/index/multi/answer")
+async def answer_rag_multi(request: Request, search_request: MultiProjectSearchRequest,
+                           app_settings: Settings = Depends(get_settings)):
+
+    projects, error_response = await get_search_projects(request, search_request, app_settings)
+    if error_response:
+        return error_response
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        embedding_scheduler=request.app.embedding_scheduler,
+        query_embedding_cache=request.app.query_embedding_cache,
+        result_cache=request.app.result_cache,
+    )
+
+    answer, full_prompt, chat_history, failed_project_ids = await nlp_controller.answer_rag_question_multi(
+        projects=projects,
+        query=search_request.text,
+        limit=search_request.limit,
+        mode=search_request.mode,
+        search_params=search_request.search_params.dict() if search_request.search_params else None,
+    )
+
+    if not answer:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.RAG_ANSWER_ERROR.value,
+                    "failed_project_ids": failed_project_ids,
+                }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.RAG_ANSWER_SUCCESS.value,
+            "answer": answer,
+            "full_prompt": full_prompt,
+            "chat_history": chat_history,
+            "failed_project_ids": failed_project_ids,
+        }
+    )
+
+@nlp_router.get("/embedding/cache/stats")
+async def embedding_cache_stats(request: Request):
+
+    if not request.app.embedding_cache and not request.app.query_embedding_cache:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.EMBEDDING_CACHE_DISABLED.value
+            }
+        )
+
+    cache_stats, query_cache_stats = None, None
+    if request.app.embedding_cache:
+        cache_stats = await request.app.embedding_cache.get_stats()
+
+    if request.app.query_embedding_cache:
+        query_cache_stats = request.app.query_embedding_cache.get_stats()
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.EMBEDDING_CACHE_STATS_RETRIEVED.value,
+            "cache_stats": cache_stats,
+            "query_cache_stats": query_cache_stats,
+        }
+    )
+
+@nlp_router.get("/results/cache/stats")
+async def result_cache_stats(request: Request):
+
+    if not request.app.result_cache:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.RESULT_CACHE_DISABLED.value
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.RESULT_CACHE_STATS_RETRIEVED.value,
+            "cache_stats": request.app.result_cache.get_stats(),
+        }
+    )
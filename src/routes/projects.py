@@ -11,6 +11,11 @@ class ProjectNameUpdate(BaseModel):
 class ProjectCreate(BaseModel):
     name: Optional[str] = None
 
+class ProjectSearchConfigUpdate(BaseModel):
+    ef_search: Optional[int] = None
+    probes: Optional[int] = None
+    exact: Optional[bool] = None
+
 projects_router = APIRouter(
     prefix="/api/v1/projects",
     tags=["api_v1", "projects"],
@@ -119,4 +124,40 @@ async def update_project_name(
                 "name": updated_project.name
             }
         }
-    ) 
\ No newline at end of file
+    )
+
+@projects_router.put("/{project_id}/search-config")
+async def update_project_search_config(
+    request: Request,
+    project_id: int,
+    search_config: ProjectSearchConfigUpdate = Body(...)
+):
+    """
+    Update the project search defaults (ef_search, probes, exact), unset values fall back to the settings
+    """
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    updated_project = await project_model.update_project_search_config(
+        project_id=project_id,
+        search_config={
+            key: value
+            for key, value in search_config.dict().items()
+            if value is not None
+        }
+    )
+
+    if not updated_project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.SUCCESS.value,
+            "project": {
+                "id": updated_project.project_id,
+                "name": updated_project.name,
+                "search_config": updated_project.project_search_config or {},
+            }
+        }
+    )
@@ -1,9 +1,58 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
+    # vector storage of a newly created collection: float, half, scalar or binary
+    storage: Optional[str] = None
+
+class IngestRequest(BaseModel):
+    file_id: str = None
+    chunk_size: Optional[int] = 100
+    overlap_size: Optional[int] = 20
+    do_reset: Optional[int] = 0
+    storage: Optional[str] = None
+
+class SearchFilter(BaseModel):
+    # qdrant collections pushed before the search filters carry no asset id,
+    # asset_ids / file_names only match them after a push with do_reset
+    asset_ids: Optional[List[int]] = None
+    # asset names, i.e. the stored file names
+    file_names: Optional[List[str]] = None
+    # page span of the chunks, as stored in their metadata (0 based for pdf files)
+    page_from: Optional[int] = None
+    page_to: Optional[int] = None
+
+class SearchParams(BaseModel):
+    # hnsw candidates list size, higher: better recall, slower
+    ef_search: Optional[int] = None
+    # ivfflat lists scanned per query
+    probes: Optional[int] = None
+    # skip the index and scan every vector
+    exact: Optional[bool] = None
 
 class SearchRequest(BaseModel):
     text: str
     limit: Optional[int] = 5
+    # vector, lexical or hybrid, defaults to SEARCH_DEFAULT_MODE
+    mode: Optional[str] = None
+    filter: Optional[SearchFilter] = None
+    search_params: Optional[SearchParams] = None
+    # chunk id, asset, file name, chunk order and metadata of every result, ignored by answers
+    with_payload: Optional[bool] = True
+
+class BatchSearchRequest(BaseModel):
+    texts: List[str]
+    limit: Optional[int] = 5
+    filter: Optional[SearchFilter] = None
+    search_params: Optional[SearchParams] = None
+    with_payload: Optional[bool] = True
+
+class MultiProjectSearchRequest(BaseModel):
+    project_ids: List[int]
+    text: str
+    limit: Optional[int] = 5
+    mode: Optional[str] = None
+    # applied to every project, on top of its own search config
+    search_params: Optional[SearchParams] = None
+    with_payload: Optional[bool] = True
@@ -0,0 +1,87 @@
+from models.EmbeddingCacheModel import EmbeddingCacheModel
+from array import array
+from typing import List
+import hashlib
+import logging
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache stored in Postgres.
+    Entries are keyed by (embedding model id, embedding size, document type, sha256 of the text)
+    and the least recently used ones are evicted once the table grows above `max_entries`.
+    """
+
+    def __init__(self, db_client: object, max_entries: int = 1000000, evict_every: int = 1000):
+        self.db_client = db_client
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+
+        self.hits = 0
+        self.misses = 0
+        self.inserted_since_eviction = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    def make_key(self, text: str, model_id: str, embedding_size: int, document_type: str) -> str:
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        key = f"{model_id}:{embedding_size}:{document_type}:{text_hash}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def encode_vector(self, vector: List[float]) -> bytes:
+        return array("f", vector).tobytes()
+
+    def decode_vector(self, data: bytes) -> List[float]:
+        vector = array("f")
+        vector.frombytes(data)
+        return vector.tolist()
+
+    async def get_many(self, cache_keys: List[str]) -> dict:
+        cache_model = await EmbeddingCacheModel.create_instance(db_client=self.db_client)
+        records = await cache_model.get_entries(cache_keys=list(set(cache_keys)))
+
+        hits = sum(1 for key in cache_keys if key in records)
+        self.hits += hits
+        self.misses += len(cache_keys) - hits
+
+        return {
+            key: self.decode_vector(data)
+            for key, data in records.items()
+        }
+
+    async def put_many(self, cache_keys: List[str], vectors: List[List[float]],
+                       model_id: str, embedding_size: int, document_type: str):
+
+        entries = {
+            key: {
+                "cache_key": key,
+                "embedding_model_id": model_id,
+                "embedding_size": embedding_size,
+                "document_type": document_type or "",
+                "embedding_vector": self.encode_vector(vector),
+            }
+            for key, vector in zip(cache_keys, vectors)
+        }
+
+        cache_model = await EmbeddingCacheModel.create_instance(db_client=self.db_client)
+        inserted_count = await cache_model.insert_entries(entries=list(entries.values()))
+
+        self.inserted_since_eviction += inserted_count
+        if self.max_entries and self.inserted_since_eviction >= self.evict_every:
+            self.inserted_since_eviction = 0
+            evicted_count = await cache_model.evict_entries(max_entries=self.max_entries)
+            if evicted_count:
+                self.logger.info(f"Evicted {evicted_count} embedding cache entries")
+
+        return inserted_count
+
+    async def get_stats(self):
+        cache_model = await EmbeddingCacheModel.create_instance(db_client=self.db_client)
+        lookups = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": await cache_model.get_entries_count(),
+            "max_entries": self.max_entries,
+        }
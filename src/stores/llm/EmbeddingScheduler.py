@@ -0,0 +1,257 @@
+from .LLMInterface import LLMInterface
+from .EmbeddingCache import EmbeddingCache
+from typing import List
+import asyncio
+import logging
+import math
+import random
+import time
+
+class RateLimiter:
+    """
+    Token buckets for requests-per-minute and tokens-per-minute limits.
+    A limit of 0 (or None) disables the corresponding bucket.
+    """
+
+    def __init__(self, requests_per_minute: int = None, tokens_per_minute: int = None):
+        self.requests_per_minute = requests_per_minute or 0
+        self.tokens_per_minute = tokens_per_minute or 0
+
+        self.available_requests = float(self.requests_per_minute)
+        self.available_tokens = float(self.tokens_per_minute)
+        self.updated_at = time.monotonic()
+
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.updated_at = now
+
+        if self.requests_per_minute:
+            self.available_requests = min(self.requests_per_minute,
+                                          self.available_requests + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            self.available_tokens = min(self.tokens_per_minute,
+                                        self.available_tokens + elapsed * self.tokens_per_minute / 60)
+
+    def _wait_time(self, tokens: int) -> float:
+        wait_time = 0.0
+        if self.requests_per_minute and self.available_requests < 1:
+            wait_time = max(wait_time, (1 - self.available_requests) * 60 / self.requests_per_minute)
+
+        if self.tokens_per_minute:
+            # a batch bigger than the whole budget can only wait for a full bucket
+            tokens = min(tokens, self.tokens_per_minute)
+            if self.available_tokens < tokens:
+                wait_time = max(wait_time, (tokens - self.available_tokens) * 60 / self.tokens_per_minute)
+
+        return wait_time
+
+    async def acquire(self, tokens: int):
+        async with self.lock:
+            while True:
+                self._refill()
+                wait_time = self._wait_time(tokens)
+                if wait_time <= 0:
+                    break
+                await asyncio.sleep(wait_time)
+
+            if self.requests_per_minute:
+                self.available_requests -= 1
+            if self.tokens_per_minute:
+                self.available_tokens -= min(tokens, self.tokens_per_minute)
+
+
+class EmbeddingScheduler:
+    """
+    Packs texts into provider sized batches (by count and token budget), keeps up to
+    `max_concurrency` embedding requests in flight and respects RPM / TPM limits.
+    On HTTP 429 the request is retried with exponential backoff and the allowed
+    concurrency is halved, then grows back by one after every `recovery_after` successes.
+    """
+
+    def __init__(self, embedding_client: LLMInterface, max_concurrency: int = 4,
+                       requests_per_minute: int = None, tokens_per_minute: int = None,
+                       max_batch_size: int = None, max_batch_tokens: int = None,
+                       max_retries: int = 5, backoff_base: float = 1.0, backoff_max: float = 60.0,
+                       recovery_after: int = 10, embedding_cache: EmbeddingCache = None):
+
+        self.embedding_client = embedding_client
+        self.embedding_cache = embedding_cache
+
+        self.max_batch_size = max_batch_size or getattr(embedding_client, "embedding_max_batch_size", 96)
+        self.max_batch_tokens = max_batch_tokens or getattr(embedding_client, "embedding_max_batch_tokens", None)
+
+        self.max_concurrency = max(1, max_concurrency)
+        self.allowed_concurrency = self.max_concurrency
+        self.in_flight = 0
+        self.condition = asyncio.Condition()
+
+        self.rate_limiter = RateLimiter(requests_per_minute=requests_per_minute,
+                                        tokens_per_minute=tokens_per_minute)
+
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.recovery_after = recovery_after
+        self.successes_since_throttle = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    def estimate_tokens(self, text: str) -> int:
+        # ~4 characters per token for the models we use, good enough for budgeting
+        return max(1, math.ceil(len(self.embedding_client.process_text(text)) / 4))
+
+    def pack_batches(self, texts: List[str]):
+        batches = []
+        batch, batch_tokens = [], 0
+
+        for idx, text in enumerate(texts):
+            tokens = self.estimate_tokens(text)
+
+            is_full = len(batch) >= self.max_batch_size or (
+                self.max_batch_tokens and batch_tokens + tokens > self.max_batch_tokens
+            )
+            if batch and is_full:
+                batches.append((batch, batch_tokens))
+                batch, batch_tokens = [], 0
+
+            batch.append(idx)
+            batch_tokens += tokens
+
+        if batch:
+            batches.append((batch, batch_tokens))
+
+        return batches
+
+    def is_rate_limit_error(self, error: Exception) -> bool:
+        status_code = getattr(error, "status_code", None)
+        if status_code is None:
+            status_code = getattr(getattr(error, "response", None), "status_code", None)
+        return status_code == 429
+
+    def get_retry_after(self, error: Exception):
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return None
+
+    async def _acquire_slot(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < self.allowed_concurrency)
+            self.in_flight += 1
+
+    async def _release_slot(self, is_throttled: bool = False):
+        async with self.condition:
+            self.in_flight -= 1
+
+            if is_throttled:
+                self.allowed_concurrency = max(1, self.allowed_concurrency // 2)
+                self.successes_since_throttle = 0
+            else:
+                self.successes_since_throttle += 1
+                if (self.allowed_concurrency < self.max_concurrency
+                        and self.successes_since_throttle >= self.recovery_after):
+                    self.allowed_concurrency += 1
+                    self.successes_since_throttle = 0
+
+            self.condition.notify_all()
+
+    async def _call_provider(self, texts: List[str], document_type: str):
+        return await self.embedding_client.aembed_text(text=texts, document_type=document_type)
+
+    async def _embed_batch(self, texts: List[str], tokens: int, document_type: str):
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire(tokens=tokens)
+            await self._acquire_slot()
+
+            is_throttled = False
+            try:
+                return await self._call_provider(texts=texts, document_type=document_type)
+            except Exception as e:
+                if not self.is_rate_limit_error(e) or attempt == self.max_retries:
+                    raise
+                is_throttled = True
+                retry_after = self.get_retry_after(e)
+            finally:
+                await self._release_slot(is_throttled=is_throttled)
+
+            backoff = retry_after or min(self.backoff_max, self.backoff_base * (2 ** attempt))
+            backoff = backoff * (1 + random.random() * 0.25)
+            self.logger.warning(f"Embedding rate limited, retrying in {backoff:.1f}s "
+                                f"(concurrency={self.allowed_concurrency})")
+            await asyncio.sleep(backoff)
+
+    async def embed(self, texts: List[str], document_type: str = None):
+        if isinstance(texts, str):
+            texts = [texts]
+
+        if not texts:
+            return []
+
+        if not self.embedding_cache:
+            return await self._embed_texts(texts=texts, document_type=document_type)
+
+        model_id = self.embedding_client.embedding_model_id
+        embedding_size = self.embedding_client.embedding_size
+        cache_keys = [
+            self.embedding_cache.make_key(text=text, model_id=model_id,
+                                          embedding_size=embedding_size, document_type=document_type)
+            for text in texts
+        ]
+
+        try:
+            cached_vectors = await self.embedding_cache.get_many(cache_keys=cache_keys)
+        except Exception as e:
+            self.logger.error(f"Error while reading the embedding cache: {e}")
+            cached_vectors = {}
+
+        # only the distinct misses are sent to the provider
+        missed_keys = list(dict.fromkeys(key for key in cache_keys if key not in cached_vectors))
+        if missed_keys:
+            key_to_text = dict(zip(cache_keys, texts))
+            missed_vectors = await self._embed_texts(texts=[ key_to_text[key] for key in missed_keys ],
+                                                     document_type=document_type)
+            if missed_vectors is None:
+                return None
+
+            cached_vectors.update(zip(missed_keys, missed_vectors))
+
+            try:
+                _ = await self.embedding_cache.put_many(cache_keys=missed_keys, vectors=missed_vectors,
+                                                        model_id=model_id, embedding_size=embedding_size,
+                                                        document_type=document_type)
+            except Exception as e:
+                self.logger.error(f"Error while writing the embedding cache: {e}")
+
+        return [ cached_vectors[key] for key in cache_keys ]
+
+    async def _embed_texts(self, texts: List[str], document_type: str = None):
+        batches = self.pack_batches(texts)
+
+        # the first failed batch cancels the others, the caller gets nothing anyway
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                tasks = [
+                    task_group.create_task(self._embed_batch(texts=[ texts[idx] for idx in batch ],
+                                                             tokens=tokens, document_type=document_type))
+                    for batch, tokens in batches
+                ]
+        except Exception as e:
+            self.logger.error(f"Error while embedding texts: {e.exceptions[0]}")
+            return None
+
+        results = [ task.result() for task in tasks ]
+
+        vectors = [None] * len(texts)
+        for (batch, _), batch_vectors in zip(batches, results):
+            if not batch_vectors or len(batch_vectors) != len(batch):
+                self.logger.error("Embedding provider returned an invalid batch")
+                return None
+
+            for idx, vector in zip(batch, batch_vectors):
+                vectors[idx] = vector
+
+        return vectors
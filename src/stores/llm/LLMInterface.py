@@ -11,12 +11,12 @@ class LLMInterface(ABC):
         pass
 
     @abstractmethod
-    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
-                            temperature: float = None):
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
         pass
 
     @abstractmethod
-    def embed_text(self, text: str, document_type: str = None):
+    async def aembed_text(self, text: str, document_type: str = None):
         pass
 
     @abstractmethod
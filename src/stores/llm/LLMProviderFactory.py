@@ -1,10 +1,27 @@
 from .LLMEnums import LLMEnums
 from .providers import OpenAIProvider, CoHereProvider, GoogleProvider
+import httpx
 
 class LLMProviderFactory:
     def __init__(self, config: dict):
         self.config = config
 
+        # one connection pool shared by every provider created by this factory
+        self.timeout = httpx.Timeout(
+            self.config.LLM_HTTP_TIMEOUT,
+            connect=self.config.LLM_HTTP_CONNECT_TIMEOUT,
+        )
+        self.http_client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.config.LLM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=self.config.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+
+    async def close(self):
+        await self.http_client.aclose()
+
     def create(self, provider: str):
         if provider == LLMEnums.OPENAI.value:
             return OpenAIProvider(
@@ -12,7 +29,9 @@ class LLMProviderFactory:
                 api_url = self.config.OPENAI_API_URL,
                 default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE,
+                http_client=self.http_client,
+                timeout=self.timeout,
             )
 
         if provider == LLMEnums.COHERE.value:
@@ -20,7 +39,9 @@ class LLMProviderFactory:
                 api_key = self.config.COHERE_API_KEY,
                 default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE,
+                http_client=self.http_client,
+                timeout=self.timeout,
             )
         
         if provider == LLMEnums.GOOGLE.value:
@@ -29,7 +50,9 @@ class LLMProviderFactory:
                 api_url = self.config.GOOGLE_API_URL,
                 default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE,
+                http_client=self.http_client,
+                timeout=self.timeout,
             )
 
         return None
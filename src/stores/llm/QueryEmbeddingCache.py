@@ -0,0 +1,22 @@
+from helpers.ttl_cache import TTLCache
+from typing import List
+
+class QueryEmbeddingCache(TTLCache):
+    """
+    In-process LRU cache with a TTL for query embeddings, keyed by
+    (embedding model id, embedding size, normalized text).
+    Misses fall through to the embedding scheduler, which consults the shared
+    Postgres embedding cache when it is enabled, so every worker benefits from it.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 3600):
+        super().__init__(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def make_key(self, text: str, model_id: str, embedding_size: int):
+        return (model_id, embedding_size, self.normalize_text(text))
+
+    def get(self, text: str, model_id: str, embedding_size: int) -> List[float]:
+        return super().get(key=self.make_key(text=text, model_id=model_id, embedding_size=embedding_size))
+
+    def put(self, text: str, model_id: str, embedding_size: int, vector: List[float]):
+        super().put(key=self.make_key(text=text, model_id=model_id, embedding_size=embedding_size), value=vector)
@@ -1,6 +1,7 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import CoHereEnums, DocumentTypeEnum
 import cohere
+import httpx
 import logging
 from typing import List, Union
 
@@ -9,7 +10,8 @@ class CoHereProvider(LLMInterface):
     def __init__(self, api_key: str,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       http_client: httpx.AsyncClient=None, timeout: httpx.Timeout=None):
         
         self.api_key = api_key
 
@@ -22,7 +24,15 @@ class CoHereProvider(LLMInterface):
         self.embedding_model_id = None
         self.embedding_size = None
 
-        self.client = cohere.Client(api_key=self.api_key)
+        # provider request limits used by the embedding scheduler
+        self.embedding_max_batch_size = 96
+        self.embedding_max_batch_tokens = None
+
+        self.client = cohere.AsyncClient(
+            api_key=self.api_key,
+            httpx_client=http_client,
+            **({"timeout": timeout.read} if timeout else {}),
+        )
 
         self.enums = CoHereEnums
         self.logger = logging.getLogger(__name__)
@@ -37,8 +47,8 @@ class CoHereProvider(LLMInterface):
     def process_text(self, text: str):
         return text[:self.default_input_max_characters].strip()
 
-    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
-                            temperature: float = None):
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
 
         if not self.client:
             self.logger.error("CoHere client was not set")
@@ -51,7 +61,7 @@ class CoHereProvider(LLMInterface):
         max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
         temperature = temperature if temperature else self.default_generation_temperature
 
-        response = self.client.chat(
+        response = await self.client.chat(
             model = self.generation_model_id,
             chat_history = chat_history,
             message = self.process_text(prompt),
@@ -65,7 +75,7 @@ class CoHereProvider(LLMInterface):
         
         return response.text
     
-    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
         if not self.client:
             self.logger.error("CoHere client was not set")
             return None
@@ -77,11 +87,11 @@ class CoHereProvider(LLMInterface):
             self.logger.error("Embedding model for CoHere was not set")
             return None
         
-        input_type = CoHereEnums.DOCUMENT
-        if document_type == DocumentTypeEnum.QUERY:
-            input_type = CoHereEnums.QUERY
+        input_type = CoHereEnums.DOCUMENT.value
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = CoHereEnums.QUERY.value
 
-        response = self.client.embed(
+        response = await self.client.embed(
             model = self.embedding_model_id,
             texts = [ self.process_text(t) for t in text ],
             input_type = input_type,
@@ -1,7 +1,6 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import GoogleEnums
-import requests
-import json
+import httpx
 import logging
 from typing import List, Union
 
@@ -10,7 +9,8 @@ class GoogleProvider(LLMInterface):
     def __init__(self, api_key: str, api_url: str=None,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       http_client: httpx.AsyncClient=None, timeout: httpx.Timeout=None):
         
         self.api_key = api_key
         self.api_url = api_url
@@ -24,6 +24,12 @@ class GoogleProvider(LLMInterface):
         self.embedding_model_id = None
         self.embedding_size = None
 
+        # provider request limits used by the embedding scheduler
+        self.embedding_max_batch_size = 100
+        self.embedding_max_batch_tokens = None
+
+        self.client = http_client or httpx.AsyncClient(timeout=timeout)
+
         self.enums = GoogleEnums
         self.logger = logging.getLogger(__name__)
 
@@ -37,9 +43,13 @@ class GoogleProvider(LLMInterface):
     def process_text(self, text: str):
         return text[:self.default_input_max_characters].strip()
 
-    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
-                            temperature: float = None):
-        
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+
+        if not self.client:
+            self.logger.error("Google client was not set")
+            return None
+
         if not self.generation_model_id:
             self.logger.error("Generation model for Google was not set")
             return None
@@ -85,21 +95,17 @@ class GoogleProvider(LLMInterface):
         }
         
         # Make API request
-        url = f"{self.api_url}/models/{self.generation_model_id}:generateContent?key={self.api_key}"
+        url = f"{self.api_url}/models/{self.generation_model_id}:generateContent"
         
         try:
-            print(f"Calling Gemini API with URL: {url}")
-            print(f"Payload: {json.dumps(payload, indent=2)}")
-            response = requests.post(url, json=payload)
+            response = await self.client.post(url, params={"key": self.api_key}, json=payload)
             
-            if not response.ok:
-                print(f"Gemini API error status: {response.status_code}")
-                print(f"Gemini API error response: {response.text}")
+            if not response.is_success:
+                self.logger.error(f"Gemini API error status: {response.status_code}, response: {response.text}")
                 
             response.raise_for_status()
             
             response_data = response.json()
-            print(f"Gemini API response: {json.dumps(response_data, indent=2)}")
             
             if not response_data or "candidates" not in response_data or len(response_data["candidates"]) == 0:
                 self.logger.error("Error while generating text with Google Gemini")
@@ -111,7 +117,7 @@ class GoogleProvider(LLMInterface):
             self.logger.error(f"Error calling Google Gemini API: {str(e)}")
             return None
 
-    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
         # Google Gemini doesn't support embeddings yet, so we'll return None
         # In a real implementation, you might want to use a different provider for embeddings
         self.logger.error("Embedding not supported by Google Gemini provider")
@@ -120,7 +126,7 @@ class GoogleProvider(LLMInterface):
     def construct_prompt(self, prompt: str, role: str):
         # For Google, we need to handle the system role differently
         if role.lower() == "system":
-            # We'll handle system messages in generate_text
+            # We'll handle system messages in agenerate_text
             role = "user"
             
         return {
@@ -1,6 +1,7 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import OpenAIEnums
-from openai import OpenAI
+from openai import AsyncOpenAI
+import httpx
 import logging
 from typing import List, Union
 
@@ -9,7 +10,8 @@ class OpenAIProvider(LLMInterface):
     def __init__(self, api_key: str, api_url: str=None,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       http_client: httpx.AsyncClient=None, timeout: httpx.Timeout=None):
         
         self.api_key = api_key
         self.api_url = api_url
@@ -23,9 +25,16 @@ class OpenAIProvider(LLMInterface):
         self.embedding_model_id = None
         self.embedding_size = None
 
-        self.client = OpenAI(
+        # provider request limits used by the embedding scheduler
+        self.embedding_max_batch_size = 2048
+        self.embedding_max_batch_tokens = 300000
+
+        # the sdk sends its own per request timeout, so it is passed along with the shared pool
+        self.client = AsyncOpenAI(
             api_key = self.api_key,
-            base_url = self.api_url if self.api_url and len(self.api_url) else None
+            base_url = self.api_url if self.api_url and len(self.api_url) else None,
+            http_client = http_client,
+            **({"timeout": timeout} if timeout else {}),
         )
 
         self.enums = OpenAIEnums
@@ -41,8 +50,8 @@ class OpenAIProvider(LLMInterface):
     def process_text(self, text: str):
         return text[:self.default_input_max_characters].strip()
 
-    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
-                            temperature: float = None):
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
         
         if not self.client:
             self.logger.error("OpenAI client was not set")
@@ -59,7 +68,7 @@ class OpenAIProvider(LLMInterface):
             self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
         )
 
-        response = self.client.chat.completions.create(
+        response = await self.client.chat.completions.create(
             model = self.generation_model_id,
             messages = chat_history,
             max_tokens = max_output_tokens,
@@ -73,7 +82,7 @@ class OpenAIProvider(LLMInterface):
         return response.choices[0].message.content
 
 
-    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
         
         if not self.client:
             self.logger.error("OpenAI client was not set")
@@ -86,7 +95,7 @@ class OpenAIProvider(LLMInterface):
             self.logger.error("Embedding model for OpenAI was not set")
             return None
         
-        response = self.client.embeddings.create(
+        response = await self.client.embeddings.create(
             model = self.embedding_model_id,
             input = text,
         )
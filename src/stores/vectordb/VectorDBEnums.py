@@ -3,17 +3,31 @@ from enum import Enum
 class VectorDBEnums(Enum):
     QDRANT = "QDRANT"
     PGVECTOR = "PGVECTOR"
+    NUMPY = "NUMPY"
+    HNSW = "HNSW"
 
 class DistanceMethodEnums(Enum):
     COSINE = "cosine"
     DOT = "dot"
 
+class VectorStorageEnums(Enum):
+    FLOAT = "float"
+    HALF = "half"
+    SCALAR = "scalar"
+    BINARY = "binary"
+
+class SearchModeEnums(Enum):
+    VECTOR = "vector"
+    LEXICAL = "lexical"
+    HYBRID = "hybrid"
+
 class PgVectorTableSchemeEnums(Enum):
     ID = 'id'
     TEXT = 'text'
     VECTOR = 'vector'
     CHUNK_ID = 'chunk_id'
     METADATA = 'metadata'
+    TEXT_SEARCH = 'text_search'
     _PREFIX = 'pgvector'
 
 class PgVectorDistanceMethodEnums(Enum):
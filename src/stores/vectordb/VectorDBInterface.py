@@ -4,6 +4,10 @@ from models.db_schemes import RetrievedDocument
 
 class VectorDBInterface(ABC):
 
+    # records referencing the chunks table (foreign key) cannot outlive their chunk,
+    # so a push does not have to look for vectors of deleted chunks
+    has_chunk_references: bool = False
+
     @abstractmethod
     def connect(self):
         pass
@@ -31,7 +35,8 @@ class VectorDBInterface(ABC):
     @abstractmethod
     def create_collection(self, collection_name: str, 
                                 embedding_size: int,
-                                do_reset: bool = False):
+                                do_reset: bool = False,
+                                storage: str = None):
         pass
 
     @abstractmethod
@@ -43,10 +48,57 @@ class VectorDBInterface(ABC):
     @abstractmethod
     def insert_many(self, collection_name: str, texts: list, 
                           vectors: list, metadata: list = None, 
-                          record_ids: list = None, batch_size: int = 50):
+                          record_ids: list = None, batch_size: int = 50,
+                          defer_index: bool = False):
+        pass
+
+    @abstractmethod
+    def build_vector_index(self, collection_name: str):
+        pass
+
+    @abstractmethod
+    def list_record_ids(self, collection_name: str) -> List:
+        pass
+
+    @abstractmethod
+    def delete_by_record_ids(self, collection_name: str, record_ids: list):
         pass
 
     @abstractmethod
-    def search_by_vector(self, collection_name: str, vector: list, limit: int) -> List[RetrievedDocument]:
+    def search_by_vector(self, collection_name: str, vector: list, limit: int,
+                               search_filter: dict = None, search_params: dict = None,
+                               with_payload: bool = True) -> List[RetrievedDocument]:
         pass
-    
\ No newline at end of file
+
+    @abstractmethod
+    def search_by_vectors(self, collection_name: str, vectors: list, limit: int,
+                                search_filter: dict = None, search_params: dict = None,
+                                with_payload: bool = True) -> List[List[RetrievedDocument]]:
+        pass
+
+    @abstractmethod
+    def search_by_text(self, collection_name: str, text: str, limit: int,
+                             search_filter: dict = None, with_payload: bool = True) -> List[RetrievedDocument]:
+        pass
+
+    def get_retrieved_document(self, text: str, score: float, record_id: int = None,
+                               metadata: dict = None, with_payload: bool = True) -> RetrievedDocument:
+        """
+        Search result of a record from the payload written at indexing: the record id is
+        the chunk id, the metadata carries asset_id, file_name (the asset name) and chunk_order.
+        """
+
+        if not with_payload:
+            return RetrievedDocument(text=text, score=score)
+
+        metadata = metadata or {}
+
+        return RetrievedDocument(
+            text=text,
+            score=score,
+            chunk_id=record_id,
+            asset_id=metadata.get("asset_id"),
+            file_name=metadata.get("file_name"),
+            chunk_order=metadata.get("chunk_order"),
+            metadata=metadata,
+        )
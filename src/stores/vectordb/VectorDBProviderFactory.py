@@ -1,4 +1,4 @@
-from .providers import QdrantDBProvider, PGVectorProvider
+from .providers import QdrantDBProvider, PGVectorProvider, NumpyDBProvider, HnswDBProvider
 from .VectorDBEnums import VectorDBEnums
 from controllers.BaseController import BaseController
 from sqlalchemy.orm import sessionmaker
@@ -18,6 +18,14 @@ class VectorDBProviderFactory:
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                url=self.config.VECTOR_DB_QDRANT_URL,
+                api_key=self.config.VECTOR_DB_QDRANT_API_KEY,
+                prefer_grpc=self.config.VECTOR_DB_QDRANT_PREFER_GRPC,
+                grpc_port=self.config.VECTOR_DB_QDRANT_GRPC_PORT,
+                timeout=self.config.VECTOR_DB_QDRANT_TIMEOUT,
+                upload_parallelism=self.config.VECTOR_DB_QDRANT_UPLOAD_PARALLELISM,
+                storage=self.config.VECTOR_DB_STORAGE,
+                oversampling=self.config.VECTOR_DB_QUANTIZATION_OVERSAMPLING,
             )
         
         if provider == VectorDBEnums.PGVECTOR.value:
@@ -26,6 +34,40 @@ class VectorDBProviderFactory:
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                index_type=self.config.VECTOR_DB_PGVEC_INDEX_TYPE,
+                hnsw_m=self.config.VECTOR_DB_PGVEC_HNSW_M,
+                hnsw_ef_construction=self.config.VECTOR_DB_PGVEC_HNSW_EF_CONSTRUCTION,
+                ivfflat_lists=self.config.VECTOR_DB_PGVEC_IVFFLAT_LISTS,
+                maintenance_work_mem=self.config.VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM,
+                storage=self.config.VECTOR_DB_STORAGE,
+                oversampling=self.config.VECTOR_DB_QUANTIZATION_OVERSAMPLING,
+                text_search_config=self.config.VECTOR_DB_PGVEC_TEXT_SEARCH_CONFIG,
+                iterative_scan=self.config.VECTOR_DB_PGVEC_ITERATIVE_SCAN,
+            )
+
+        if provider == VectorDBEnums.NUMPY.value:
+            numpy_db_client = self.base_controller.get_database_path(db_name=self.config.VECTOR_DB_PATH)
+
+            return NumpyDBProvider(
+                db_client=numpy_db_client,
+                distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
+                index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                storage=self.config.VECTOR_DB_STORAGE,
+            )
+
+        if provider == VectorDBEnums.HNSW.value:
+            hnsw_db_client = self.base_controller.get_database_path(db_name=self.config.VECTOR_DB_PATH)
+
+            return HnswDBProvider(
+                db_client=hnsw_db_client,
+                distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
+                index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                storage=self.config.VECTOR_DB_STORAGE,
+                connectivity=self.config.VECTOR_DB_HNSW_M,
+                expansion_add=self.config.VECTOR_DB_HNSW_EF_CONSTRUCTION,
+                save_delay_seconds=self.config.VECTOR_DB_HNSW_SAVE_DELAY_SECONDS,
             )
         
         return None
@@ -0,0 +1,549 @@
+from ..VectorDBInterface import VectorDBInterface
+from ..VectorDBEnums import DistanceMethodEnums, VectorStorageEnums
+from usearch.index import Index, search as exact_search
+from typing import List
+import numpy as np
+import threading
+import asyncio
+import logging
+import shutil
+import fcntl
+import json
+import os
+
+# candidates fetched per result when a filter or stale deletes drop some of them
+FILTER_OVERSAMPLING = 4
+
+class HnswCollection:
+    """
+    State of one collection in this process: the usearch graph (a read-only
+    memory-mapped view until the first write) and the payloads read so far.
+    """
+
+    def __init__(self, meta: dict):
+        self.meta = meta
+        self.lock = threading.RLock()
+
+        self.index = None
+        self.is_view = False
+        self.index_version = None
+        # changes not saved to the graph file yet, and the keys they touched
+        self.dirty = False
+        self.pending_keys = set()
+        self.save_task = None
+
+        self.payloads = {}
+        self.records_offset = 0
+
+class HnswDBProvider(VectorDBInterface):
+    """
+    Embedded HNSW graph (usearch), no server involved.
+
+    Every collection is a directory with:
+        index.usearch   the graph and its vectors, memory-mapped read-only at startup,
+                        loaded in memory on the first write and saved in the background
+        records.jsonl   append-only {"id", "text", "metadata"} lines and {"deleted": [ids]} tombstones
+        meta.json       embedding size, storage, distance method and graph parameters
+
+    Record ids are the usearch keys, so they have to be integers (the chunk ids).
+    Writers serialize on an flock. A writer whose unsaved graph is behind a graph saved
+    by another process replays its pending keys on the saved one before writing or saving,
+    readers in other workers reopen the graph once its file is replaced.
+    The sidecar is written right away and the graph later, so after a crash the
+    sidecar may hold records missing from the saved graph: only the records found
+    in the graph are listed and counted, and they are pushed again with do_reset.
+    """
+
+    def __init__(self, db_client: str, default_vector_size: int = 786,
+                       distance_method: str = None, index_threshold: int = 100,
+                       storage: str = VectorStorageEnums.FLOAT.value,
+                       connectivity: int = 16, expansion_add: int = 128,
+                       save_delay_seconds: float = 5):
+
+        self.db_client = db_client
+        self.default_vector_size = default_vector_size
+        self.distance_method = distance_method or DistanceMethodEnums.COSINE.value
+        self.index_threshold = index_threshold
+        self.default_storage = storage
+        self.connectivity = connectivity
+        self.expansion_add = expansion_add
+        self.save_delay_seconds = save_delay_seconds
+
+        self.collections = {}
+        self.collections_lock = threading.Lock()
+
+        self.logger = logging.getLogger('uvicorn')
+
+    async def connect(self):
+        os.makedirs(self.db_client, exist_ok=True)
+
+    async def disconnect(self):
+        for collection_name, collection in list(self.collections.items()):
+            if collection.save_task is not None:
+                collection.save_task.cancel()
+            if collection.dirty:
+                await asyncio.to_thread(self.save_collection, collection_name)
+
+        with self.collections_lock:
+            self.collections = {}
+
+    def get_collection_path(self, collection_name: str, file_name: str = None) -> str:
+        collection_path = os.path.join(self.db_client, collection_name)
+        return os.path.join(collection_path, file_name) if file_name else collection_path
+
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        return os.path.exists(self.get_collection_path(collection_name, "meta.json"))
+
+    async def list_all_collections(self) -> List:
+        if not os.path.isdir(self.db_client):
+            return []
+
+        return sorted([
+            collection_name
+            for collection_name in os.listdir(self.db_client)
+            if os.path.exists(self.get_collection_path(collection_name, "meta.json"))
+        ])
+
+    async def get_collection_info(self, collection_name: str) -> dict:
+        if not await self.is_collection_existed(collection_name):
+            return None
+
+        collection = await asyncio.to_thread(self.load_collection, collection_name)
+        with collection.lock:
+            return {
+                **collection.meta,
+                "vectors_count": collection.index.size,
+                "record_count": len(self.get_indexed_record_ids(collection)),
+                "memory_mapped": collection.is_view,
+                "unsaved_changes": collection.dirty,
+            }
+
+    async def delete_collection(self, collection_name: str):
+        with self.collections_lock:
+            collection = self.collections.pop(collection_name, None)
+        if collection is not None and collection.save_task is not None:
+            collection.save_task.cancel()
+
+        if await self.is_collection_existed(collection_name):
+            self.logger.info(f"Deleting collection: {collection_name}")
+            await asyncio.to_thread(shutil.rmtree, self.get_collection_path(collection_name), True)
+            return True
+
+        return False
+
+    def get_dtype(self, storage: str = None) -> str:
+        storage = storage or self.default_storage or VectorStorageEnums.FLOAT.value
+
+        if storage == VectorStorageEnums.HALF.value:
+            return "f16"
+        if storage == VectorStorageEnums.SCALAR.value:
+            return "i8"
+        if storage == VectorStorageEnums.BINARY.value:
+            # hamming distance would not match the cosine / dot semantics
+            self.logger.warning("Binary storage is not supported by the hnsw provider, using scalar")
+            return "i8"
+
+        return "f32"
+
+    def get_metric(self, distance_method: str) -> str:
+        # usearch distances are 1 - cosine and 1 - dot product
+        return "ip" if distance_method == DistanceMethodEnums.DOT.value else "cos"
+
+    async def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False,
+                                storage: str = None):
+        if do_reset:
+            _ = await self.delete_collection(collection_name=collection_name)
+
+        if await self.is_collection_existed(collection_name):
+            return False
+
+        self.logger.info(f"Creating new hnsw collection: {collection_name}")
+        meta = {
+            "embedding_size": embedding_size,
+            "storage": storage or self.default_storage,
+            "dtype": self.get_dtype(storage),
+            "distance_method": self.distance_method,
+            "connectivity": self.connectivity,
+            "expansion_add": self.expansion_add,
+        }
+
+        os.makedirs(self.get_collection_path(collection_name), exist_ok=True)
+        open(self.get_collection_path(collection_name, "records.jsonl"), "wb").close()
+
+        # written last, it marks the collection as existing
+        with open(self.get_collection_path(collection_name, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+        return True
+
+    def get_index_version(self, collection_name: str):
+        try:
+            stat = os.stat(self.get_collection_path(collection_name, "index.usearch"))
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def new_index(self, meta: dict) -> Index:
+        return Index(ndim=meta["embedding_size"], metric=self.get_metric(meta["distance_method"]),
+                     dtype=meta["dtype"], connectivity=meta["connectivity"],
+                     expansion_add=meta["expansion_add"])
+
+    def open_index(self, collection_name: str, collection: HnswCollection):
+        index_version = self.get_index_version(collection_name)
+        if index_version is None:
+            collection.index, collection.is_view = self.new_index(collection.meta), False
+        else:
+            # mmap: startup does not read the graph, the workers share its pages
+            collection.index = Index.restore(self.get_collection_path(collection_name, "index.usearch"), view=True)
+            collection.is_view = True
+
+        collection.index_version = index_version
+
+    def load_collection(self, collection_name: str) -> HnswCollection:
+        """
+        Cached state of the collection, reopened when another process saved
+        the graph and updated with the sidecar lines appended since the last call.
+        """
+
+        with self.collections_lock:
+            collection = self.collections.get(collection_name)
+            if collection is None:
+                with open(self.get_collection_path(collection_name, "meta.json")) as f:
+                    collection = HnswCollection(meta=json.load(f))
+                self.collections[collection_name] = collection
+
+        with collection.lock:
+            if collection.index is None:
+                self.open_index(collection_name, collection)
+            elif collection.index_version != self.get_index_version(collection_name) and not collection.dirty:
+                # unsaved changes are merged with the other graph by the next write or save instead
+                self.open_index(collection_name, collection)
+
+            records_path = self.get_collection_path(collection_name, "records.jsonl")
+            if os.path.getsize(records_path) != collection.records_offset:
+                with open(records_path, "rb") as f:
+                    f.seek(collection.records_offset)
+                    new_lines = f.readlines()
+
+                for raw_line in new_lines:
+                    # a line that is still being written is read on the next call
+                    if not raw_line.endswith(b"\n"):
+                        break
+                    collection.records_offset += len(raw_line)
+
+                    line = json.loads(raw_line)
+                    if "deleted" in line:
+                        for record_id in line["deleted"]:
+                            collection.payloads.pop(record_id, None)
+                        continue
+
+                    collection.payloads[line["id"]] = (line["text"], line.get("metadata") or {})
+
+        return collection
+
+    def merge_saved_graph(self, collection_name: str, collection: HnswCollection):
+        """
+        Another process saved the graph since this one was read: load the saved graph
+        and replay the keys this process added or removed since its last save.
+        Called with the collection flock and lock held.
+        """
+
+        index_version = self.get_index_version(collection_name)
+        if index_version is None:
+            # the graph file is gone, nothing to merge with
+            collection.index_version = None
+            return
+
+        saved_index = Index.restore(self.get_collection_path(collection_name, "index.usearch"))
+
+        keys = np.asarray(sorted(collection.pending_keys), dtype=np.uint64)
+        if len(keys):
+            saved_keys = keys[saved_index.contains(keys)]
+            if len(saved_keys):
+                saved_index.remove(saved_keys)
+
+            live_keys = keys[collection.index.contains(keys)]
+            if len(live_keys):
+                saved_index.add(live_keys, np.vstack(collection.index.get(live_keys, dtype=np.float32)))
+
+        self.logger.info(f"Merged {len(keys)} pending records of {collection_name} "
+                         f"into the graph saved by another process")
+
+        collection.index, collection.is_view = saved_index, False
+        collection.index_version = index_version
+
+    def write_records(self, collection_name: str, lines: List[dict],
+                      record_ids: List[int], vectors: np.ndarray = None):
+        collection = self.load_collection(collection_name)
+
+        with open(self.get_collection_path(collection_name, ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            with collection.lock:
+                if collection.index_version != self.get_index_version(collection_name):
+                    self.merge_saved_graph(collection_name, collection)
+                elif collection.is_view:
+                    # a view is read-only, the first write loads the graph in memory
+                    collection.index = Index.restore(self.get_collection_path(collection_name, "index.usearch"))
+                    collection.is_view = False
+
+                keys = np.asarray(record_ids, dtype=np.uint64)
+                existing_keys = keys[collection.index.contains(keys)] if len(keys) else keys
+                if len(existing_keys):
+                    collection.index.remove(existing_keys)
+
+                if vectors is not None and len(vectors):
+                    collection.index.add(keys, vectors)
+
+                collection.pending_keys.update(int(key) for key in keys)
+                collection.dirty = True
+
+            with open(self.get_collection_path(collection_name, "records.jsonl"), "a", encoding="utf-8") as f:
+                f.write("".join([ json.dumps(line, ensure_ascii=False) + "\n" for line in lines ]))
+
+        return collection
+
+    def save_collection(self, collection_name: str):
+        collection = self.collections.get(collection_name)
+        if collection is None or not collection.dirty:
+            return False
+
+        index_path = self.get_collection_path(collection_name, "index.usearch")
+        with open(self.get_collection_path(collection_name, ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            with collection.lock:
+                if collection.index_version != self.get_index_version(collection_name):
+                    self.merge_saved_graph(collection_name, collection)
+
+                # replace, not overwrite: views of the other workers keep the old inode mapped
+                collection.index.save(index_path + ".tmp")
+                os.replace(index_path + ".tmp", index_path)
+
+                collection.index_version = self.get_index_version(collection_name)
+                collection.pending_keys.clear()
+                collection.dirty = False
+
+        self.logger.info(f"Saved hnsw graph of {collection_name}: {collection.index.size} vectors")
+        return True
+
+    def schedule_save(self, collection_name: str, collection: HnswCollection):
+        if collection.save_task is not None and not collection.save_task.done():
+            return
+
+        async def save_later():
+            # batches of an ingestion job land in the same save
+            await asyncio.sleep(self.save_delay_seconds)
+            try:
+                await asyncio.to_thread(self.save_collection, collection_name)
+            except Exception as e:
+                self.logger.error(f"Error while saving hnsw graph of {collection_name}: {e}")
+
+        collection.save_task = asyncio.create_task(save_later())
+
+    async def insert_one(self, collection_name: str, text: str, vector: list,
+                         metadata: dict = None,
+                         record_id: str = None):
+        return await self.insert_many(collection_name=collection_name, texts=[text], vectors=[vector],
+                                      metadata=[metadata], record_ids=[record_id])
+
+    async def insert_many(self, collection_name: str, texts: list,
+                          vectors: list, metadata: list = None,
+                          record_ids: list = None, batch_size: int = 10000,
+                          defer_index: bool = False):
+
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Can not insert new records to non-existed collection: {collection_name}")
+            return False
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        if record_ids is None:
+            record_ids = list(range(0, len(texts)))
+
+        try:
+            for i in range(0, len(texts), batch_size):
+                batch_record_ids = [ int(record_id) for record_id in record_ids[i:i+batch_size] ]
+                lines = [
+                    {"id": record_id, "text": text, "metadata": meta_item}
+                    for text, meta_item, record_id in zip(texts[i:i+batch_size],
+                                                          metadata[i:i+batch_size],
+                                                          batch_record_ids)
+                ]
+                collection = await asyncio.to_thread(self.write_records, collection_name, lines, batch_record_ids,
+                                                     np.asarray(vectors[i:i+batch_size], dtype=np.float32))
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
+
+        if texts:
+            self.schedule_save(collection_name, collection)
+
+        return True
+
+    async def build_vector_index(self, collection_name: str):
+        # the graph grows on every insert, only the pending save is left to do
+        if not await self.is_collection_existed(collection_name):
+            return False
+
+        return await asyncio.to_thread(self.save_collection, collection_name)
+
+    def get_indexed_record_ids(self, collection: HnswCollection) -> List[int]:
+        # payloads of records lost with an unsaved graph do not count
+        with collection.lock:
+            record_ids = list(collection.payloads.keys())
+            if not record_ids:
+                return []
+
+            keys = np.asarray(record_ids, dtype=np.uint64)
+            return [ int(key) for key in keys[collection.index.contains(keys)] ]
+
+    async def list_record_ids(self, collection_name: str) -> List:
+        collection = await asyncio.to_thread(self.load_collection, collection_name)
+        return await asyncio.to_thread(self.get_indexed_record_ids, collection)
+
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list):
+        if not record_ids:
+            return 0
+
+        record_ids = [ int(record_id) for record_id in record_ids ]
+        collection = await asyncio.to_thread(self.write_records, collection_name,
+                                             [{"deleted": record_ids}], record_ids)
+        self.schedule_save(collection_name, collection)
+
+        return len(record_ids)
+
+    def match_filter(self, metadata: dict, search_filter: dict = None) -> bool:
+        if not search_filter:
+            return True
+
+        if search_filter.get("asset_ids") and metadata.get("asset_id") not in search_filter["asset_ids"]:
+            return False
+
+        page = metadata.get("page")
+        page_end = metadata.get("page_end", page)
+        if search_filter.get("page_from") is not None and (page_end is None or page_end < search_filter["page_from"]):
+            return False
+
+        if search_filter.get("page_to") is not None and (page is None or page > search_filter["page_to"]):
+            return False
+
+        return True
+
+    def get_documents(self, collection: HnswCollection, keys, distances, limit: int,
+                      search_filter: dict = None, with_payload: bool = True):
+        documents = []
+        for key, distance in zip(keys, distances):
+            payload = collection.payloads.get(int(key))
+            if payload is None or not self.match_filter(payload[1], search_filter):
+                continue
+
+            documents.append(self.get_retrieved_document(text=payload[0], score=float(1 - distance),
+                                                         record_id=int(key), metadata=payload[1],
+                                                         with_payload=with_payload))
+            if len(documents) == limit:
+                break
+
+        return documents
+
+    def search_matching_records(self, collection: HnswCollection, query: np.ndarray, limit: int,
+                                search_filter: dict = None, with_payload: bool = True):
+        """
+        Exact search over the vectors of the records that match the filter,
+        for filters too selective for the graph walk.
+        """
+
+        keys = np.asarray([
+            key
+            for key, payload in collection.payloads.items()
+            if self.match_filter(payload[1], search_filter)
+        ], dtype=np.uint64)
+        if len(keys):
+            keys = keys[collection.index.contains(keys)]
+        if not len(keys):
+            return []
+
+        dataset = np.vstack(collection.index.get(keys, dtype=np.float32))
+        matches = exact_search(dataset, query, min(limit, len(keys)),
+                               self.get_metric(collection.meta["distance_method"]), exact=True)
+
+        # the match keys are rows of the dataset
+        return self.get_documents(collection, keys[matches.keys], matches.distances, limit,
+                                  with_payload=with_payload)
+
+    def search(self, collection_name: str, vectors: list, limit: int,
+               search_filter: dict = None, search_params: dict = None, with_payload: bool = True):
+        collection = self.load_collection(collection_name)
+        queries = np.asarray(vectors, dtype=np.float32)
+        search_params = search_params or {}
+
+        with collection.lock:
+            index = collection.index
+            if not index.size:
+                return [ [] for _ in vectors ]
+
+            expansion_search = index.expansion_search
+            if search_params.get("ef_search"):
+                index.expansion_search = max(int(search_params["ef_search"]), limit)
+            exact = bool(search_params.get("exact"))
+
+            try:
+                matches = index.search(queries, min(index.size, limit), exact=exact)
+                # a single query comes back as plain matches, not a batch
+                matches = [ matches ] if len(queries) == 1 else [ matches[i] for i in range(len(queries)) ]
+                results = [ self.get_documents(collection, query_matches.keys, query_matches.distances, limit,
+                                               search_filter, with_payload)
+                            for query_matches in matches ]
+
+                # no filtering inside the graph walk: widen the candidates of the short results
+                # a few times, then score the matching records only instead of the whole graph
+                max_count = min(index.size, limit * FILTER_OVERSAMPLING ** 2)
+                for i in range(len(queries)):
+                    count = min(index.size, limit)
+                    while len(results[i]) < limit and count < max_count:
+                        count = min(max_count, count * FILTER_OVERSAMPLING)
+                        query_matches = index.search(queries[i], count, exact=exact)
+                        results[i] = self.get_documents(collection, query_matches.keys, query_matches.distances,
+                                                        limit, search_filter, with_payload)
+
+                    if len(results[i]) < limit and count < index.size:
+                        results[i] = self.search_matching_records(collection, queries[i], limit,
+                                                                  search_filter, with_payload)
+            finally:
+                index.expansion_search = expansion_search
+
+        return results
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               search_filter: dict = None, search_params: dict = None,
+                               with_payload: bool = True):
+
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
+            return False
+
+        results = await asyncio.to_thread(self.search, collection_name, [vector], limit,
+                                          search_filter, search_params, with_payload)
+        return results[0]
+
+    async def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 5,
+                                search_filter: dict = None, search_params: dict = None,
+                                with_payload: bool = True):
+
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
+            return False
+
+        if not vectors:
+            return []
+
+        return await asyncio.to_thread(self.search, collection_name, vectors, limit,
+                                       search_filter, search_params, with_payload)
+
+    async def search_by_text(self, collection_name: str, text: str, limit: int = 5,
+                             search_filter: dict = None, with_payload: bool = True):
+        # no lexical index, hybrid searches fall back to the vector results
+        return []
@@ -0,0 +1,441 @@
+from ..VectorDBInterface import VectorDBInterface
+from ..VectorDBEnums import DistanceMethodEnums, VectorStorageEnums
+from typing import List
+import numpy as np
+import threading
+import asyncio
+import logging
+import shutil
+import struct
+import fcntl
+import json
+import os
+
+# fixed size .npy header, so the row count can be rewritten in place on every append
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+NPY_HEADER_SIZE = 128
+# rows scored per matrix product, bounds the memory of a search on large collections
+SEARCH_BLOCK_ROWS = 65536
+
+class NumpyCollection:
+    """
+    In-memory view of a collection: the memory-mapped vectors and the records
+    read so far from the sidecar, updated incrementally when the files grow.
+    """
+
+    def __init__(self, meta: dict, files_version: tuple = None):
+        self.meta = meta
+        # inode / mtime of meta.json and records.jsonl, they change when the collection is recreated
+        self.files_version = files_version
+
+        self.vectors = None
+        self.records_offset = 0
+
+        self.record_ids = []
+        self.texts = []
+        self.metadata = []
+        self.asset_ids = []
+        self.pages = []
+        self.pages_end = []
+        self.id_to_row = {}
+
+        self.valid_rows = np.zeros(0, dtype=bool)
+        self.asset_ids_array = np.zeros(0, dtype=np.int64)
+        self.pages_array = np.zeros(0, dtype=np.int64)
+        self.pages_end_array = np.zeros(0, dtype=np.int64)
+
+class NumpyDBProvider(VectorDBInterface):
+    """
+    Brute-force vector store for small and medium projects, no server involved.
+
+    Every collection is a directory with:
+        vectors.npy     append-only float32 (float16 for half storage) matrix, memory-mapped read-only,
+                        so all the workers share the same page cache
+        records.jsonl   append-only sidecar: {"row", "id", "text", "metadata"} per vector and
+                        {"deleted": [ids]} tombstones, the last row of an id wins
+        meta.json       embedding size, storage and distance method
+
+    Writers serialize on an flock, readers notice new data by the sidecar size.
+    """
+
+    def __init__(self, db_client: str, default_vector_size: int = 786,
+                       distance_method: str = None, index_threshold: int = 100,
+                       storage: str = VectorStorageEnums.FLOAT.value):
+
+        self.db_client = db_client
+        self.default_vector_size = default_vector_size
+        self.distance_method = distance_method or DistanceMethodEnums.COSINE.value
+        self.index_threshold = index_threshold
+        self.default_storage = storage
+
+        self.collections = {}
+        self.collections_lock = threading.Lock()
+
+        self.logger = logging.getLogger('uvicorn')
+
+    async def connect(self):
+        os.makedirs(self.db_client, exist_ok=True)
+
+    async def disconnect(self):
+        with self.collections_lock:
+            self.collections = {}
+
+    def get_collection_path(self, collection_name: str, file_name: str = None) -> str:
+        collection_path = os.path.join(self.db_client, collection_name)
+        return os.path.join(collection_path, file_name) if file_name else collection_path
+
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        return os.path.exists(self.get_collection_path(collection_name, "meta.json"))
+
+    async def list_all_collections(self) -> List:
+        if not os.path.isdir(self.db_client):
+            return []
+
+        return sorted([
+            collection_name
+            for collection_name in os.listdir(self.db_client)
+            if os.path.exists(self.get_collection_path(collection_name, "meta.json"))
+        ])
+
+    async def get_collection_info(self, collection_name: str) -> dict:
+        if not await self.is_collection_existed(collection_name):
+            return None
+
+        collection = await asyncio.to_thread(self.load_collection, collection_name)
+        return {
+            **collection.meta,
+            "rows_count": len(collection.valid_rows),
+            "record_count": int(collection.valid_rows.sum()),
+        }
+
+    async def delete_collection(self, collection_name: str):
+        with self.collections_lock:
+            self.collections.pop(collection_name, None)
+
+        if await self.is_collection_existed(collection_name):
+            self.logger.info(f"Deleting collection: {collection_name}")
+            await asyncio.to_thread(shutil.rmtree, self.get_collection_path(collection_name), True)
+            return True
+
+        return False
+
+    def resolve_storage(self, storage: str = None) -> str:
+        # float16 halves the file and the page cache, int8 / binary are not implemented
+        storage = storage or self.default_storage or VectorStorageEnums.FLOAT.value
+        if storage in [VectorStorageEnums.HALF.value, VectorStorageEnums.SCALAR.value]:
+            return VectorStorageEnums.HALF.value
+
+        if storage != VectorStorageEnums.FLOAT.value:
+            self.logger.warning(f"Vector storage {storage} is not supported by the numpy provider, using float")
+
+        return VectorStorageEnums.FLOAT.value
+
+    def get_dtype(self, meta: dict):
+        return np.dtype("<f2") if meta["storage"] == VectorStorageEnums.HALF.value else np.dtype("<f4")
+
+    def write_npy_header(self, f, dtype, rows: int, embedding_size: int):
+        header = repr({
+            "descr": dtype.str,
+            "fortran_order": False,
+            "shape": (rows, embedding_size),
+        })
+        header = header.ljust(NPY_HEADER_SIZE - len(NPY_MAGIC) - 2 - 1) + "\n"
+
+        f.seek(0)
+        f.write(NPY_MAGIC + struct.pack("<H", len(header)) + header.encode("latin1"))
+
+    def read_npy_rows(self, f) -> int:
+        f.seek(0)
+        _ = np.lib.format.read_magic(f)
+        shape, _, _ = np.lib.format.read_array_header_1_0(f)
+        return shape[0]
+
+    async def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False,
+                                storage: str = None):
+        if do_reset:
+            _ = await self.delete_collection(collection_name=collection_name)
+
+        if await self.is_collection_existed(collection_name):
+            return False
+
+        self.logger.info(f"Creating new numpy collection: {collection_name}")
+        meta = {
+            "embedding_size": embedding_size,
+            "storage": self.resolve_storage(storage),
+            "distance_method": self.distance_method,
+        }
+
+        os.makedirs(self.get_collection_path(collection_name), exist_ok=True)
+        with open(self.get_collection_path(collection_name, "vectors.npy"), "wb") as f:
+            self.write_npy_header(f, self.get_dtype(meta), rows=0, embedding_size=embedding_size)
+        open(self.get_collection_path(collection_name, "records.jsonl"), "wb").close()
+
+        # written last, it marks the collection as existing
+        with open(self.get_collection_path(collection_name, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+        return True
+
+    def prepare_vectors(self, vectors, meta: dict) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, meta["embedding_size"])
+
+        # cosine is the dot product of unit vectors, normalize once at insert time
+        if meta["distance_method"] == DistanceMethodEnums.COSINE.value:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1, norms)
+
+        return vectors
+
+    def append_records(self, collection_name: str, lines: List[dict], vectors: np.ndarray = None):
+        with open(self.get_collection_path(collection_name, "meta.json")) as f:
+            meta = json.load(f)
+
+        with open(self.get_collection_path(collection_name, ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            if vectors is not None and len(vectors):
+                dtype = self.get_dtype(meta)
+                with open(self.get_collection_path(collection_name, "vectors.npy"), "r+b") as f:
+                    first_row = self.read_npy_rows(f)
+
+                    # data first, then the row count: readers never see rows that are not written yet
+                    f.seek(NPY_HEADER_SIZE + first_row * meta["embedding_size"] * dtype.itemsize)
+                    f.write(np.ascontiguousarray(vectors, dtype=dtype).tobytes())
+                    f.flush()
+                    self.write_npy_header(f, dtype, rows=first_row + len(vectors),
+                                          embedding_size=meta["embedding_size"])
+
+                for row, line in enumerate(lines, start=first_row):
+                    line["row"] = row
+
+            with open(self.get_collection_path(collection_name, "records.jsonl"), "a", encoding="utf-8") as f:
+                f.write("".join([ json.dumps(line, ensure_ascii=False) + "\n" for line in lines ]))
+
+    def append_collection_row(self, collection: NumpyCollection, record_id, text: str, metadata: dict):
+        collection.record_ids.append(record_id)
+        collection.texts.append(text)
+        collection.metadata.append(metadata)
+        collection.asset_ids.append(metadata.get("asset_id", -1))
+        collection.pages.append(metadata.get("page", -1))
+        collection.pages_end.append(metadata.get("page_end", metadata.get("page", -1)))
+
+    def get_files_version(self, collection_name: str) -> tuple:
+        meta_stat = os.stat(self.get_collection_path(collection_name, "meta.json"))
+        records_stat = os.stat(self.get_collection_path(collection_name, "records.jsonl"))
+        return (meta_stat.st_ino, meta_stat.st_mtime_ns, records_stat.st_ino)
+
+    def load_collection(self, collection_name: str) -> NumpyCollection:
+        """
+        Cached view of the collection, only the sidecar lines appended since
+        the last call are parsed. A collection reset by another worker is read again.
+        """
+
+        with self.collections_lock:
+            records_path = self.get_collection_path(collection_name, "records.jsonl")
+            files_version = self.get_files_version(collection_name)
+            records_size = os.path.getsize(records_path)
+
+            collection = self.collections.get(collection_name)
+            if collection is not None and (collection.files_version != files_version
+                                           or records_size < collection.records_offset):
+                self.logger.info(f"Collection {collection_name} was recreated, reloading it")
+                collection = None
+
+            if collection is None:
+                with open(self.get_collection_path(collection_name, "meta.json")) as f:
+                    collection = NumpyCollection(meta=json.load(f), files_version=files_version)
+                self.collections[collection_name] = collection
+
+            if records_size == collection.records_offset and collection.vectors is not None:
+                return collection
+
+            with open(records_path, "rb") as f:
+                f.seek(collection.records_offset)
+                new_lines = f.readlines()
+
+            for raw_line in new_lines:
+                # a line that is still being written is read on the next call
+                if not raw_line.endswith(b"\n"):
+                    break
+                collection.records_offset += len(raw_line)
+
+                line = json.loads(raw_line)
+                if "deleted" in line:
+                    for record_id in line["deleted"]:
+                        collection.id_to_row.pop(record_id, None)
+                    continue
+
+                # rows of an append interrupted before its sidecar lines stay unused
+                while len(collection.record_ids) < line["row"]:
+                    self.append_collection_row(collection, record_id=None, text="", metadata={})
+
+                self.append_collection_row(collection, record_id=line["id"], text=line["text"],
+                                           metadata=line.get("metadata") or {})
+                collection.id_to_row[line["id"]] = line["row"]
+
+            collection.vectors = np.load(self.get_collection_path(collection_name, "vectors.npy"), mmap_mode="r")
+
+            rows_count = min(len(collection.vectors), len(collection.record_ids))
+            valid_rows = np.zeros(rows_count, dtype=bool)
+            live_rows = [ row for row in collection.id_to_row.values() if row < rows_count ]
+            valid_rows[live_rows] = True
+
+            collection.valid_rows = valid_rows
+            collection.asset_ids_array = np.asarray(collection.asset_ids[:rows_count], dtype=np.int64)
+            collection.pages_array = np.asarray(collection.pages[:rows_count], dtype=np.int64)
+            collection.pages_end_array = np.asarray(collection.pages_end[:rows_count], dtype=np.int64)
+
+            return collection
+
+    async def insert_one(self, collection_name: str, text: str, vector: list,
+                         metadata: dict = None,
+                         record_id: str = None):
+        return await self.insert_many(collection_name=collection_name, texts=[text], vectors=[vector],
+                                      metadata=[metadata], record_ids=[record_id])
+
+    async def insert_many(self, collection_name: str, texts: list,
+                          vectors: list, metadata: list = None,
+                          record_ids: list = None, batch_size: int = 50000,
+                          defer_index: bool = False):
+
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Can not insert new records to non-existed collection: {collection_name}")
+            return False
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        if record_ids is None:
+            record_ids = list(range(0, len(texts)))
+
+        with open(self.get_collection_path(collection_name, "meta.json")) as f:
+            meta = json.load(f)
+
+        try:
+            for i in range(0, len(texts), batch_size):
+                lines = [
+                    {"id": record_id, "text": text, "metadata": meta_item}
+                    for text, meta_item, record_id in zip(texts[i:i+batch_size],
+                                                          metadata[i:i+batch_size],
+                                                          record_ids[i:i+batch_size])
+                ]
+                await asyncio.to_thread(self.append_records, collection_name, lines,
+                                        self.prepare_vectors(vectors[i:i+batch_size], meta))
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
+
+        return True
+
+    async def build_vector_index(self, collection_name: str):
+        # brute-force search, there is no index to build
+        return False
+
+    async def list_record_ids(self, collection_name: str) -> List:
+        collection = await asyncio.to_thread(self.load_collection, collection_name)
+        return list(collection.id_to_row.keys())
+
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list):
+        if not record_ids:
+            return 0
+
+        await asyncio.to_thread(self.append_records, collection_name, [{"deleted": list(record_ids)}])
+        return len(record_ids)
+
+    def get_rows_mask(self, collection: NumpyCollection, search_filter: dict = None) -> np.ndarray:
+        rows_mask = collection.valid_rows.copy()
+
+        search_filter = search_filter or {}
+        if search_filter.get("asset_ids"):
+            rows_mask &= np.isin(collection.asset_ids_array, [ int(asset_id) for asset_id in search_filter["asset_ids"] ])
+
+        if search_filter.get("page_from") is not None:
+            rows_mask &= collection.pages_end_array >= int(search_filter["page_from"])
+
+        if search_filter.get("page_to") is not None:
+            rows_mask &= (collection.pages_array <= int(search_filter["page_to"])) & (collection.pages_array >= 0)
+
+        return rows_mask
+
+    def top_k(self, collection: NumpyCollection, queries: np.ndarray, limit: int, rows_mask: np.ndarray,
+              with_payload: bool = True):
+        """
+        Exact top-k of every query: block-wise matrix products over the memory-mapped
+        vectors, argpartition keeps `limit` candidates per block and query.
+        """
+
+        queries_count = len(queries)
+        best_scores = np.empty((queries_count, 0), dtype=np.float32)
+        best_rows = np.empty((queries_count, 0), dtype=np.int64)
+
+        for start in range(0, len(rows_mask), SEARCH_BLOCK_ROWS):
+            end = min(start + SEARCH_BLOCK_ROWS, len(rows_mask))
+            block_mask = rows_mask[start:end]
+            if not block_mask.any():
+                continue
+
+            scores = queries @ np.asarray(collection.vectors[start:end], dtype=np.float32).T
+            scores[:, ~block_mask] = -np.inf
+
+            k = min(limit, end - start)
+            block_rows = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, block_rows, axis=1)], axis=1)
+            best_rows = np.concatenate([best_rows, block_rows + start], axis=1)
+
+        order = np.argsort(-best_scores, axis=1)[:, :limit]
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+
+        return [
+            [
+                self.get_retrieved_document(text=collection.texts[row], score=float(score),
+                                            record_id=collection.record_ids[row],
+                                            metadata=collection.metadata[row], with_payload=with_payload)
+                for score, row in zip(query_scores, query_rows)
+                if score != -np.inf
+            ]
+            for query_scores, query_rows in zip(best_scores, best_rows)
+        ]
+
+    def search(self, collection_name: str, vectors: list, limit: int, search_filter: dict = None,
+               with_payload: bool = True):
+        collection = self.load_collection(collection_name)
+        rows_mask = self.get_rows_mask(collection, search_filter=search_filter)
+
+        queries = self.prepare_vectors(vectors, collection.meta)
+        return self.top_k(collection, queries, limit=limit, rows_mask=rows_mask, with_payload=with_payload)
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               search_filter: dict = None, search_params: dict = None,
+                               with_payload: bool = True):
+
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
+            return False
+
+        # always exact, ef_search / probes do not apply
+        results = await asyncio.to_thread(self.search, collection_name, [vector], limit,
+                                          search_filter, with_payload)
+        return results[0]
+
+    async def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 5,
+                                search_filter: dict = None, search_params: dict = None,
+                                with_payload: bool = True):
+
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
+            return False
+
+        if not vectors:
+            return []
+
+        return await asyncio.to_thread(self.search, collection_name, vectors, limit,
+                                       search_filter, with_payload)
+
+    async def search_by_text(self, collection_name: str, text: str, limit: int = 5,
+                             search_filter: dict = None, with_payload: bool = True):
+        # no lexical index, hybrid searches fall back to the vector results
+        return []
@@ -1,21 +1,66 @@
 from ..VectorDBInterface import VectorDBInterface
 from ..VectorDBEnums import (DistanceMethodEnums, PgVectorTableSchemeEnums, 
-                             PgVectorDistanceMethodEnums, PgVectorIndexTypeEnums)
+                             PgVectorDistanceMethodEnums, PgVectorIndexTypeEnums,
+                             VectorStorageEnums)
 import logging
 from typing import List
 from models.db_schemes import RetrievedDocument
 from sqlalchemy.sql import text as sql_text
+import numpy as np
+import struct
+import math
+import time
 import json
 
+# COPY ... (FORMAT BINARY) framing, see https://www.postgresql.org/docs/current/sql-copy.html
+COPY_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+COPY_BINARY_TRAILER = struct.pack(">h", -1)
+COPY_FIELD_COUNT = struct.pack(">h", 4)
+COPY_FIELD_LENGTH = struct.Struct(">i")
+COPY_INT_FIELD = struct.Struct(">ii")
+COPY_VECTOR_HEADER = struct.Struct(">iHH")
+JSONB_BINARY_VERSION = b"\x01"
+# pgvector default and upper bound of hnsw.ef_search
+HNSW_DEFAULT_EF_SEARCH = 40
+HNSW_MAX_EF_SEARCH = 1000
+
 class PGVectorProvider(VectorDBInterface):
 
+    # chunk_id REFERENCES chunks(chunk_id)
+    has_chunk_references = True
+
     def __init__(self, db_client, default_vector_size: int = 786,
-                       distance_method: str = None, index_threshold: int=100):
+                       distance_method: str = None, index_threshold: int=100,
+                       index_type: str = PgVectorIndexTypeEnums.HNSW.value,
+                       hnsw_m: int = 16, hnsw_ef_construction: int = 64,
+                       ivfflat_lists: int = None, maintenance_work_mem: str = None,
+                       storage: str = VectorStorageEnums.FLOAT.value, oversampling: float = 2.0,
+                       text_search_config: str = "simple", iterative_scan: str = "relaxed_order"):
         
         self.db_client = db_client
         self.default_vector_size = default_vector_size
         
         self.index_threshold = index_threshold
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.ivfflat_lists = ivfflat_lists
+        self.maintenance_work_mem = maintenance_work_mem
+
+        self.default_storage = storage
+        self.oversampling = oversampling
+        # table oid -> {"storage": ..., "embedding_size": ...}, read from the table comment,
+        # a collection recreated by another worker with another storage has a new oid
+        self.collections_storage = {}
+        # oids of the tables known to have the current indexes and columns, another worker
+        # dropping and recreating a collection gives it a new oid
+        self.collections_migrated = set()
+        # postgres text search configuration of the lexical index, "simple" does no stemming
+        self.text_search_config = text_search_config
+        # off, strict_order or relaxed_order, applied to filtered searches
+        self.iterative_scan = iterative_scan if iterative_scan != "off" else None
+        # installed pgvector version, read at connect
+        self.pgvector_version = None
 
         if distance_method == DistanceMethodEnums.COSINE.value:
             distance_method = PgVectorDistanceMethodEnums.COSINE.value
@@ -27,6 +72,10 @@ class PGVectorProvider(VectorDBInterface):
 
         self.logger = logging.getLogger("uvicorn")
         self.default_index_name = lambda collection_name: f"{collection_name}_vector_idx"
+        self.chunk_id_index_name = lambda collection_name: f"{collection_name}_chunk_id_idx"
+        self.text_search_index_name = lambda collection_name: f"{collection_name}_text_search_idx"
+        self.page_index_name = lambda collection_name: f"{collection_name}_page_idx"
+        self.page_end_index_name = lambda collection_name: f"{collection_name}_page_end_idx"
 
 
     async def connect(self):
@@ -35,8 +84,24 @@ class PGVectorProvider(VectorDBInterface):
                 await session.execute(sql_text(
                     "CREATE EXTENSION IF NOT EXISTS vector"
                 ))
+                result = await session.execute(sql_text(
+                    "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+                ))
+                self.pgvector_version = self.parse_version(result.scalar_one_or_none())
                 await session.commit()
 
+        if self.iterative_scan and not self.has_iterative_scan():
+            self.logger.warning(f"pgvector {self.pgvector_version} has no iterative index scans, "
+                                f"filtered searches may return fewer results")
+
+    def parse_version(self, version: str) -> tuple:
+        # "0.8.0" -> (0, 8, 0)
+        return tuple(int(part) for part in (version or "0").split(".") if part.isdigit())
+
+    def has_iterative_scan(self) -> bool:
+        # hnsw.iterative_scan / ivfflat.iterative_scan appeared in pgvector 0.8.0
+        return self.pgvector_version is not None and self.pgvector_version >= (0, 8)
+
     async def disconnect(self):
         pass
 
@@ -99,36 +164,159 @@ class PGVectorProvider(VectorDBInterface):
                 delete_sql = sql_text(f'DROP TABLE IF EXISTS {collection_name}')
                 await session.execute(delete_sql)
                 await session.commit()
-        
+
         return True
 
+    def resolve_storage(self, storage: str = None) -> str:
+        """
+        float: vector(N). half: halfvec(N), half the size of the table and its index.
+        binary: vector(N) kept for re-scoring, indexed on binary_quantize(vector)::bit(N).
+        pgvector has no int8 type, so scalar falls back to half.
+        """
+
+        storage = storage or self.default_storage or VectorStorageEnums.FLOAT.value
+        if storage == VectorStorageEnums.SCALAR.value:
+            return VectorStorageEnums.HALF.value
+
+        if storage not in [ s.value for s in VectorStorageEnums ]:
+            self.logger.warning(f"Unknown vector storage: {storage}, falling back to float")
+            return VectorStorageEnums.FLOAT.value
+
+        return storage
+
+    async def get_collection_oid(self, collection_name: str, session=None):
+        # None when the table does not exist
+        oid_sql = sql_text("SELECT CAST(to_regclass(:collection_name) AS oid)")
+        if session is not None:
+            result = await session.execute(oid_sql, {"collection_name": collection_name})
+            return result.scalar_one_or_none()
+
+        async with self.db_client() as session:
+            result = await session.execute(oid_sql, {"collection_name": collection_name})
+            return result.scalar_one_or_none()
+
+    async def get_collection_storage(self, collection_name: str) -> dict:
+        # one lookup per index or search run, the comment is only parsed for an unknown table
+        async with self.db_client() as session:
+            comment_sql = sql_text("SELECT CAST(to_regclass(:collection_name) AS oid), "
+                                   "obj_description(to_regclass(:collection_name), 'pg_class')")
+            result = await session.execute(comment_sql, {"collection_name": collection_name})
+            collection_oid, comment = result.one_or_none() or (None, None)
+
+        if collection_oid is not None and collection_oid in self.collections_storage:
+            return self.collections_storage[collection_oid]
+
+        # collections created before the storage option hold plain float vectors
+        collection_storage = {"storage": VectorStorageEnums.FLOAT.value, "embedding_size": None}
+        try:
+            collection_storage.update(json.loads(comment) if comment else {})
+        except ValueError:
+            pass
+
+        if collection_oid is not None:
+            self.collections_storage[collection_oid] = collection_storage
+        return collection_storage
+
+    def get_text_search_column_type(self) -> str:
+        text_search_config = self.text_search_config.replace("'", "''")
+        return (f"tsvector GENERATED ALWAYS AS "
+                f"(to_tsvector('{text_search_config}', coalesce({PgVectorTableSchemeEnums.TEXT.value}, ''))) STORED")
+
     async def create_collection(self, collection_name: str,
                                       embedding_size: int,
-                                      do_reset: bool = False):
+                                      do_reset: bool = False,
+                                      storage: str = None):
         
         if do_reset:
             _ = await self.delete_collection(collection_name=collection_name)
 
-        is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
-        if not is_collection_existed:
-            self.logger.info(f"Creating collection: {collection_name}")
+        # delta indexing replaces and removes vectors by chunk_id
+        chunk_id_idx_sql = sql_text(
+            f'CREATE INDEX IF NOT EXISTS {self.chunk_id_index_name(collection_name)} '
+            f'ON {collection_name} ({PgVectorTableSchemeEnums.CHUNK_ID.value})'
+        )
+
+        # lexical index of the hybrid search
+        text_search_column_sql = sql_text(
+            f'ALTER TABLE {collection_name} ADD COLUMN IF NOT EXISTS '
+            f'{PgVectorTableSchemeEnums.TEXT_SEARCH.value} {self.get_text_search_column_type()}'
+        )
+        text_search_idx_sql = sql_text(
+            f'CREATE INDEX IF NOT EXISTS {self.text_search_index_name(collection_name)} '
+            f'ON {collection_name} USING gin ({PgVectorTableSchemeEnums.TEXT_SEARCH.value})'
+        )
+
+        # page range filters, on the same expressions as get_filter_sql
+        page_idx_sql = sql_text(
+            f'CREATE INDEX IF NOT EXISTS {self.page_index_name(collection_name)} '
+            f'ON {collection_name} (({self.get_page_expression()}))'
+        )
+        page_end_idx_sql = sql_text(
+            f'CREATE INDEX IF NOT EXISTS {self.page_end_index_name(collection_name)} '
+            f'ON {collection_name} (({self.get_page_end_expression()}))'
+        )
+
+        # called for every page of a push: the existence check always runs,
+        # the migration below once per table
+        collection_oid = await self.get_collection_oid(collection_name=collection_name)
+        if collection_oid is not None and collection_oid in self.collections_migrated:
+            return False
+
+        if collection_oid is None:
+            storage = self.resolve_storage(storage)
+            vector_type = "halfvec" if storage == VectorStorageEnums.HALF.value else "vector"
+            collection_storage = {"storage": storage, "embedding_size": embedding_size}
+
+            self.logger.info(f"Creating collection: {collection_name} ({storage})")
             async with self.db_client() as session:
                 async with session.begin():
                     create_sql = sql_text(
                         f'CREATE TABLE {collection_name} ('
                             f'{PgVectorTableSchemeEnums.ID.value} bigserial PRIMARY KEY,'
                             f'{PgVectorTableSchemeEnums.TEXT.value} text, '
-                            f'{PgVectorTableSchemeEnums.VECTOR.value} vector({embedding_size}), '
+                            f'{PgVectorTableSchemeEnums.VECTOR.value} {vector_type}({embedding_size}), '
                             f'{PgVectorTableSchemeEnums.METADATA.value} jsonb DEFAULT \'{{}}\', '
                             f'{PgVectorTableSchemeEnums.CHUNK_ID.value} integer, '
+                            f'{PgVectorTableSchemeEnums.TEXT_SEARCH.value} {self.get_text_search_column_type()}, '
                             f'FOREIGN KEY ({PgVectorTableSchemeEnums.CHUNK_ID.value}) REFERENCES chunks(chunk_id)'
                         ')'
                     )
                     await session.execute(create_sql)
+                    await session.execute(chunk_id_idx_sql)
+                    await session.execute(text_search_idx_sql)
+                    await session.execute(page_idx_sql)
+                    await session.execute(page_end_idx_sql)
+
+                    # the storage layout travels with the table
+                    comment = json.dumps(collection_storage).replace("'", "''")
+                    await session.execute(sql_text(f"COMMENT ON TABLE {collection_name} IS '{comment}'"))
+                    collection_oid = await self.get_collection_oid(collection_name=collection_name, session=session)
                     await session.commit()
+
+            self.collections_storage[collection_oid] = collection_storage
+            self.collections_migrated.add(collection_oid)
             
             return True
 
+        # collections created before delta indexing / hybrid search / page filters miss these indexes
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(chunk_id_idx_sql)
+                await session.execute(page_idx_sql)
+                await session.execute(page_end_idx_sql)
+
+                column_sql = sql_text('SELECT 1 FROM information_schema.columns'
+                                      ' WHERE table_name = :collection_name AND column_name = :column_name')
+                result = await session.execute(column_sql, {"collection_name": collection_name,
+                                                            "column_name": PgVectorTableSchemeEnums.TEXT_SEARCH.value})
+                if result.scalar_one_or_none() is None:
+                    # rewrites the table once to fill the generated column
+                    self.logger.info(f"Adding the text search column to collection: {collection_name}")
+                    await session.execute(text_search_column_sql)
+                    await session.execute(text_search_idx_sql)
+
+        self.collections_migrated.add(collection_oid)
+
         return False
     
     async def is_index_existed(self, collection_name: str) -> bool:
@@ -144,36 +332,119 @@ class PGVectorProvider(VectorDBInterface):
                 results = await session.execute(check_sql, {"index_name": index_name, "collection_name": collection_name})
                 
                 return bool(results.scalar_one_or_none())
-            
+
+    async def is_index_valid(self, collection_name: str) -> bool:
+        index_name = self.default_index_name(collection_name)
+        async with self.db_client() as session:
+            check_sql = sql_text("""
+                                SELECT i.indisvalid
+                                FROM pg_index i
+                                JOIN pg_class c ON c.oid = i.indexrelid
+                                WHERE c.relname = :index_name
+                                """)
+            results = await session.execute(check_sql, {"index_name": index_name})
+
+            return bool(results.scalar_one_or_none())
+
+    def get_index_options(self, index_type: str, records_count: int) -> str:
+        if index_type == PgVectorIndexTypeEnums.HNSW.value:
+            return f"m = {int(self.hnsw_m)}, ef_construction = {int(self.hnsw_ef_construction)}"
+
+        if index_type == PgVectorIndexTypeEnums.IVFFLAT.value:
+            lists = self.ivfflat_lists
+            if not lists:
+                # pgvector's rule of thumb: rows / 1000 up to 1M rows, sqrt(rows) above
+                lists = records_count // 1000 if records_count <= 1000000 else int(math.sqrt(records_count))
+            return f"lists = {max(1, int(lists))}"
+
+        return None
+
+    def get_index_expression(self, collection_storage: dict) -> str:
+        vector_column = PgVectorTableSchemeEnums.VECTOR.value
+
+        if collection_storage["storage"] == VectorStorageEnums.BINARY.value:
+            return f'({self.get_binary_expression(vector_column, collection_storage)}) bit_hamming_ops'
+
+        if collection_storage["storage"] == VectorStorageEnums.HALF.value:
+            return f'{vector_column} {self.distance_method.replace("vector_", "halfvec_", 1)}'
+
+        return f'{vector_column} {self.distance_method}'
+
+    def get_binary_expression(self, operand: str, collection_storage: dict) -> str:
+        return f'binary_quantize({operand})::bit({int(collection_storage["embedding_size"])})'
+
     async def create_vector_index(self, collection_name: str,
-                                        index_type: str = PgVectorIndexTypeEnums.HNSW.value):
+                                        index_type: str = None,
+                                        concurrently: bool = False):
+        """
+        Builds the vector index once the collection holds `index_threshold` records.
+        Returns the build report, or False when no index was built.
+        """
+
+        index_type = index_type or self.index_type
+        index_name = self.default_index_name(collection_name)
+
         is_index_existed = await self.is_index_existed(collection_name=collection_name)
         if is_index_existed:
+            if await self.is_index_valid(collection_name=collection_name):
+                return False
+
+            # a failed CREATE INDEX CONCURRENTLY leaves an invalid index behind
+            self.logger.warning(f"Dropping invalid vector index for collection: {collection_name}")
+            async with self.db_client() as session:
+                connection = await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+                await connection.execute(sql_text(f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}'))
+
+        async with self.db_client() as session:
+            count_sql = sql_text(f'SELECT COUNT(*) FROM {collection_name}')
+            result = await session.execute(count_sql)
+            records_count = result.scalar_one()
+
+        if records_count < self.index_threshold:
             return False
-        
+
+        collection_storage = await self.get_collection_storage(collection_name=collection_name)
+        index_options = self.get_index_options(index_type=index_type, records_count=records_count)
+        create_idx_sql = sql_text(
+                                    f'CREATE INDEX {"CONCURRENTLY " if concurrently else ""}{index_name} ON {collection_name} '
+                                    f'USING {index_type} ({self.get_index_expression(collection_storage)})'
+                                    + (f' WITH ({index_options})' if index_options else '')
+                                  )
+
+        self.logger.info(f"START: Creating vector index for collection: {collection_name}")
+
+        # CREATE INDEX CONCURRENTLY can not run inside a transaction block
         async with self.db_client() as session:
-            async with session.begin():
-                count_sql = sql_text(f'SELECT COUNT(*) FROM {collection_name}')
-                result = await session.execute(count_sql)
-                records_count = result.scalar_one()
+            connection = await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
 
-                if records_count < self.index_threshold:
-                    return False
-                
-                self.logger.info(f"START: Creating vector index for collection: {collection_name}")
-                
-                index_name = self.default_index_name(collection_name)
-                create_idx_sql = sql_text(
-                                            f'CREATE INDEX {index_name} ON {collection_name} '
-                                            f'USING {index_type} ({PgVectorTableSchemeEnums.VECTOR.value} {self.distance_method})'
-                                          )
+            if self.maintenance_work_mem:
+                await connection.execute(sql_text("SELECT set_config('maintenance_work_mem', :value, false)"),
+                                         {"value": self.maintenance_work_mem})
 
-                await session.execute(create_idx_sql)
+            started_at = time.perf_counter()
+            try:
+                await connection.execute(create_idx_sql)
+            finally:
+                if self.maintenance_work_mem:
+                    await connection.execute(sql_text("RESET maintenance_work_mem"))
 
-                self.logger.info(f"END: Created vector index for collection: {collection_name}")
+            build_seconds = time.perf_counter() - started_at
+
+        self.logger.info(f"END: Created vector index for collection: {collection_name} in {build_seconds:.2f}s")
+
+        return {
+            "index_name": index_name,
+            "index_type": index_type,
+            "index_options": index_options,
+            "records_count": records_count,
+            "build_seconds": round(build_seconds, 3),
+        }
+
+    async def build_vector_index(self, collection_name: str):
+        return await self.create_vector_index(collection_name=collection_name, concurrently=True)
 
     async def reset_vector_index(self, collection_name: str, 
-                                       index_type: str = PgVectorIndexTypeEnums.HNSW.value) -> bool:
+                                       index_type: str = None) -> bool:
         
         index_name = self.default_index_name(collection_name)
         async with self.db_client() as session:
@@ -218,9 +489,42 @@ class PGVectorProvider(VectorDBInterface):
         return True
     
 
+    def encode_copy_records(self, texts: list, vectors: list, metadata: list, record_ids: list,
+                            storage: str = VectorStorageEnums.FLOAT.value) -> bytes:
+        """
+        Encodes the rows in COPY binary format. Vectors are written in pgvector's binary
+        layout (dim, unused, big-endian float32 values) straight from one NumPy array.
+        halfvec columns take the same layout with float16 values.
+        """
+
+        vectors = np.asarray(vectors, dtype=">f2" if storage == VectorStorageEnums.HALF.value else ">f4")
+        if vectors.ndim != 2:
+            raise ValueError("Vectors must be a 2D array")
+
+        vector_header = COPY_VECTOR_HEADER.pack(4 + vectors.itemsize * vectors.shape[1], vectors.shape[1], 0)
+
+        parts = [COPY_BINARY_HEADER]
+        for _text, _vector, _metadata, _record_id in zip(texts, vectors, metadata, record_ids):
+            text_data = _text.encode("utf-8")
+            metadata_data = JSONB_BINARY_VERSION + (
+                json.dumps(_metadata, ensure_ascii=False) if _metadata is not None else "{}"
+            ).encode("utf-8")
+
+            parts.extend([
+                COPY_FIELD_COUNT,
+                COPY_FIELD_LENGTH.pack(len(text_data)), text_data,
+                vector_header, _vector.tobytes(),
+                COPY_FIELD_LENGTH.pack(len(metadata_data)), metadata_data,
+                COPY_INT_FIELD.pack(4, _record_id),
+            ])
+
+        parts.append(COPY_BINARY_TRAILER)
+        return b"".join(parts)
+
     async def insert_many(self, collection_name: str, texts: list,
                          vectors: list, metadata: list = None,
-                         record_ids: list = None, batch_size: int = 50):
+                         record_ids: list = None, batch_size: int = 5000,
+                         defer_index: bool = False):
         
         is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
         if not is_collection_existed:
@@ -234,63 +538,351 @@ class PGVectorProvider(VectorDBInterface):
         if not metadata or len(metadata) == 0:
             metadata = [None] * len(texts)
         
+        columns = [
+            PgVectorTableSchemeEnums.TEXT.value,
+            PgVectorTableSchemeEnums.VECTOR.value,
+            PgVectorTableSchemeEnums.METADATA.value,
+            PgVectorTableSchemeEnums.CHUNK_ID.value,
+        ]
+
+        collection_storage = await self.get_collection_storage(collection_name=collection_name)
+
         async with self.db_client() as session:
             async with session.begin():
+                connection = await session.connection()
+                raw_connection = await connection.get_raw_connection()
+                asyncpg_connection = raw_connection.driver_connection
+
                 for i in range(0, len(texts), batch_size):
-                    batch_texts = texts[i:i+batch_size]
-                    batch_vectors = vectors[i:i + batch_size]
-                    batch_metadata = metadata[i:i + batch_size]
-                    batch_record_ids = record_ids[i:i + batch_size]
-
-                    values = []
-
-                    for _text, _vector, _metadata, _record_id in zip(batch_texts, batch_vectors, batch_metadata, batch_record_ids):
-                        
-                        metadata_json = json.dumps(_metadata, ensure_ascii=False) if _metadata is not None else "{}"
-                        values.append({
-                            'text': _text,
-                            'vector': "[" + ",".join([ str(v) for v in _vector ]) + "]",
-                            'metadata': metadata_json,
-                            'chunk_id': _record_id
-                        })
-                    
-                    batch_insert_sql = sql_text(f'INSERT INTO {collection_name} '
-                                    f'({PgVectorTableSchemeEnums.TEXT.value}, '
-                                    f'{PgVectorTableSchemeEnums.VECTOR.value}, '
-                                    f'{PgVectorTableSchemeEnums.METADATA.value}, '
-                                    f'{PgVectorTableSchemeEnums.CHUNK_ID.value}) '
-                                    f'VALUES (:text, :vector, :metadata, :chunk_id)')
-                    
-                    await session.execute(batch_insert_sql, values)
-
-        await self.create_vector_index(collection_name=collection_name)
+                    copy_data = self.encode_copy_records(
+                        texts=texts[i:i+batch_size],
+                        vectors=vectors[i:i+batch_size],
+                        metadata=metadata[i:i+batch_size],
+                        record_ids=record_ids[i:i+batch_size],
+                        storage=collection_storage["storage"],
+                    )
+
+                    await asyncpg_connection.copy_to_table(
+                        collection_name,
+                        source=copy_data,
+                        columns=columns,
+                        format="binary",
+                    )
+
+        # bulk loads build the index once at the end, see build_vector_index
+        if not defer_index:
+            await self.create_vector_index(collection_name=collection_name)
 
         return True
     
-    async def search_by_vector(self, collection_name: str, vector: list, limit: int):
+    async def list_record_ids(self, collection_name: str) -> List:
+        async with self.db_client() as session:
+            list_sql = sql_text(f'SELECT {PgVectorTableSchemeEnums.CHUNK_ID.value} FROM {collection_name}')
+            result = await session.execute(list_sql)
+            record_ids = result.scalars().all()
+
+        return record_ids
+
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list):
+        if not record_ids:
+            return 0
+
+        async with self.db_client() as session:
+            async with session.begin():
+                delete_sql = sql_text(f'DELETE FROM {collection_name} '
+                                      f'WHERE {PgVectorTableSchemeEnums.CHUNK_ID.value} = ANY(:record_ids)')
+                result = await session.execute(delete_sql, {"record_ids": list(record_ids)})
+
+        return result.rowcount
+    
+    def get_page_expression(self) -> str:
+        return f"CAST({PgVectorTableSchemeEnums.METADATA.value}->>'page' AS integer)"
+
+    def get_page_end_expression(self) -> str:
+        # records indexed before page_end was stored span a single page
+        return (f"CAST(coalesce({PgVectorTableSchemeEnums.METADATA.value}->>'page_end', "
+                f"{PgVectorTableSchemeEnums.METADATA.value}->>'page') AS integer)")
+
+    def get_filter_sql(self, search_filter: dict = None):
+        """
+        WHERE clause and bind parameters of a search filter:
+        asset_ids are matched on the indexed chunks.chunk_asset_id column,
+        page_from / page_to keep the records whose page span overlaps the range.
+        """
+
+        search_filter = search_filter or {}
+        conditions, params = [], {}
+
+        if search_filter.get("asset_ids"):
+            conditions.append(f'{PgVectorTableSchemeEnums.CHUNK_ID.value} IN ('
+                              'SELECT chunk_id FROM chunks WHERE chunk_asset_id = ANY(:filter_asset_ids))')
+            params["filter_asset_ids"] = [ int(asset_id) for asset_id in search_filter["asset_ids"] ]
+
+        if search_filter.get("page_from") is not None:
+            conditions.append(f'{self.get_page_end_expression()} >= :filter_page_from')
+            params["filter_page_from"] = int(search_filter["page_from"])
+
+        if search_filter.get("page_to") is not None:
+            conditions.append(f'{self.get_page_expression()} <= :filter_page_to')
+            params["filter_page_to"] = int(search_filter["page_to"])
+
+        if not conditions:
+            return "", params
+
+        return " WHERE " + " AND ".join(conditions), params
+
+    def get_distance_operator(self) -> str:
+        # the operator of the index operator class, anything else makes the planner skip the index
+        if self.distance_method == PgVectorDistanceMethodEnums.DOT.value:
+            return "<->"
+        return "<=>"
+
+    async def apply_search_settings(self, session, index_limit: int,
+                                    search_filter: dict = None, search_params: dict = None):
+        """
+        Transaction local settings of a search, in one statement:
+        ef_search / probes trade latency for recall, exact disables the index scans,
+        filtered searches scan the index iteratively (pgvector >= 0.8).
+        """
+
+        search_params = search_params or {}
+        settings = {}
+
+        # hnsw returns at most ef_search records, keep room for the requested ones
+        settings["hnsw.ef_search"] = min(HNSW_MAX_EF_SEARCH,
+                                         max(search_params.get("ef_search") or HNSW_DEFAULT_EF_SEARCH, index_limit))
+
+        if search_params.get("probes"):
+            settings["ivfflat.probes"] = search_params["probes"]
+
+        if search_params.get("exact"):
+            settings["enable_indexscan"] = "off"
+
+        if search_filter and self.iterative_scan and self.has_iterative_scan():
+            settings["hnsw.iterative_scan"] = self.iterative_scan
+            settings["ivfflat.iterative_scan"] = self.iterative_scan
+
+        settings_sql = sql_text("SELECT " + ", ".join([
+            f"set_config(:setting_{idx}, :value_{idx}, true)"
+            for idx in range(len(settings))
+        ]))
+        params = {}
+        for idx, (setting, value) in enumerate(settings.items()):
+            params[f"setting_{idx}"] = setting
+            params[f"value_{idx}"] = str(value)
+
+        await session.execute(settings_sql, params)
+
+    def get_index_limit(self, collection_storage: dict, limit: int) -> int:
+        # records read from the vector index per query
+        if collection_storage["storage"] == VectorStorageEnums.BINARY.value:
+            return max(limit, math.ceil(limit * self.oversampling))
+        return limit
+
+    def get_payload_columns(self, with_payload: bool = True) -> str:
+        if not with_payload:
+            return ""
+
+        return f', {PgVectorTableSchemeEnums.CHUNK_ID.value} as chunk_id, {PgVectorTableSchemeEnums.METADATA.value} as metadata'
+
+    def get_payload_sql(self, records_sql: str, order_by: str, with_payload: bool = True) -> str:
+        """
+        Search results of the SELECT `records_sql`: with payload, the chunk order and
+        the asset of every record come from the chunks / assets tables in the same statement.
+        """
+
+        if not with_payload:
+            return f'SELECT records.* FROM ({records_sql}) records ORDER BY {order_by}'
+
+        return ('SELECT records.*, chunks.chunk_order, chunks.chunk_asset_id as asset_id,'
+                ' assets.asset_name as file_name'
+                f' FROM ({records_sql}) records'
+                ' LEFT JOIN chunks ON chunks.chunk_id = records.chunk_id'
+                ' LEFT JOIN assets ON assets.asset_id = chunks.chunk_asset_id'
+                f' ORDER BY {order_by}'
+                )
+
+    def get_record_document(self, record, with_payload: bool = True) -> RetrievedDocument:
+        if not with_payload:
+            return RetrievedDocument(text=record.text, score=record.score)
+
+        metadata = json.loads(record.metadata) if isinstance(record.metadata, str) else record.metadata
+        document = self.get_retrieved_document(text=record.text, score=record.score, record_id=record.chunk_id,
+                                               metadata=metadata, with_payload=with_payload)
+
+        # the chunks / assets rows win over the metadata copied at indexing
+        for field in ["asset_id", "file_name", "chunk_order"]:
+            if getattr(record, field) is not None:
+                setattr(document, field, getattr(record, field))
+
+        return document
+
+    def get_search_sql(self, collection_name: str, collection_storage: dict,
+                             query_vector: str, limit: int, where_sql: str = "",
+                             with_payload: bool = True) -> str:
+        """
+        SELECT of the `limit` nearest records as (text, score, distance, payload...) for the vector SQL
+        expression `query_vector`, e.g. a bind parameter or a lateral column.
+        The nearest records are picked by ORDER BY <distance operator> LIMIT, the only
+        form the vector indexes serve, and sorted again outside since iterative scans
+        may return them slightly out of order.
+        """
+
+        distance_operator = self.get_distance_operator()
+        vector_column = PgVectorTableSchemeEnums.VECTOR.value
+        payload_columns = self.get_payload_columns(with_payload)
+
+        if collection_storage["storage"] == VectorStorageEnums.BINARY.value:
+            # hamming distance on the bit index picks the candidates, full vectors re-score them
+            candidates = self.get_index_limit(collection_storage, limit)
+            payload_names = ", chunk_id, metadata" if with_payload else ""
+            records_sql = (f'SELECT text, 1 - ({vector_column} <=> {query_vector}) as score,'
+                           f' {vector_column} {distance_operator} {query_vector} as distance{payload_names}'
+                           ' FROM ('
+                             f'SELECT {PgVectorTableSchemeEnums.TEXT.value} as text, {vector_column}{payload_columns}'
+                             f' FROM {collection_name}'
+                             f'{where_sql}'
+                             f' ORDER BY {self.get_binary_expression(vector_column, collection_storage)}'
+                             f' <~> {self.get_binary_expression(f"CAST({query_vector} AS vector)", collection_storage)}'
+                             f' LIMIT {candidates}'
+                           ') candidates'
+                           ' ORDER BY distance '
+                           f'LIMIT {limit}'
+                           )
+
+            return self.get_payload_sql(records_sql, order_by="records.distance", with_payload=with_payload)
+
+        records_sql = (f'SELECT {PgVectorTableSchemeEnums.TEXT.value} as text, 1 - ({vector_column} <=> {query_vector}) as score,'
+                       f' {vector_column} {distance_operator} {query_vector} as distance{payload_columns}'
+                       f' FROM {collection_name}'
+                       f'{where_sql}'
+                       f' ORDER BY {vector_column} {distance_operator} {query_vector} '
+                       f'LIMIT {limit}'
+                       )
+
+        return self.get_payload_sql(records_sql, order_by="records.distance", with_payload=with_payload)
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int,
+                               search_filter: dict = None, search_params: dict = None,
+                               with_payload: bool = True):
 
         is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
         if not is_collection_existed:
             self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
             return False
         
+        collection_storage = await self.get_collection_storage(collection_name=collection_name)
+        where_sql, filter_params = self.get_filter_sql(search_filter)
+
         vector = "[" + ",".join([ str(v) for v in vector ]) + "]"
         async with self.db_client() as session:
             async with session.begin():
-                search_sql = sql_text(f'SELECT {PgVectorTableSchemeEnums.TEXT.value} as text, 1 - ({PgVectorTableSchemeEnums.VECTOR.value} <=> :vector) as score'
-                                      f' FROM {collection_name}'
-                                      ' ORDER BY score DESC '
-                                      f'LIMIT {limit}'
-                                      )
+                await self.apply_search_settings(session, index_limit=self.get_index_limit(collection_storage, limit),
+                                                 search_filter=search_filter, search_params=search_params)
+
+                search_sql = sql_text(self.get_search_sql(collection_name=collection_name,
+                                                          collection_storage=collection_storage,
+                                                          query_vector=":vector", limit=limit,
+                                                          where_sql=where_sql, with_payload=with_payload))
                 
-                result = await session.execute(search_sql, {"vector": vector})
+                result = await session.execute(search_sql, {"vector": vector, **filter_params})
 
                 records = result.fetchall()
 
                 return [
-                    RetrievedDocument(
-                        text=record.text,
-                        score=record.score
+                    self.get_record_document(record, with_payload=with_payload)
+                    for record in records
+                ]
+
+    async def search_by_vectors(self, collection_name: str, vectors: list, limit: int,
+                                search_filter: dict = None, search_params: dict = None,
+                                with_payload: bool = True):
+        """
+        Nearest neighbours of every query vector in a single round-trip: the vectors are
+        unnested with their position and each one runs the search in a LATERAL subquery.
+        """
+
+        is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        if not is_collection_existed:
+            self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
+            return False
+
+        if not vectors:
+            return []
+
+        collection_storage = await self.get_collection_storage(collection_name=collection_name)
+        vector_type = "halfvec" if collection_storage["storage"] == VectorStorageEnums.HALF.value else "vector"
+        where_sql, filter_params = self.get_filter_sql(search_filter)
+
+        # one text array literal, so the driver never has to know the vector types
+        vectors_literal = "{" + ",".join([
+            '"[' + ",".join([ str(v) for v in vector ]) + ']"'
+            for vector in vectors
+        ]) + "}"
+
+        inner_sql = self.get_search_sql(collection_name=collection_name,
+                                        collection_storage=collection_storage,
+                                        query_vector="queries.query_vector", limit=limit,
+                                        where_sql=where_sql, with_payload=with_payload)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await self.apply_search_settings(session, index_limit=self.get_index_limit(collection_storage, limit),
+                                                 search_filter=search_filter, search_params=search_params)
+
+                search_sql = sql_text('SELECT queries.query_idx, results.*'
+                                      f' FROM unnest(CAST(CAST(:vectors AS text) AS {vector_type}[]))'
+                                      ' WITH ORDINALITY AS queries(query_vector, query_idx)'
+                                      f' CROSS JOIN LATERAL ({inner_sql}) results'
+                                      ' ORDER BY queries.query_idx, results.distance'
+                                      )
+
+                result = await session.execute(search_sql, {"vectors": vectors_literal, **filter_params})
+
+                results = [ [] for _ in vectors ]
+                for record in result.fetchall():
+                    results[record.query_idx - 1].append(
+                        self.get_record_document(record, with_payload=with_payload)
                     )
+
+                return results
+
+    async def search_by_text(self, collection_name: str, text: str, limit: int,
+                             search_filter: dict = None, with_payload: bool = True):
+        """
+        Lexical search on the tsvector column. The query terms are OR-ed,
+        so records matching only the rare terms are ranked too.
+        """
+
+        is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        if not is_collection_existed:
+            self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
+            return False
+
+        where_sql, filter_params = self.get_filter_sql(search_filter)
+        text_search_sql = f'{PgVectorTableSchemeEnums.TEXT_SEARCH.value} @@ query'
+        where_sql = f'{where_sql} AND {text_search_sql}' if where_sql else f' WHERE {text_search_sql}'
+
+        async with self.db_client() as session:
+            async with session.begin():
+                records_sql = (f'SELECT {PgVectorTableSchemeEnums.TEXT.value} as text,'
+                               f' ts_rank_cd({PgVectorTableSchemeEnums.TEXT_SEARCH.value}, query) as score'
+                               f'{self.get_payload_columns(with_payload)}'
+                               f' FROM {collection_name},'
+                               " CAST(replace(CAST(plainto_tsquery(CAST(:config AS regconfig), :text) AS text), '&', '|') AS tsquery) query"
+                               f'{where_sql}'
+                               ' ORDER BY score DESC '
+                               f'LIMIT {limit}'
+                               )
+                search_sql = sql_text(self.get_payload_sql(records_sql, order_by="records.score DESC",
+                                                           with_payload=with_payload))
+
+                result = await session.execute(search_sql, {"config": self.text_search_config, "text": text,
+                                                            **filter_params})
+
+                records = result.fetchall()
+
+                return [
+                    self.get_record_document(record, with_payload=with_payload)
                     for record in records
                 ]
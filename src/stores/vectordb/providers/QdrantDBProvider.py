@@ -1,20 +1,47 @@
-from qdrant_client import models, QdrantClient
+from qdrant_client import models, AsyncQdrantClient
 from ..VectorDBInterface import VectorDBInterface
-from ..VectorDBEnums import DistanceMethodEnums
+from ..VectorDBEnums import DistanceMethodEnums, VectorStorageEnums
+import asyncio
 import logging
+import re
+import zlib
+from collections import Counter
 from typing import List
-from models.db_schemes import RetrievedDocument
+
+# sparse vector of the lexical (hybrid) search, next to the unnamed dense vector
+SPARSE_VECTOR_NAME = "text"
+SPARSE_TF_SATURATION = 1.2
+# payload fields of the search filters
+PAYLOAD_INDEXED_FIELDS = ["metadata.asset_id", "metadata.page", "metadata.page_end"]
 
 class QdrantDBProvider(VectorDBInterface):
 
     def __init__(self, db_client: str, default_vector_size: int = 786,
-                                     distance_method: str = None, index_threshold: int=100):
+                                     distance_method: str = None, index_threshold: int=100,
+                                     url: str = None, api_key: str = None,
+                                     prefer_grpc: bool = True, grpc_port: int = 6334,
+                                     timeout: int = None, upload_parallelism: int = 4,
+                                     storage: str = VectorStorageEnums.FLOAT.value, oversampling: float = 2.0):
 
         self.client = None
         self.db_client = db_client
         self.distance_method = None
         self.default_vector_size = default_vector_size
 
+        # server mode when a url is set, otherwise the embedded local mode at `db_client`
+        self.url = url
+        self.api_key = api_key
+        self.prefer_grpc = prefer_grpc
+        self.grpc_port = grpc_port
+        self.timeout = timeout
+        self.upload_parallelism = max(1, upload_parallelism)
+
+        self.default_storage = storage
+        self.oversampling = oversampling
+        # collection name -> whether it has the sparse vector, collections created before hybrid search do not
+        self.collections_sparse = {}
+        self.collections_payload_indexed = set()
+
         if distance_method == DistanceMethodEnums.COSINE.value:
             self.distance_method = models.Distance.COSINE
         elif distance_method == DistanceMethodEnums.DOT.value:
@@ -23,130 +50,392 @@ class QdrantDBProvider(VectorDBInterface):
         self.logger = logging.getLogger('uvicorn')
 
     async def connect(self):
-        self.client = QdrantClient(path=self.db_client)
+        if self.url:
+            self.client = AsyncQdrantClient(
+                url=self.url,
+                api_key=self.api_key or None,
+                prefer_grpc=self.prefer_grpc,
+                grpc_port=self.grpc_port,
+                timeout=self.timeout,
+            )
+        else:
+            # single process only, the local mode locks its directory
+            self.client = AsyncQdrantClient(path=self.db_client)
 
     async def disconnect(self):
+        if self.client:
+            await self.client.close()
         self.client = None
 
     async def is_collection_existed(self, collection_name: str) -> bool:
-        return self.client.collection_exists(collection_name=collection_name)
-    
+        return await self.client.collection_exists(collection_name=collection_name)
+
     async def list_all_collections(self) -> List:
-        return self.client.get_collections()
-    
-    def get_collection_info(self, collection_name: str) -> dict:
-        return self.client.get_collection(collection_name=collection_name)
-    
+        return await self.client.get_collections()
+
+    async def get_collection_info(self, collection_name: str) -> dict:
+        return await self.client.get_collection(collection_name=collection_name)
+
     async def delete_collection(self, collection_name: str):
-        if self.is_collection_existed(collection_name):
+        self.collections_sparse.pop(collection_name, None)
+        self.collections_payload_indexed.discard(collection_name)
+        if await self.is_collection_existed(collection_name):
             self.logger.info(f"Deleting collection: {collection_name}")
-            return self.client.delete_collection(collection_name=collection_name)
-        
-    async def create_collection(self, collection_name: str, 
+            return await self.client.delete_collection(collection_name=collection_name)
+
+    async def has_sparse_vector(self, collection_name: str) -> bool:
+        if collection_name not in self.collections_sparse:
+            collection_info = await self.get_collection_info(collection_name=collection_name)
+            sparse_vectors = collection_info.config.params.sparse_vectors or {}
+            self.collections_sparse[collection_name] = SPARSE_VECTOR_NAME in sparse_vectors
+
+        return self.collections_sparse[collection_name]
+
+    def encode_sparse_vector(self, text: str, is_query: bool = False):
+        """
+        Hashed term frequencies of the text, saturated like BM25 (without length normalization).
+        Query terms weigh 1, the collection applies the IDF on search.
+        """
+
+        term_counts = Counter(re.findall(r"\w+", (text or "").lower()))
+
+        weights = {}
+        for term, count in term_counts.items():
+            index = zlib.crc32(term.encode("utf-8")) & 0x7fffffff
+            weight = 1.0 if is_query else count * (SPARSE_TF_SATURATION + 1) / (count + SPARSE_TF_SATURATION)
+            weights[index] = weights.get(index, 0.0) + weight
+
+        indices = sorted(weights)
+        return models.SparseVector(indices=indices, values=[ weights[index] for index in indices ])
+
+    async def create_payload_indexes(self, collection_name: str):
+        if collection_name in self.collections_payload_indexed:
+            return
+
+        for field_name in PAYLOAD_INDEXED_FIELDS:
+            _ = await self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=models.PayloadSchemaType.INTEGER,
+            )
+
+        self.collections_payload_indexed.add(collection_name)
+
+    def get_search_filter(self, search_filter: dict = None):
+        """
+        asset_ids match metadata.asset_id, page_from / page_to keep the points
+        whose page span (metadata.page .. metadata.page_end) overlaps the range.
+        Points pushed before the filters carry no metadata.asset_id (the project has
+        to be pushed again with do_reset for asset filters) and no metadata.page_end,
+        they are taken as spanning a single page.
+        """
+
+        search_filter = search_filter or {}
+        conditions = []
+
+        if search_filter.get("asset_ids"):
+            conditions.append(models.FieldCondition(
+                key="metadata.asset_id",
+                match=models.MatchAny(any=[ int(asset_id) for asset_id in search_filter["asset_ids"] ]),
+            ))
+
+        if search_filter.get("page_from") is not None:
+            page_from = models.Range(gte=int(search_filter["page_from"]))
+            conditions.append(models.Filter(should=[
+                models.FieldCondition(key="metadata.page_end", range=page_from),
+                models.Filter(must=[
+                    models.IsEmptyCondition(is_empty=models.PayloadField(key="metadata.page_end")),
+                    models.FieldCondition(key="metadata.page", range=page_from),
+                ]),
+            ]))
+
+        if search_filter.get("page_to") is not None:
+            conditions.append(models.FieldCondition(
+                key="metadata.page",
+                range=models.Range(lte=int(search_filter["page_to"])),
+            ))
+
+        if not conditions:
+            return None
+
+        return models.Filter(must=conditions)
+
+    def get_point_vector(self, text: str, vector: list, has_sparse_vector: bool):
+        if not has_sparse_vector:
+            return vector
+
+        return {
+            "": vector,
+            SPARSE_VECTOR_NAME: self.encode_sparse_vector(text),
+        }
+
+    def get_quantization_config(self, storage: str = None):
+        """
+        scalar: int8 quantized vectors kept in RAM, originals on disk.
+        binary: 1 bit per dimension, best suited to large (>= 1024) embeddings.
+        half has no qdrant equivalent and maps to scalar.
+        """
+
+        storage = storage or self.default_storage or VectorStorageEnums.FLOAT.value
+
+        if storage in [VectorStorageEnums.SCALAR.value, VectorStorageEnums.HALF.value]:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True,
+                )
+            )
+
+        if storage == VectorStorageEnums.BINARY.value:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            )
+
+        return None
+
+    async def create_collection(self, collection_name: str,
                                 embedding_size: int,
-                                do_reset: bool = False):
+                                do_reset: bool = False,
+                                storage: str = None):
         if do_reset:
-            _ = self.delete_collection(collection_name=collection_name)
-        
-        if not self.is_collection_existed(collection_name):
+            _ = await self.delete_collection(collection_name=collection_name)
+
+        if not await self.is_collection_existed(collection_name):
             self.logger.info(f"Creating new Qdrant collection: {collection_name}")
-            
-            _ = self.client.create_collection(
+
+            quantization_config = self.get_quantization_config(storage=storage)
+            _ = await self.client.create_collection(
                 collection_name=collection_name,
                 vectors_config=models.VectorParams(
                     size=embedding_size,
-                    distance=self.distance_method
-                )
+                    distance=self.distance_method,
+                    on_disk=quantization_config is not None,
+                ),
+                quantization_config=quantization_config,
+                sparse_vectors_config={
+                    SPARSE_VECTOR_NAME: models.SparseVectorParams(modifier=models.Modifier.IDF),
+                },
             )
+            self.collections_sparse[collection_name] = True
+
+            await self.create_payload_indexes(collection_name=collection_name)
 
             return True
-        
+
+        # collections created before the search filters have no payload indexes yet
+        await self.create_payload_indexes(collection_name=collection_name)
+
         return False
-    
+
     async def insert_one(self, collection_name: str, text: str, vector: list,
-                         metadata: dict = None, 
+                         metadata: dict = None,
                          record_id: str = None):
-        
-        if not self.is_collection_existed(collection_name):
+
+        if not await self.is_collection_existed(collection_name):
             self.logger.error(f"Can not insert new record to non-existed collection: {collection_name}")
             return False
-        
+
         try:
-            _ = self.client.upload_records(
+            has_sparse_vector = await self.has_sparse_vector(collection_name=collection_name)
+            _ = await self.client.upsert(
                 collection_name=collection_name,
-                records=[
-                    models.Record(
-                        id=[record_id],
-                        vector=vector,
+                points=[
+                    models.PointStruct(
+                        id=record_id,
+                        vector=self.get_point_vector(text, vector, has_sparse_vector),
                         payload={
                             "text": text, "metadata": metadata
                         }
                     )
-                ]
+                ],
+                wait=True,
             )
         except Exception as e:
             self.logger.error(f"Error while inserting batch: {e}")
             return False
 
         return True
-    
-    async def insert_many(self, collection_name: str, texts: list, 
-                          vectors: list, metadata: list = None, 
-                          record_ids: list = None, batch_size: int = 50):
-        
+
+    async def insert_many(self, collection_name: str, texts: list,
+                          vectors: list, metadata: list = None,
+                          record_ids: list = None, batch_size: int = 256,
+                          defer_index: bool = False):
+
         if metadata is None:
             metadata = [None] * len(texts)
 
         if record_ids is None:
             record_ids = list(range(0, len(texts)))
 
-        for i in range(0, len(texts), batch_size):
-            batch_end = i + batch_size
+        # keeps `upload_parallelism` upsert batches in flight
+        semaphore = asyncio.Semaphore(self.upload_parallelism)
+        has_sparse_vector = await self.has_sparse_vector(collection_name=collection_name)
 
-            batch_texts = texts[i:batch_end]
-            batch_vectors = vectors[i:batch_end]
-            batch_metadata = metadata[i:batch_end]
-            batch_record_ids = record_ids[i:batch_end]
+        async def upsert_batch(batch_start: int):
+            batch_end = batch_start + batch_size
 
-            batch_records = [
-                models.Record(
-                    id=batch_record_ids[x],
-                    vector=batch_vectors[x],
+            batch_points = [
+                models.PointStruct(
+                    id=record_id,
+                    vector=self.get_point_vector(text, vector, has_sparse_vector),
                     payload={
-                        "text": batch_texts[x], "metadata": batch_metadata[x]
+                        "text": text, "metadata": meta
                     }
                 )
-
-                for x in range(len(batch_texts))
+                for text, vector, meta, record_id in zip(texts[batch_start:batch_end],
+                                                         vectors[batch_start:batch_end],
+                                                         metadata[batch_start:batch_end],
+                                                         record_ids[batch_start:batch_end])
             ]
 
-            try:
-                _ = self.client.upload_records(
+            async with semaphore:
+                _ = await self.client.upsert(
                     collection_name=collection_name,
-                    records=batch_records,
+                    points=batch_points,
+                    wait=True,
                 )
-            except Exception as e:
-                self.logger.error(f"Error while inserting batch: {e}")
-                return False
+
+        # the first failed batch cancels the others instead of letting them write on
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for batch_start in range(0, len(texts), batch_size):
+                    task_group.create_task(upsert_batch(batch_start))
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e.exceptions[0]}")
+            return False
 
         return True
-        
-    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5):
 
-        results = self.client.search(
+    async def build_vector_index(self, collection_name: str):
+        # qdrant maintains its HNSW index in the background optimizer
+        return False
+
+    async def list_record_ids(self, collection_name: str, batch_size: int = 10000) -> List:
+        record_ids = []
+        offset = None
+        while True:
+            points, offset = await self.client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            record_ids.extend(point.id for point in points)
+
+            if offset is None:
+                break
+
+        return record_ids
+
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list):
+        if not record_ids:
+            return 0
+
+        _ = await self.client.delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=list(record_ids)),
+        )
+        return len(record_ids)
+
+    def get_search_params(self, search_params: dict = None):
+        """
+        ef_search maps to hnsw_ef and exact to a full scan; probes has no qdrant equivalent.
+        The quantization params are ignored by collections without quantization.
+        """
+
+        search_params = search_params or {}
+
+        return models.SearchParams(
+            hnsw_ef=search_params.get("ef_search"),
+            exact=bool(search_params.get("exact")),
+            quantization=models.QuantizationSearchParams(
+                rescore=True,
+                oversampling=self.oversampling,
+            )
+        )
+
+    def get_payload_selector(self, with_payload: bool = True):
+        # the text is always needed, the rest only for the search results with payload
+        return True if with_payload else ["text"]
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               search_filter: dict = None, search_params: dict = None,
+                               with_payload: bool = True):
+
+        results = await self.client.search(
             collection_name=collection_name,
             query_vector=vector,
-            limit=limit
+            query_filter=self.get_search_filter(search_filter),
+            limit=limit,
+            search_params=self.get_search_params(search_params),
+            with_payload=self.get_payload_selector(with_payload),
         )
 
         if not results or len(results) == 0:
             return None
-        
+
         return [
-            RetrievedDocument(**{
-                "score": result.score,
-                "text": result.payload["text"],
-            })
+            self.get_retrieved_document(text=result.payload["text"], score=result.score, record_id=result.id,
+                                        metadata=result.payload.get("metadata"), with_payload=with_payload)
             for result in results
         ]
 
+    async def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 5,
+                                search_filter: dict = None, search_params: dict = None,
+                                with_payload: bool = True):
+
+        if not vectors:
+            return []
+
+        query_filter = self.get_search_filter(search_filter)
+        query_params = self.get_search_params(search_params)
+
+        batch_results = await self.client.search_batch(
+            collection_name=collection_name,
+            requests=[
+                models.SearchRequest(
+                    vector=vector,
+                    filter=query_filter,
+                    limit=limit,
+                    params=query_params,
+                    with_payload=self.get_payload_selector(with_payload),
+                )
+                for vector in vectors
+            ],
+        )
+
+        return [
+            [
+                self.get_retrieved_document(text=result.payload["text"], score=result.score, record_id=result.id,
+                                            metadata=result.payload.get("metadata"), with_payload=with_payload)
+                for result in results
+            ]
+            for results in batch_results
+        ]
+
+    async def search_by_text(self, collection_name: str, text: str, limit: int = 5,
+                             search_filter: dict = None, with_payload: bool = True):
+
+        if not await self.has_sparse_vector(collection_name=collection_name):
+            self.logger.warning(f"Collection {collection_name} has no sparse vectors, reset it to enable lexical search")
+            return []
+
+        sparse_vector = self.encode_sparse_vector(text, is_query=True)
+        if not sparse_vector.indices:
+            return []
+
+        results = await self.client.search(
+            collection_name=collection_name,
+            query_vector=models.NamedSparseVector(name=SPARSE_VECTOR_NAME, vector=sparse_vector),
+            query_filter=self.get_search_filter(search_filter),
+            limit=limit,
+            with_payload=self.get_payload_selector(with_payload),
+        )
+
+        return [
+            self.get_retrieved_document(text=result.payload["text"], score=result.score, record_id=result.id,
+                                        metadata=result.payload.get("metadata"), with_payload=with_payload)
+            for result in results
+        ]
@@ -0,0 +1,79 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from models.EmbeddingCacheModel import EmbeddingCacheModel
+
+
+class FakeResult:
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeTransaction:
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.updates = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def begin(self):
+        return FakeTransaction()
+
+    async def execute(self, stmt):
+        if stmt.is_select:
+            return FakeResult(self.rows)
+
+        self.updates.append(stmt.compile().params)
+        return FakeResult([])
+
+
+def get_entries(rows):
+    session = FakeSession(rows)
+
+    cache_model = EmbeddingCacheModel.__new__(EmbeddingCacheModel)
+    cache_model.db_client = lambda: session
+
+    records = asyncio.run(cache_model.get_entries(cache_keys=[row.cache_key for row in rows]))
+    return records, session.updates
+
+
+def make_row(cache_key, seconds_ago):
+    return SimpleNamespace(
+        cache_key=cache_key,
+        embedding_vector=b"vector",
+        last_accessed_at=datetime.now(timezone.utc) - timedelta(seconds=seconds_ago),
+    )
+
+
+def test_recently_accessed_entries_are_not_touched():
+    records, updates = get_entries([make_row("a", 5), make_row("b", 30)])
+
+    assert set(records.keys()) == {"a", "b"}
+    assert updates == []
+
+
+def test_only_stale_entries_are_touched():
+    records, updates = get_entries([make_row("a", 5), make_row("b", 3600)])
+
+    assert set(records.keys()) == {"a", "b"}
+    assert len(updates) == 1
+    assert "b" in updates[0]["cache_key_1"] and "a" not in updates[0]["cache_key_1"]
@@ -0,0 +1,37 @@
+import asyncio
+
+from stores.llm.EmbeddingScheduler import EmbeddingScheduler
+
+
+class FakeEmbeddingClient:
+
+    embedding_max_batch_size = 1
+
+    def __init__(self):
+        self.embedded_texts = []
+
+    def process_text(self, text: str):
+        return text
+
+    async def aembed_text(self, text, document_type: str = None):
+        if text == ["broken"]:
+            raise RuntimeError("embedding backend is down")
+
+        await asyncio.sleep(0.2)
+        self.embedded_texts.extend(text)
+        return [ [0.0] for _ in text ]
+
+
+def test_failed_batch_cancels_the_other_batches():
+    embedding_client = FakeEmbeddingClient()
+    scheduler = EmbeddingScheduler(embedding_client=embedding_client, max_concurrency=4, max_retries=0)
+
+    async def main():
+        vectors = await scheduler.embed(texts=["broken", "slow", "slower"])
+        # leaves time to the batches that were not cancelled
+        await asyncio.sleep(0.3)
+        return vectors
+
+    assert asyncio.run(main()) is None
+    assert embedding_client.embedded_texts == []
+    assert scheduler.in_flight == 0
@@ -0,0 +1,47 @@
+import asyncio
+import os
+
+import pytest
+
+from helpers.extraction_pool import ExtractionPool, ExtractionTimeoutError
+
+
+def test_timeout_does_not_kill_the_extraction_of_another_file(tmp_path):
+    # reading a fifo blocks until somebody writes to it
+    stuck_path = str(tmp_path / "stuck.txt")
+    slow_path = str(tmp_path / "slow.txt")
+    os.mkfifo(stuck_path)
+    os.mkfifo(slow_path)
+
+    def open_slow_file():
+        f = open(slow_path, "w", encoding="utf-8")
+        f.write("slow file ")
+        f.flush()
+        return f
+
+    def finish_slow_file(f):
+        f.write("content")
+        f.close()
+
+    async def main():
+        extraction_pool = ExtractionPool(max_workers=2, file_timeout=5)
+        extraction_pool.start()
+
+        try:
+            stuck_task = asyncio.create_task(extraction_pool.extract_file(stuck_path, ".txt"))
+            await asyncio.sleep(2)
+            slow_task = asyncio.create_task(extraction_pool.extract_file(slow_path, ".txt"))
+            slow_file = await asyncio.to_thread(open_slow_file)
+
+            with pytest.raises(ExtractionTimeoutError):
+                await stuck_task
+
+            # the slow file is still being read after the stuck one was killed
+            await asyncio.to_thread(finish_slow_file, slow_file)
+            return await slow_task
+        finally:
+            extraction_pool.stop()
+
+    pages = asyncio.run(main())
+
+    assert pages[0]["page_content"] == "slow file content"
@@ -0,0 +1,165 @@
+import asyncio
+import numpy as np
+from stores.vectordb.providers.HnswDBProvider import HnswDBProvider
+
+COLLECTION_NAME = "collection_8_1"
+EMBEDDING_SIZE = 8
+
+def make_provider(path):
+    # saves only happen when the test asks for them
+    return HnswDBProvider(db_client=str(path), distance_method="cosine", save_delay_seconds=3600)
+
+def make_vectors(count: int, seed: int = 7):
+    return np.random.default_rng(seed).normal(size=(count, EMBEDDING_SIZE)).astype(np.float32)
+
+async def insert(provider, record_ids, vectors, asset_ids=None):
+    asset_ids = asset_ids or [1] * len(record_ids)
+    return await provider.insert_many(
+        collection_name=COLLECTION_NAME,
+        texts=[ f"chunk {record_id}" for record_id in record_ids ],
+        vectors=[ vectors[record_id] for record_id in record_ids ],
+        metadata=[ { "asset_id": asset_id, "page": 0 } for asset_id in asset_ids ],
+        record_ids=record_ids,
+    )
+
+async def search(provider, vector, limit: int = 1, search_filter: dict = None):
+    return await provider.search_by_vector(collection_name=COLLECTION_NAME, vector=vector.tolist(),
+                                           limit=limit, search_filter=search_filter)
+
+def test_saved_graph_is_reloaded(tmp_path):
+    vectors = make_vectors(20)
+
+    async def scenario():
+        provider = make_provider(tmp_path)
+        await provider.connect()
+        await provider.create_collection(collection_name=COLLECTION_NAME, embedding_size=EMBEDDING_SIZE)
+        assert await insert(provider, record_ids=list(range(20)), vectors=vectors)
+        await provider.delete_by_record_ids(collection_name=COLLECTION_NAME, record_ids=[5])
+        await provider.disconnect()
+
+        reopened = make_provider(tmp_path)
+        await reopened.connect()
+        info = await reopened.get_collection_info(collection_name=COLLECTION_NAME)
+        results = await search(reopened, vectors[3])
+        record_ids = await reopened.list_record_ids(collection_name=COLLECTION_NAME)
+        deleted_results = await search(reopened, vectors[5], limit=20)
+        return info, results, record_ids, deleted_results
+
+    info, results, record_ids, deleted_results = asyncio.run(scenario())
+
+    assert info["memory_mapped"] and not info["unsaved_changes"]
+    assert info["record_count"] == 19
+    assert results[0].chunk_id == 3 and results[0].text == "chunk 3"
+    assert results[0].score > 0.99
+    assert sorted(record_ids) == [ record_id for record_id in range(20) if record_id != 5 ]
+    assert 5 not in [ result.chunk_id for result in deleted_results ]
+
+def test_insert_into_a_reloaded_graph(tmp_path):
+    vectors = make_vectors(30)
+
+    async def scenario():
+        provider = make_provider(tmp_path)
+        await provider.connect()
+        await provider.create_collection(collection_name=COLLECTION_NAME, embedding_size=EMBEDDING_SIZE)
+        await insert(provider, record_ids=list(range(20)), vectors=vectors)
+        await provider.build_vector_index(collection_name=COLLECTION_NAME)
+        await provider.disconnect()
+
+        # the memory-mapped graph is loaded in memory by the first write
+        provider = make_provider(tmp_path)
+        await provider.connect()
+        await insert(provider, record_ids=list(range(20, 30)), vectors=vectors)
+        await provider.build_vector_index(collection_name=COLLECTION_NAME)
+        await provider.disconnect()
+
+        reopened = make_provider(tmp_path)
+        await reopened.connect()
+        return [ (await search(reopened, vectors[record_id]))[0].chunk_id for record_id in [0, 19, 20, 29] ]
+
+    assert asyncio.run(scenario()) == [0, 19, 20, 29]
+
+def test_records_of_an_unsaved_graph_are_not_listed(tmp_path):
+    vectors = make_vectors(20)
+
+    async def scenario():
+        provider = make_provider(tmp_path)
+        await provider.connect()
+        await provider.create_collection(collection_name=COLLECTION_NAME, embedding_size=EMBEDDING_SIZE)
+        await insert(provider, record_ids=list(range(10)), vectors=vectors)
+        await provider.build_vector_index(collection_name=COLLECTION_NAME)
+
+        # the sidecar has these lines, the process dies before the graph save
+        await insert(provider, record_ids=list(range(10, 20)), vectors=vectors)
+
+        reopened = make_provider(tmp_path)
+        await reopened.connect()
+        info = await reopened.get_collection_info(collection_name=COLLECTION_NAME)
+        record_ids = await reopened.list_record_ids(collection_name=COLLECTION_NAME)
+        return info, record_ids
+
+    info, record_ids = asyncio.run(scenario())
+
+    assert info["vectors_count"] == 10 and info["record_count"] == 10
+    assert sorted(record_ids) == list(range(10))
+
+def test_selective_filter_falls_back_to_the_matching_records(tmp_path):
+    vectors = make_vectors(2000)
+    # a handful of records of asset 2, far from the query in the graph
+    asset_ids = [ 2 if record_id % 500 == 499 else 1 for record_id in range(2000) ]
+
+    async def scenario():
+        provider = make_provider(tmp_path)
+        await provider.connect()
+        await provider.create_collection(collection_name=COLLECTION_NAME, embedding_size=EMBEDDING_SIZE)
+        await insert(provider, record_ids=list(range(2000)), vectors=vectors, asset_ids=asset_ids)
+
+        calls = []
+        collection = provider.load_collection(COLLECTION_NAME)
+        search_graph = collection.index.search
+
+        def counting_search(query, count, **kwargs):
+            calls.append(count)
+            return search_graph(query, count, **kwargs)
+
+        collection.index.search = counting_search
+        results = await search(provider, vectors[0], limit=2, search_filter={ "asset_ids": [2] })
+        return results, calls
+
+    results, calls = asyncio.run(scenario())
+
+    expected = sorted(
+        [ 499, 999, 1499, 1999 ],
+        key=lambda record_id: -float(np.dot(vectors[0], vectors[record_id]) /
+                                      (np.linalg.norm(vectors[0]) * np.linalg.norm(vectors[record_id]))),
+    )[:2]
+    assert [ result.chunk_id for result in results ] == expected
+    assert max(calls) <= 2 * 4 ** 2
+
+def test_concurrent_writers_keep_each_other_vectors(tmp_path):
+    vectors = make_vectors(30)
+
+    async def scenario():
+        worker = make_provider(tmp_path)
+        other_worker = make_provider(tmp_path)
+        await worker.connect()
+        await other_worker.connect()
+        await worker.create_collection(collection_name=COLLECTION_NAME, embedding_size=EMBEDDING_SIZE)
+
+        await insert(worker, record_ids=list(range(10)), vectors=vectors)
+        # saved while the first worker still has unsaved changes
+        await insert(other_worker, record_ids=list(range(10, 20)), vectors=vectors)
+        await other_worker.build_vector_index(collection_name=COLLECTION_NAME)
+
+        await insert(worker, record_ids=list(range(20, 30)), vectors=vectors)
+        await worker.build_vector_index(collection_name=COLLECTION_NAME)
+
+        reopened = make_provider(tmp_path)
+        await reopened.connect()
+        info = await reopened.get_collection_info(collection_name=COLLECTION_NAME)
+        found = [ (await search(reopened, vectors[record_id]))[0].chunk_id for record_id in range(30) ]
+        return info, found
+
+    info, found = asyncio.run(scenario())
+
+    assert info["vectors_count"] == 30 and info["record_count"] == 30
+    assert found == list(range(30))
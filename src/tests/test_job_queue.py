@@ -0,0 +1,31 @@
+import asyncio
+
+from helpers.job_queue import JobQueue
+
+
+def test_heartbeat_covers_queued_and_running_jobs():
+    heartbeats = []
+
+    async def heartbeat_fn(job_ids):
+        heartbeats.append(sorted(job_ids))
+
+    async def main():
+        job_queue = JobQueue(max_workers=1, heartbeat_fn=heartbeat_fn, heartbeat_seconds=0.3)
+        await job_queue.start()
+
+        release = asyncio.Event()
+        job_queue.submit(job_id=1, job_fn=release.wait)
+        job_queue.submit(job_id=2, job_fn=release.wait)
+        await asyncio.sleep(0.15)
+
+        # job 1 runs, job 2 waits behind it
+        release.set()
+        await job_queue.queue.join()
+        await asyncio.sleep(0.15)
+
+        await job_queue.stop()
+
+    asyncio.run(main())
+
+    assert heartbeats[0] == [1, 2]
+    assert heartbeats[-1] == []
@@ -0,0 +1,250 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from controllers.JobController import JobController
+from controllers.NLPController import NLPController
+from models.JobModel import JobModel
+from models.ChunkModel import ChunkModel
+from models.AssetModel import AssetModel
+from models.enums.JobEnums import JobStatusEnum, JobTypeEnum
+
+HEARTBEAT_SECONDS = 300
+
+def make_job(job_status: str, embedding_model_id: str = "model-a", seconds_ago: int = 0, last_chunk_id: int = 0):
+    return SimpleNamespace(
+        job_id=7,
+        job_status=job_status,
+        job_checkpoint={ "last_chunk_id": last_chunk_id, "embedding_model_id": embedding_model_id },
+        job_inserted_chunks=last_chunk_id,
+        job_stats={},
+        started_at=None,
+        created_at=None,
+        updated_at=datetime.now(timezone.utc) - timedelta(seconds=seconds_ago),
+    )
+
+def get_resumable_job(latest_job, embedding_model_id: str = "model-a"):
+    job_model = JobModel.__new__(JobModel)
+
+    async def get_latest_job(project_id: int, job_type: str):
+        return latest_job
+
+    job_model.get_latest_job = get_latest_job
+    return asyncio.run(job_model.get_resumable_job(project_id=1, job_type=JobTypeEnum.INDEX.value,
+                                                   embedding_model_id=embedding_model_id,
+                                                   heartbeat_seconds=HEARTBEAT_SECONDS))
+
+def test_failed_job_is_resumable():
+    job = make_job(JobStatusEnum.FAILED.value)
+    assert get_resumable_job(job) is job
+
+def test_running_job_with_heartbeat_is_not_resumable():
+    assert get_resumable_job(make_job(JobStatusEnum.RUNNING.value, seconds_ago=10)) is None
+
+def test_running_job_without_heartbeat_is_resumable():
+    job = make_job(JobStatusEnum.RUNNING.value, seconds_ago=HEARTBEAT_SECONDS + 1)
+    assert get_resumable_job(job) is job
+
+def test_finished_or_other_model_jobs_are_not_resumable():
+    assert get_resumable_job(make_job(JobStatusEnum.COMPLETED.value)) is None
+    assert get_resumable_job(make_job(JobStatusEnum.CANCELLED.value)) is None
+    assert get_resumable_job(make_job(JobStatusEnum.FAILED.value, embedding_model_id="model-b")) is None
+    assert get_resumable_job(None) is None
+
+class FakeJobModel:
+
+    def __init__(self, job):
+        self.job = job
+        self.updates = []
+        self.heartbeats = 0
+
+    async def get_job(self, job_id: int):
+        return self.job
+
+    async def get_job_status(self, job_id: int):
+        return JobStatusEnum.RUNNING.value
+
+    async def update_job(self, job_id: int, **values):
+        self.updates.append(values)
+        return 1
+
+    async def touch_job(self, job_id: int):
+        self.heartbeats += 1
+        return True
+
+class FakeChunkModel:
+
+    def __init__(self, chunk_ids, page_size: int):
+        self.chunk_ids = chunk_ids
+        self.page_size = page_size
+        self.indexed_ids = []
+
+    async def get_total_chunks_count(self, project_id: int, not_indexed_for: str = None):
+        return len(self.chunk_ids)
+
+    async def iter_project_chunks(self, project_id: int, after_chunk_id: int = 0, not_indexed_for: str = None):
+        chunk_ids = [ chunk_id for chunk_id in self.chunk_ids if chunk_id > after_chunk_id ]
+        for idx in range(0, len(chunk_ids), self.page_size):
+            yield [
+                SimpleNamespace(chunk_id=chunk_id, chunk_text=f"chunk {chunk_id}", chunk_metadata={ "page": 0 },
+                                chunk_asset_id=1, chunk_order=chunk_id)
+                for chunk_id in chunk_ids[idx:idx + self.page_size]
+            ]
+
+    async def mark_chunks_indexed(self, chunk_ids: list, embedding_model_id: str):
+        self.indexed_ids.extend(chunk_ids)
+        return len(chunk_ids)
+
+    async def reset_project_chunks_indexing(self, project_id: int):
+        return 0
+
+class FakeAssetModel:
+
+    async def get_all_project_assets(self, asset_project_id: int, asset_type: str):
+        return [ SimpleNamespace(asset_id=1, asset_name="report.pdf") ]
+
+class FakeNLPController:
+
+    def __init__(self, fail_after_pages: int = None, page_seconds: float = 0):
+        self.embedding_client = SimpleNamespace(embedding_model_id="model-a", embedding_size=4)
+        self.vectordb_client = SimpleNamespace(create_collection=self.create_collection)
+        self.fail_after_pages = fail_after_pages
+        self.page_seconds = page_seconds
+        self.pushed_ids = []
+
+    async def create_collection(self, collection_name: str, embedding_size: int, do_reset: bool = False,
+                                storage: str = None):
+        return False
+
+    def create_collection_name(self, project_id: int):
+        return f"collection_4_{project_id}"
+
+    async def index_into_vector_db(self, project, chunks, chunks_ids, replace_existing: bool = False,
+                                   asset_names: dict = None):
+        if self.fail_after_pages is not None and len(self.pushed_ids) >= self.fail_after_pages:
+            raise RuntimeError("embedding backend is down")
+        await asyncio.sleep(self.page_seconds)
+        self.pushed_ids.append(chunks_ids)
+        return True
+
+    async def delete_orphan_vectors(self, project, chunk_model):
+        return 0
+
+    async def build_vector_db_index(self, project):
+        return None
+
+def run_index_job(monkeypatch, job, chunk_model, nlp_controller, heartbeat_seconds: float = HEARTBEAT_SECONDS):
+    job_model = FakeJobModel(job=job)
+
+    async def create_job_model(db_client):
+        return job_model
+
+    async def create_chunk_model(db_client):
+        return chunk_model
+
+    async def create_asset_model(db_client):
+        return FakeAssetModel()
+
+    monkeypatch.setattr(JobModel, "create_instance", create_job_model)
+    monkeypatch.setattr(ChunkModel, "create_instance", create_chunk_model)
+    monkeypatch.setattr(AssetModel, "create_instance", create_asset_model)
+
+    controller = JobController.__new__(JobController)
+    controller.db_client = None
+    controller.nlp_controller = nlp_controller
+    controller.app_settings = SimpleNamespace(INDEX_JOB_HEARTBEAT_SECONDS=heartbeat_seconds)
+
+    async def bump_project_index_version(project):
+        return None
+
+    controller.bump_project_index_version = bump_project_index_version
+
+    is_indexed = asyncio.run(controller.run_index_job(job_id=job.job_id, project=SimpleNamespace(project_id=1)))
+    return is_indexed, job_model
+
+def test_failed_run_checkpoints_the_last_pushed_page(monkeypatch):
+    chunk_model = FakeChunkModel(chunk_ids=list(range(1, 11)), page_size=4)
+    nlp_controller = FakeNLPController(fail_after_pages=1)
+
+    is_indexed, job_model = run_index_job(monkeypatch, job=make_job(JobStatusEnum.PENDING.value),
+                                          chunk_model=chunk_model, nlp_controller=nlp_controller)
+
+    assert not is_indexed
+    checkpoints = [ values["job_checkpoint"] for values in job_model.updates if "job_checkpoint" in values ]
+    assert checkpoints[-1] == { "last_chunk_id": 4, "embedding_model_id": "model-a" }
+    assert job_model.updates[-1]["job_status"] == JobStatusEnum.FAILED.value
+    assert chunk_model.indexed_ids == [1, 2, 3, 4]
+
+def test_resumed_run_starts_after_the_checkpoint(monkeypatch):
+    chunk_model = FakeChunkModel(chunk_ids=list(range(1, 11)), page_size=4)
+    nlp_controller = FakeNLPController()
+
+    is_indexed, job_model = run_index_job(monkeypatch,
+                                          job=make_job(JobStatusEnum.FAILED.value, last_chunk_id=4),
+                                          chunk_model=chunk_model, nlp_controller=nlp_controller)
+
+    assert is_indexed
+    assert nlp_controller.pushed_ids == [[5, 6, 7, 8], [9, 10]]
+    assert job_model.updates[-1]["job_status"] == JobStatusEnum.COMPLETED.value
+    # inserted chunks keep counting from the checkpoint
+    assert [ values["job_inserted_chunks"] for values in job_model.updates if "job_inserted_chunks" in values ] == [8, 10]
+
+class FailingVectorDBClient:
+
+    has_chunk_references = False
+
+    async def create_collection(self, collection_name: str, embedding_size: int, do_reset: bool = False,
+                                storage: str = None):
+        return False
+
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list):
+        return 0
+
+    async def insert_many(self, collection_name: str, texts: list, vectors: list, metadata: list = None,
+                          record_ids: list = None, defer_index: bool = False):
+        # e.g. the collection was dropped by another worker
+        return False
+
+class FakeEmbeddingClient:
+
+    embedding_model_id = "model-a"
+    embedding_size = 4
+
+    async def aembed_text(self, text, document_type: str):
+        return [ [1.0, 0.0, 0.0, 0.0] for _ in text ]
+
+def test_chunks_stay_unindexed_when_the_insert_fails(monkeypatch):
+    chunk_model = FakeChunkModel(chunk_ids=[1, 2, 3], page_size=4)
+
+    nlp_controller = NLPController.__new__(NLPController)
+    nlp_controller.vectordb_client = FailingVectorDBClient()
+    nlp_controller.vectordb_client.default_vector_size = 4
+    nlp_controller.embedding_client = FakeEmbeddingClient()
+    nlp_controller.embedding_scheduler = None
+    nlp_controller.app_settings = SimpleNamespace(VECTOR_DB_PGVEC_BULK_LOAD=False)
+
+    is_indexed, job_model = run_index_job(monkeypatch, job=make_job(JobStatusEnum.PENDING.value),
+                                          chunk_model=chunk_model, nlp_controller=nlp_controller)
+
+    assert not is_indexed
+    assert chunk_model.indexed_ids == []
+    assert job_model.updates[-1]["job_status"] == JobStatusEnum.FAILED.value
+    assert not any("job_checkpoint" in values for values in job_model.updates)
+
+def test_heartbeat_is_refreshed_during_a_slow_page(monkeypatch):
+    # one page lasts longer than the whole heartbeat window
+    chunk_model = FakeChunkModel(chunk_ids=[1, 2], page_size=4)
+    nlp_controller = FakeNLPController(page_seconds=0.5)
+
+    is_indexed, job_model = run_index_job(monkeypatch, job=make_job(JobStatusEnum.PENDING.value),
+                                          chunk_model=chunk_model, nlp_controller=nlp_controller,
+                                          heartbeat_seconds=0.3)
+
+    assert is_indexed
+    assert job_model.heartbeats >= 2
+
+def test_job_started_long_ago_with_a_recent_heartbeat_is_alive():
+    job = make_job(JobStatusEnum.RUNNING.value, seconds_ago=10)
+    job.started_at = datetime.now(timezone.utc) - timedelta(seconds=HEARTBEAT_SECONDS * 10)
+
+    assert JobModel.__new__(JobModel).is_job_alive(job=job, heartbeat_seconds=HEARTBEAT_SECONDS)
+    assert get_resumable_job(job) is None
@@ -0,0 +1,86 @@
+import asyncio
+from types import SimpleNamespace
+from controllers.NLPController import NLPController
+from stores.vectordb.providers.NumpyDBProvider import NumpyDBProvider
+
+class FakeVectorDBClient:
+
+    def __init__(self, record_ids, has_chunk_references=False):
+        self.default_vector_size = 4
+        self.record_ids = list(record_ids)
+        self.has_chunk_references = has_chunk_references
+        self.listed = False
+
+    async def list_record_ids(self, collection_name: str):
+        self.listed = True
+        return list(self.record_ids)
+
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list):
+        self.record_ids = [ record_id for record_id in self.record_ids if record_id not in record_ids ]
+        return len(record_ids)
+
+class FakeChunkModel:
+
+    def __init__(self, chunk_ids):
+        self.chunk_ids = chunk_ids
+        self.loaded = False
+
+    async def get_project_chunk_ids(self, project_id: int):
+        self.loaded = True
+        return list(self.chunk_ids)
+
+def make_controller(vectordb_client):
+    controller = NLPController.__new__(NLPController)
+    controller.vectordb_client = vectordb_client
+    return controller
+
+def test_delete_orphan_vectors_of_deleted_chunks():
+    vectordb_client = FakeVectorDBClient(record_ids=[1, 2, 3, 4])
+    chunk_model = FakeChunkModel(chunk_ids=[2, 4, 5])
+
+    deleted = asyncio.run(make_controller(vectordb_client).delete_orphan_vectors(
+        project=SimpleNamespace(project_id=1), chunk_model=chunk_model))
+
+    assert deleted == 2
+    assert vectordb_client.record_ids == [2, 4]
+
+def test_delete_orphan_vectors_skipped_with_chunk_references():
+    vectordb_client = FakeVectorDBClient(record_ids=[1, 2], has_chunk_references=True)
+    chunk_model = FakeChunkModel(chunk_ids=[2])
+
+    deleted = asyncio.run(make_controller(vectordb_client).delete_orphan_vectors(
+        project=SimpleNamespace(project_id=1), chunk_model=chunk_model))
+
+    assert deleted == 0
+    assert not vectordb_client.listed and not chunk_model.loaded
+
+class FakeEmbeddingClient:
+
+    embedding_size = 4
+
+    async def aembed_text(self, text, document_type: str):
+        return [ [1.0, 0.0, 0.0, 0.0] for _ in text ]
+
+def test_indexed_payload_carries_the_file_name(tmp_path):
+    vectordb_client = NumpyDBProvider(db_client=str(tmp_path), default_vector_size=4)
+    controller = make_controller(vectordb_client)
+    controller.embedding_client = FakeEmbeddingClient()
+    controller.embedding_scheduler = None
+
+    chunks = [ SimpleNamespace(chunk_text="some text", chunk_metadata={ "page": 0 },
+                               chunk_asset_id=3, chunk_order=1) ]
+
+    async def scenario():
+        await vectordb_client.connect()
+        is_inserted = await controller.index_into_vector_db(project=SimpleNamespace(project_id=1), chunks=chunks,
+                                                            chunks_ids=[11], defer_index=False,
+                                                            asset_names={ 3: "report.pdf" })
+        results = await vectordb_client.search_by_vector(collection_name=controller.create_collection_name(1),
+                                                         vector=[1.0, 0.0, 0.0, 0.0], limit=1)
+        return is_inserted, results
+
+    is_inserted, results = asyncio.run(scenario())
+
+    assert is_inserted
+    assert results[0].chunk_id == 11 and results[0].asset_id == 3
+    assert results[0].file_name == "report.pdf" and results[0].chunk_order == 1
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import numpy as np
+from stores.vectordb.providers.NumpyDBProvider import NumpyDBProvider
+
+COLLECTION_NAME = "collection_4_1"
+
+def make_provider(path):
+    provider = NumpyDBProvider(db_client=str(path), distance_method="cosine")
+    asyncio.run(provider.connect())
+    return provider
+
+def unit_vector(idx: int, size: int = 4):
+    vector = [0.0] * size
+    vector[idx % size] = 1.0
+    return vector
+
+def insert(provider, record_ids, texts=None, pages=None):
+    texts = texts or [ f"chunk {record_id}" for record_id in record_ids ]
+    pages = pages or [0] * len(record_ids)
+    return asyncio.run(provider.insert_many(
+        collection_name=COLLECTION_NAME,
+        texts=texts,
+        vectors=[ unit_vector(record_id) for record_id in record_ids ],
+        metadata=[ { "asset_id": 1, "page": page, "chunk_order": record_id } for record_id, page in zip(record_ids, pages) ],
+        record_ids=record_ids,
+    ))
+
+def search(provider, vector, limit: int = 10, search_filter: dict = None):
+    return asyncio.run(provider.search_by_vector(collection_name=COLLECTION_NAME, vector=vector,
+                                                 limit=limit, search_filter=search_filter))
+
+def test_sidecar_lines_follow_the_vector_rows(tmp_path):
+    provider = make_provider(tmp_path)
+    asyncio.run(provider.create_collection(collection_name=COLLECTION_NAME, embedding_size=4))
+
+    assert insert(provider, record_ids=[0, 1, 2, 3])
+
+    rows = [ json.loads(line)["row"] for line in open(tmp_path / COLLECTION_NAME / "records.jsonl") ]
+    assert rows == [0, 1, 2, 3]
+    assert np.load(tmp_path / COLLECTION_NAME / "vectors.npy", mmap_mode="r").shape == (4, 4)
+
+    for record_id in [0, 1, 2, 3]:
+        best = search(provider, unit_vector(record_id), limit=1)[0]
+        assert best.chunk_id == record_id
+        assert best.text == f"chunk {record_id}"
+        assert best.metadata["chunk_order"] == record_id
+
+def test_replaced_and_deleted_records(tmp_path):
+    provider = make_provider(tmp_path)
+    asyncio.run(provider.create_collection(collection_name=COLLECTION_NAME, embedding_size=4))
+    insert(provider, record_ids=[0, 1, 2])
+
+    # the last row of an id wins
+    insert(provider, record_ids=[1], texts=["chunk 1 again"])
+    asyncio.run(provider.delete_by_record_ids(collection_name=COLLECTION_NAME, record_ids=[2]))
+
+    results = search(provider, unit_vector(1))
+    assert [ result.chunk_id for result in results ] == [1, 0]
+    assert results[0].text == "chunk 1 again"
+    assert sorted(asyncio.run(provider.list_record_ids(collection_name=COLLECTION_NAME))) == [0, 1]
+
+    info = asyncio.run(provider.get_collection_info(collection_name=COLLECTION_NAME))
+    assert info["rows_count"] == 4 and info["record_count"] == 2
+
+def test_reader_picks_up_appends_of_another_process(tmp_path):
+    writer = make_provider(tmp_path)
+    reader = make_provider(tmp_path)
+    asyncio.run(writer.create_collection(collection_name=COLLECTION_NAME, embedding_size=4))
+
+    insert(writer, record_ids=[0, 1])
+    assert len(search(reader, unit_vector(0))) == 2
+
+    insert(writer, record_ids=[2, 3])
+    asyncio.run(writer.delete_by_record_ids(collection_name=COLLECTION_NAME, record_ids=[0]))
+
+    results = search(reader, unit_vector(3))
+    assert results[0].chunk_id == 3 and results[0].text == "chunk 3"
+    assert sorted(result.chunk_id for result in results) == [1, 2, 3]
+
+def test_rows_of_an_interrupted_append_are_skipped(tmp_path):
+    provider = make_provider(tmp_path)
+    asyncio.run(provider.create_collection(collection_name=COLLECTION_NAME, embedding_size=4))
+    insert(provider, record_ids=[0])
+
+    # vectors written, then a crash before the sidecar lines
+    with open(tmp_path / COLLECTION_NAME / "meta.json") as f:
+        meta = json.load(f)
+    provider.append_records(COLLECTION_NAME, [], vectors=provider.prepare_vectors([unit_vector(1)] * 2, meta))
+
+    insert(provider, record_ids=[2, 3])
+
+    reopened = make_provider(tmp_path)
+    for record_id in [0, 2, 3]:
+        best = search(reopened, unit_vector(record_id), limit=1)[0]
+        assert best.chunk_id == record_id and best.text == f"chunk {record_id}"
+    assert sorted(asyncio.run(reopened.list_record_ids(collection_name=COLLECTION_NAME))) == [0, 2, 3]
+
+def test_page_filter(tmp_path):
+    provider = make_provider(tmp_path)
+    asyncio.run(provider.create_collection(collection_name=COLLECTION_NAME, embedding_size=4))
+    insert(provider, record_ids=[0, 1, 2, 3], pages=[0, 1, 2, 3])
+
+    results = search(provider, unit_vector(0), search_filter={ "page_from": 1, "page_to": 2 })
+    assert sorted(result.chunk_id for result in results) == [1, 2]
+
+def test_reader_reloads_a_collection_reset_by_another_worker(tmp_path):
+    writer = make_provider(tmp_path)
+    reader = make_provider(tmp_path)
+    asyncio.run(writer.create_collection(collection_name=COLLECTION_NAME, embedding_size=4))
+    insert(writer, record_ids=[0, 1, 2, 3])
+    assert len(search(reader, unit_vector(0))) == 4
+
+    # a smaller sidecar than the one the reader has read
+    asyncio.run(writer.create_collection(collection_name=COLLECTION_NAME, embedding_size=4, do_reset=True))
+    insert(writer, record_ids=[2], texts=["new chunk 2"])
+
+    results = search(reader, unit_vector(2))
+    assert [ (result.chunk_id, result.text) for result in results ] == [(2, "new chunk 2")]
+
+    # and a larger one, the old offset falls in the middle of a line
+    insert(writer, record_ids=[4, 5, 6, 7], texts=[ f"new chunk {record_id} " * 5 for record_id in [4, 5, 6, 7] ])
+
+    results = search(reader, unit_vector(3))
+    assert sorted(result.chunk_id for result in results) == [2, 4, 5, 6, 7]
+    assert results[0].chunk_id == 7 and results[0].text.startswith("new chunk 7")
@@ -0,0 +1,119 @@
+import asyncio
+from stores.vectordb.providers.PGVectorProvider import PGVectorProvider
+
+class FakeResult:
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+    def one_or_none(self):
+        return self.value
+
+class FakeTransaction:
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+class FakeSession:
+
+    def __init__(self, database):
+        self.database = database
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def begin(self):
+        return FakeTransaction()
+
+    async def commit(self):
+        pass
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        self.database.statements.append(sql)
+
+        if "to_regclass" in sql and "obj_description" in sql:
+            return FakeResult((self.database.oid, self.database.comment) if self.database.oid else None)
+        if "to_regclass" in sql:
+            return FakeResult(self.database.oid)
+        if sql.startswith("DROP TABLE"):
+            self.database.drop()
+        if sql.startswith("CREATE TABLE"):
+            self.database.oid = self.database.next_oid
+            self.database.next_oid += 1
+        if sql.startswith("COMMENT ON TABLE"):
+            self.database.comment = sql.split("IS '", 1)[1].rstrip("'").replace("''", "'")
+        return FakeResult()
+
+class FakeDatabase:
+    """ One collection table, identified by its oid, as seen by every worker. """
+
+    def __init__(self):
+        self.oid = None
+        self.next_oid = 1000
+        self.comment = None
+        self.statements = []
+
+    def __call__(self):
+        return FakeSession(self)
+
+    def drop(self):
+        self.oid, self.comment = None, None
+
+def count_statements(database, prefix: str):
+    return sum(1 for sql in database.statements if sql.startswith(prefix))
+
+def test_existing_collection_is_migrated_once():
+    database = FakeDatabase()
+    provider = PGVectorProvider(db_client=database)
+
+    async def scenario():
+        assert await provider.create_collection(collection_name="collection_4_1", embedding_size=4)
+        database.statements.clear()
+        for _ in range(3):
+            assert not await provider.create_collection(collection_name="collection_4_1", embedding_size=4)
+
+    asyncio.run(scenario())
+
+    assert count_statements(database, "CREATE") == 0
+    assert count_statements(database, "SELECT CAST(to_regclass") == 3
+
+def test_collection_dropped_by_another_worker_is_recreated():
+    database = FakeDatabase()
+    provider = PGVectorProvider(db_client=database)
+
+    async def scenario():
+        await provider.create_collection(collection_name="collection_4_1", embedding_size=4)
+        # reset by another worker
+        database.drop()
+        return await provider.create_collection(collection_name="collection_4_1", embedding_size=4)
+
+    assert asyncio.run(scenario())
+    assert count_statements(database, "CREATE TABLE") == 2
+
+def test_storage_of_a_collection_recreated_by_another_worker():
+    database = FakeDatabase()
+    worker = PGVectorProvider(db_client=database, storage="float")
+    other_worker = PGVectorProvider(db_client=database, storage="half")
+
+    async def scenario():
+        await worker.create_collection(collection_name="collection_4_1", embedding_size=4)
+        before = await worker.get_collection_storage(collection_name="collection_4_1")
+
+        await other_worker.create_collection(collection_name="collection_4_1", embedding_size=4, do_reset=True)
+        after = await worker.get_collection_storage(collection_name="collection_4_1")
+        return before, after
+
+    before, after = asyncio.run(scenario())
+
+    assert before["storage"] == "float"
+    assert after == { "storage": "half", "embedding_size": 4 }
@@ -0,0 +1,60 @@
+from controllers.ProcessController import ProcessController, Document
+
+def make_controller():
+    # iter_chunks does not need the project folder
+    return ProcessController.__new__(ProcessController)
+
+def page_slice(pages, metadata):
+    assert metadata["page"] == metadata["page_end"]
+    return pages[metadata["page"]][metadata["start_offset"]:metadata["end_offset"]]
+
+def test_offsets_skip_the_stripped_prefix():
+    pages = [ "   first line here\n\t second line here\n" ]
+    records = [ Document(page_content=text, metadata={"page": idx}) for idx, text in enumerate(pages) ]
+
+    chunks = list(make_controller().iter_chunks(records=records, chunk_size=1000))
+
+    assert len(chunks) == 1
+    assert chunks[0].metadata["start_offset"] == 3
+    assert page_slice(pages, chunks[0].metadata) == "first line here\n\t second line here"
+
+def test_overlap_starts_at_a_word_boundary():
+    pages = [ "alpha beta gamma delta epsilon\nnext line\n" ]
+    records = [ Document(page_content=pages[0], metadata={"page": 0}) ]
+
+    chunks = list(make_controller().iter_chunks(records=records, chunk_size=20, overlap_size=10))
+
+    assert [ chunk.page_content for chunk in chunks ] == [
+        "alpha beta gamma delta epsilon",
+        "epsilon\nnext line",
+    ]
+    assert page_slice(pages, chunks[1].metadata) == "epsilon\nnext line"
+
+def test_overlap_keeps_the_raw_cut_without_inner_boundary():
+    # the cut lands in a segment whose only whitespace is the trailing splitter
+    pages = [ "abcdefghijklmnopqrstuvwxyz\nnext\n" ]
+    records = [ Document(page_content=pages[0], metadata={"page": 0}) ]
+
+    chunks = list(make_controller().iter_chunks(records=records, chunk_size=20, overlap_size=5))
+
+    assert chunks[0].page_content == "abcdefghijklmnopqrstuvwxyz"
+    assert chunks[1].page_content == "wxyz\nnext"
+    assert chunks[1].metadata["start_offset"] == pages[0].index("wxyz")
+
+def test_overlap_across_pages():
+    pages = [ "one two three four five\n", "six seven eight nine ten\n" ]
+    records = [ Document(page_content=text, metadata={"page": idx}) for idx, text in enumerate(pages) ]
+
+    chunks = list(make_controller().iter_chunks(records=records, chunk_size=20, overlap_size=6))
+
+    assert chunks[0].metadata == { "page": 0, "start_offset": 0, "page_end": 0, "end_offset": 23 }
+    assert chunks[1].page_content == "five\nsix seven eight nine ten"
+    assert chunks[1].metadata == { "page": 0, "start_offset": 19, "page_end": 1, "end_offset": 24 }
+
+def test_no_trailing_chunk_made_of_overlap_only():
+    pages = [ "a line long enough to be a chunk\n" ]
+    records = [ Document(page_content=pages[0], metadata={"page": 0}) ]
+
+    chunks = list(make_controller().iter_chunks(records=records, chunk_size=10, overlap_size=5))
+
+    assert len(chunks) == 1
@@ -0,0 +1,67 @@
+import asyncio
+from qdrant_client import models, AsyncQdrantClient
+from stores.vectordb.providers.PGVectorProvider import PGVectorProvider
+from stores.vectordb.providers.QdrantDBProvider import QdrantDBProvider
+from stores.vectordb.providers.HnswDBProvider import HnswDBProvider
+
+def test_pgvector_filter_sql():
+    provider = PGVectorProvider(db_client=None)
+
+    where_sql, params = provider.get_filter_sql({ "asset_ids": ["3", 5], "page_from": 2, "page_to": 4 })
+
+    assert where_sql.startswith(" WHERE ")
+    assert "chunk_asset_id = ANY(:filter_asset_ids)" in where_sql
+    assert f"{provider.get_page_end_expression()} >= :filter_page_from" in where_sql
+    assert f"{provider.get_page_expression()} <= :filter_page_to" in where_sql
+    assert params == { "filter_asset_ids": [3, 5], "filter_page_from": 2, "filter_page_to": 4 }
+
+def test_pgvector_empty_filter():
+    provider = PGVectorProvider(db_client=None)
+
+    assert provider.get_filter_sql(None) == ("", {})
+    assert provider.get_filter_sql({}) == ("", {})
+
+def test_qdrant_empty_filter():
+    assert QdrantDBProvider(db_client=None).get_search_filter({}) is None
+
+def test_qdrant_filter_matches_points_with_and_without_page_end():
+    provider = QdrantDBProvider(db_client=None)
+    payloads = {
+        # pushed with the filters: page span and asset id
+        1: { "asset_id": 1, "page": 0, "page_end": 1 },
+        2: { "asset_id": 1, "page": 2, "page_end": 3 },
+        3: { "asset_id": 2, "page": 5, "page_end": 6 },
+        # pushed before the filters: no page_end, no asset id
+        4: { "page": 1 },
+        5: { "page": 4 },
+    }
+
+    async def matching_ids(search_filter: dict):
+        client = AsyncQdrantClient(location=":memory:")
+        await client.create_collection(
+            collection_name="filters",
+            vectors_config=models.VectorParams(size=2, distance=models.Distance.COSINE),
+        )
+        await client.upsert(collection_name="filters", points=[
+            models.PointStruct(id=point_id, vector=[1.0, 0.0], payload={ "text": "", "metadata": metadata })
+            for point_id, metadata in payloads.items()
+        ])
+
+        points, _ = await client.scroll(collection_name="filters", limit=10,
+                                        scroll_filter=provider.get_search_filter(search_filter))
+        await client.close()
+        return sorted(point.id for point in points)
+
+    assert asyncio.run(matching_ids({ "page_from": 1 })) == [1, 2, 3, 4, 5]
+    assert asyncio.run(matching_ids({ "page_from": 2, "page_to": 4 })) == [2, 5]
+    assert asyncio.run(matching_ids({ "page_from": 4 })) == [3, 5]
+    assert asyncio.run(matching_ids({ "asset_ids": [1], "page_to": 1 })) == [1]
+
+def test_hnsw_match_filter():
+    provider = HnswDBProvider.__new__(HnswDBProvider)
+
+    assert provider.match_filter({ "asset_id": 1, "page": 0, "page_end": 2 }, { "page_from": 2 })
+    assert not provider.match_filter({ "asset_id": 1, "page": 0, "page_end": 1 }, { "page_from": 2 })
+    assert provider.match_filter({ "asset_id": 1, "page": 3 }, { "page_from": 3, "page_to": 3 })
+    assert not provider.match_filter({ "asset_id": 1, "page": 3 }, { "asset_ids": [2] })
+    assert provider.match_filter({}, None)